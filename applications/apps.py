@@ -1,4 +1,10 @@
 from django.apps import AppConfig
+
+
 class ApplicationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'applications'
\ No newline at end of file
+    name = 'applications'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - connects JobApplicationStats counters
+        from . import tasks  # noqa: F401 - registers resume processing with the task queue
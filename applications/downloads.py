@@ -0,0 +1,103 @@
+"""
+Streaming resume downloads with conditional GET and byte-range support.
+
+The blob's SHA-256 is a strong validator for free: it changes exactly when the
+bytes change, so it is used as the ETag without reading the file.
+"""
+import re
+
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """Read-only view of bytes [start, start + length) of an open file"""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header into (start, end) inclusive.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multi-range, in which case the whole file is served) and 'unsatisfiable'
+    when the range lies outside the file.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return 'unsatisfiable'
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start > end:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def resume_response(request, application):
+    """Build the download response for an application's resume"""
+    etag = f'"{application.resume_sha256}"'
+    size = application.resume_size or 0
+
+    # 304 for If-None-Match hits, 412 for failed If-Match, before touching storage
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        # If-Range: only honour Range when the client's copy is still current
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range.strip() != etag:
+            byte_range = None
+
+        if byte_range == 'unsatisfiable':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        else:
+            file = application.resume.open()
+            content_type = application.resume_content_type or 'application/octet-stream'
+            filename = application.resume_filename or 'resume'
+            if byte_range is None:
+                response = FileResponse(file, content_type=content_type, filename=filename)
+                response['Content-Length'] = size
+            else:
+                start, end = byte_range
+                response = FileResponse(
+                    RangeFile(file, start, end - start + 1),
+                    status=206,
+                    content_type=content_type,
+                    filename=filename,
+                )
+                response['Content-Length'] = end - start + 1
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['ETag'] = etag
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = 'private, no-cache'  # Revalidate with the ETag; never cache in shared proxies
+    return response
@@ -0,0 +1,46 @@
+"""
+Filtering and ordering for the application inbox (GET /api/applications/).
+
+Lists are newest first on (applied_at, id). Indexes declared on
+Application.Meta serve the filters together with that ordering, so a page
+costs the same however many applications there are:
+
+- ?job=&status=         -> app_job_status_applied_idx, read in order
+- ?job= alone           -> the job_id prefix of the same index
+- an applicant's own    -> app_applicant_applied_idx
+- ?applied_after=       -> the applied_at column of either, as a range
+"""
+from rest_framework.exceptions import ValidationError
+
+from jobs.filters import parse_datetime_param
+from .models import Application
+
+APPLICATION_ORDERING = ('-applied_at', '-id')
+
+
+def parse_id(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    if not value.isdigit():
+        raise ValidationError({name: 'A valid id is required.'})
+    return int(value)
+
+
+def filter_applications(queryset, params):
+    """Apply ?job, ?status and ?applied_after"""
+    job_id = parse_id(params, 'job')
+    if job_id is not None:
+        queryset = queryset.filter(job_id=job_id)
+
+    status = params.get('status')
+    if status:
+        if status not in Application.STATUS_TRANSITIONS:
+            raise ValidationError({'status': f"Choose one of: {', '.join(Application.STATUS_TRANSITIONS)}."})
+        queryset = queryset.filter(status=status)
+
+    applied_after = parse_datetime_param(params, 'applied_after')
+    if applied_after is not None:
+        queryset = queryset.filter(applied_at__gt=applied_after)
+
+    return queryset
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from applications.models import JobApplicationStats
+from applications.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount the per-job application counters from the applications table. '
+        'Needed only after writes that bypass the model (bulk_create, raw SQL).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', type=int, help='jobs to recount (default: all)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_stats(options['job_ids'] or None)
+        self.stdout.write(f'Recounted {JobApplicationStats.objects.count()} job stats rows.')
@@ -0,0 +1,53 @@
+# Generated manually to move resume binaries out of the applications table
+
+from django.core.files.base import ContentFile
+from django.db import migrations
+
+# Resumes held in memory at once; rows are walked by primary key so the
+# table is never loaded in one go
+BATCH_SIZE = 50
+
+
+def move_resumes_to_store(apps, schema_editor):
+    from applications.storage import store_resume
+
+    Application = apps.get_model('applications', 'Application')
+    pending = Application.objects.filter(resume_data__isnull=False, resume_sha256__isnull=True).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk).values_list('pk', 'resume_data')[:BATCH_SIZE])
+        if not batch:
+            break
+        for pk, data in batch:
+            sha256, size = store_resume(ContentFile(bytes(data)))
+            Application.objects.filter(pk=pk).update(resume_sha256=sha256, resume_size=size)
+            last_pk = pk
+
+
+def move_resumes_to_table(apps, schema_editor):
+    from applications.storage import open_resume
+
+    Application = apps.get_model('applications', 'Application')
+    pending = Application.objects.filter(resume_sha256__isnull=False).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk).values_list('pk', 'resume_sha256')[:BATCH_SIZE])
+        if not batch:
+            break
+        for pk, sha256 in batch:
+            with open_resume(sha256) as f:
+                Application.objects.filter(pk=pk).update(resume_data=f.read())
+            last_pk = pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_application_resume_sha256_application_resume_size'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_resumes_to_store, move_resumes_to_table),
+    ]
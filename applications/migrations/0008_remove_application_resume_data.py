@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0007_move_resume_data_to_blob_store"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="application",
+            name="resume_data",
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated manually to count the applications that existed before JobApplicationStats
+
+from django.db import migrations
+from django.db.models import Count, Q
+
+STATUSES = ('pending', 'reviewing', 'shortlisted', 'accepted', 'rejected')
+BATCH_SIZE = 1000
+
+
+def count_applications(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    JobApplicationStats = apps.get_model('applications', 'JobApplicationStats')
+    counts = Application.objects.order_by().values('job_id').annotate(
+        total=Count('pk'),
+        **{status: Count('pk', filter=Q(status=status)) for status in STATUSES},
+    )
+    JobApplicationStats.objects.bulk_create(
+        (JobApplicationStats(**row) for row in counts.iterator()),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_jobapplicationstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_backfill_jobapplicationstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeAnalysis',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content_type', models.CharField(max_length=100)),
+                ('text', models.TextField(blank=True)),
+                ('preview', models.TextField(blank=True)),
+                ('processed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'resume analyses',
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0013_application_inbox_indexes'),
+        ('jobs', '0005_job_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['updated_at'], name='app_updated_at_idx'),
+        ),
+    ]
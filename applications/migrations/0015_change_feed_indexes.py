@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0014_application_updated_at_index'),
+        ('jobs', '0006_job_employer_updated_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'updated_at', 'id'], name='app_applicant_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'updated_at', 'id'], name='app_job_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplicationstats',
+            index=models.Index(fields=['updated_at'], name='app_stats_updated_at_idx'),
+        ),
+    ]
@@ -1,7 +1,13 @@
 
-from django.db import models
+import os
+import uuid
+
+from django.conf import settings
+from django.db import models, transaction
+from django.urls import reverse
 from users.models import User
 from jobs.models import Job
+from .storage import open_resume
 
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -11,10 +17,20 @@ class Application(models.Model):
         ('accepted', 'Accepted'),
         ('rejected', 'Rejected'),
     ]
+    # Status changes the API allows (PATCH and bulk-status); accepted and rejected are final.
+    # Setting the current status again is always allowed and changes nothing.
+    STATUS_TRANSITIONS = {
+        'pending': {'reviewing', 'shortlisted', 'rejected'},
+        'reviewing': {'shortlisted', 'accepted', 'rejected'},
+        'shortlisted': {'reviewing', 'accepted', 'rejected'},
+        'accepted': set(),
+        'rejected': set(),
+    }
     
     applicant = models.ForeignKey(User, on_delete=models.CASCADE)
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
-    resume_data = models.BinaryField(null=True, blank=True)  # Store file as binary data in database
+    resume_sha256 = models.CharField(max_length=64, null=True, blank=True, db_index=True)  # Blob key in the resume store
+    resume_size = models.PositiveBigIntegerField(null=True, blank=True)  # Size in bytes
     resume_filename = models.CharField(max_length=255, null=True, blank=True)  # Store original filename
     resume_content_type = models.CharField(max_length=100, null=True, blank=True)  # Store MIME type (e.g., 'application/pdf')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
@@ -25,36 +41,153 @@ class Application(models.Model):
     class Meta:
         ordering = ['-applied_at']
         unique_together = [['applicant', 'job']]
+        indexes = [
+            # Employer inboxes: one job's applications, optionally by status, newest first
+            models.Index(fields=['job', 'status', 'applied_at', 'id'], name='app_job_status_applied_idx'),
+            # An applicant's own applications, newest first
+            models.Index(fields=['applicant', 'applied_at', 'id'], name='app_applicant_applied_idx'),
+            # "Changed since" reads of the change feed (changes/feed.py): all applications
+            # (superusers), an applicant's own, and each of an employer's jobs'
+            models.Index(fields=['updated_at'], name='app_updated_at_idx'),
+            models.Index(fields=['applicant', 'updated_at', 'id'], name='app_applicant_updated_idx'),
+            models.Index(fields=['job', 'updated_at', 'id'], name='app_job_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What JobApplicationStats currently counts this row as (see applications/stats.py)
+        instance._counted_as = (instance.__dict__.get('job_id'), instance.__dict__.get('status'))
+        return instance
+
+    @classmethod
+    def can_change_status(cls, old, new):
+        return old == new or new in cls.STATUS_TRANSITIONS.get(old, ())
+
+    def status_editable_by(self, user):
+        """Superusers and the job's employer set statuses; applicants cannot"""
+        return user.is_superuser or (user.is_employer and self.job.employer_id == user.id)
+
+    def save(self, *args, **kwargs):
+        # The post_save receiver adjusts JobApplicationStats; keep both writes in one transaction
+        with transaction.atomic(savepoint=False):
+            update_fields = kwargs.get('update_fields')
+            if not self._state.adding and (update_fields is None or {'job', 'job_id', 'status'} & set(update_fields)):
+                # Count the change from what the row holds now, not from what was loaded: a
+                # concurrent writer may have moved it since. The lock holds it until we commit
+                current = Application.objects.select_for_update().filter(pk=self.pk).values_list('job_id', 'status')
+                self._counted_as = current.first() or getattr(self, '_counted_as', None)
+            super().save(*args, **kwargs)
     
     @property
     def resume(self):
         """Property to maintain compatibility with existing code"""
-        if self.resume_data:
+        if self.resume_sha256:
             return ResumeFileWrapper(self)
         return None
 
 
+class JobApplicationStats(models.Model):
+    """
+    Denormalized application counts for one job: the total and one counter
+    per Application status. Kept up to date by applications/stats.py in the
+    same transaction as every application insert, status change and delete.
+    """
+    COUNTERS = ('total',) + tuple(value for value, _ in Application.STATUS_CHOICES)
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='application_stats')
+    total = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    reviewing = models.IntegerField(default=0)
+    shortlisted = models.IntegerField(default=0)
+    accepted = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'job application stats'
+        indexes = [
+            # Jobs whose counters changed since a change-feed cursor (changes/feed.py)
+            models.Index(fields=['updated_at'], name='app_stats_updated_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.job_id}: {self.total} applications'
+
+
+class ResumeAnalysis(models.Model):
+    """
+    What background processing learned about one stored resume blob (see
+    applications/tasks.py). Keyed by content hash like the blob itself, so a
+    CV re-used across applications is processed once.
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    content_type = models.CharField(max_length=100)  # Sniffed from the bytes, not the client's claim
+    text = models.TextField(blank=True)  # Extracted plain text for search, whitespace-normalized
+    preview = models.TextField(blank=True)  # First lines of text for list cards
+    processed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'resume analyses'
+
+    def __str__(self):
+        return f'{self.sha256[:12]} ({self.content_type})'
+
+
+class ResumeUpload(models.Model):
+    """
+    A resumable resume upload (see applications/uploads.py). Chunks are
+    appended to a temporary file until offset reaches size; completing the
+    upload moves the bytes into the resume store, after which an application
+    can reference it instead of sending the file.
+    """
+    UPLOADING = 'uploading'
+    COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (UPLOADING, 'Uploading'),
+        (COMPLETE, 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # Unguessable upload URL
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resume_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, default='application/pdf')
+    size = models.PositiveBigIntegerField()  # Total bytes, announced when the upload starts
+    offset = models.PositiveBigIntegerField(default=0)  # Bytes received so far
+    checksum = models.CharField(max_length=64, blank=True)  # Expected SHA-256, if announced up front
+    sha256 = models.CharField(max_length=64, null=True, blank=True)  # Blob key once complete
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=UPLOADING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()  # Unfinished or unused uploads are discarded after this
+
+    def __str__(self):
+        return f'{self.filename} ({self.offset}/{self.size}, {self.status})'
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.RESUME_UPLOAD_DIR, f'{self.pk}.part')
+
+
 class ResumeFileWrapper:
-    """Wrapper to make resume_data behave like a FileField"""
+    """Wrapper to make the stored resume blob behave like a FileField"""
     def __init__(self, application):
         self.application = application
         self.name = application.resume_filename
         self.content_type = application.resume_content_type
-    
+
+    def open(self):
+        return open_resume(self.application.resume_sha256)
+
     def read(self):
-        return self.application.resume_data
-    
+        with self.open() as f:
+            return f.read()
+
     @property
     def url(self):
-        """Generate data URL for inline display"""
-        if self.application.resume_data:
-            import base64
-            base64_data = base64.b64encode(self.application.resume_data).decode('utf-8')
-            return f"data:{self.content_type or 'application/pdf'};base64,{base64_data}"
-        return None
-    
+        """Path of the streaming download endpoint (bytes are never inlined)"""
+        return reverse('application-resume', args=[self.application.pk])
+
     @property
     def size(self):
-        if self.application.resume_data:
-            return len(self.application.resume_data)
-        return 0
+        return self.application.resume_size or 0
@@ -0,0 +1,8 @@
+from jobs.pagination import KeysetPagination
+
+from .filters import APPLICATION_ORDERING
+
+
+class ApplicationCursorPagination(KeysetPagination):
+    """Newest applications first, seeking on (applied_at, id)"""
+    ordering = APPLICATION_ORDERING
@@ -1,55 +1,109 @@
 
+from django.conf import settings
 from rest_framework import serializers
-from .models import Application
+from .models import Application, ResumeUpload
+from .storage import store_resume
+from .tasks import schedule_resume_processing
 
 class ApplicationSerializer(serializers.ModelSerializer):
     applicant = serializers.PrimaryKeyRelatedField(read_only=True)
     applied_at = serializers.DateTimeField(read_only=True)
-    status = serializers.CharField(default='pending', required=False)
+    # No default: a full update (PUT) without status leaves it alone; new applications start pending
+    status = serializers.CharField(required=False)
     resume = serializers.FileField(write_only=True, required=False)  # For file upload
+    # Or the id of a completed resumable upload (see applications/uploads.py)
+    resume_upload = serializers.PrimaryKeyRelatedField(
+        queryset=ResumeUpload.objects.filter(status=ResumeUpload.COMPLETE), write_only=True, required=False
+    )
     
     class Meta:
         model = Application
         fields = '__all__'
-        read_only_fields = ('resume_data', 'resume_filename', 'resume_content_type')  # These are set in create/update
+        read_only_fields = ('resume_sha256', 'resume_size', 'resume_filename', 'resume_content_type')  # These are set in create/update
     
     # Removed SerializerMethodFields - handled directly in to_representation for better performance
     # This avoids method call overhead for each serialized object
     
+    def validate_resume_upload(self, upload):
+        request = self.context.get('request')
+        if request is None or upload.owner_id != request.user.id:
+            raise serializers.ValidationError('Unknown upload.')
+        return upload
+
+    def validate_status(self, status):
+        if status not in Application.STATUS_TRANSITIONS:
+            raise serializers.ValidationError(f'"{status}" is not a valid status.')
+        if self.instance is None or status == self.instance.status:
+            return status
+        request = self.context.get('request')
+        if request is None or not self.instance.status_editable_by(request.user):
+            raise serializers.ValidationError("Only the job's employer can change an application's status.")
+        if not Application.can_change_status(self.instance.status, status):
+            raise serializers.ValidationError(f'Cannot change status from {self.instance.status} to {status}.')
+        return status
+
+    def validate(self, attrs):
+        if attrs.get('resume') and attrs.get('resume_upload'):
+            raise serializers.ValidationError({'resume_upload': 'Send either resume or resume_upload, not both.'})
+        return attrs
+
     def create(self, validated_data):
-        """Handle file upload and convert to binary data"""
+        """Handle file upload: store the blob and record its key on the row"""
         resume_file = validated_data.pop('resume', None)
-        application = super().create(validated_data)
-        
+        upload = validated_data.pop('resume_upload', None)
         if resume_file:
-            # Read file content and store as binary
-            resume_file.seek(0)
-            application.resume_data = resume_file.read()
-            application.resume_filename = resume_file.name
-            application.resume_content_type = resume_file.content_type if hasattr(resume_file, 'content_type') else 'application/pdf'
-            application.save()
-        
-        return application
-    
+            validated_data.update(self.resume_fields(resume_file))
+        elif upload:
+            validated_data.update(self.upload_fields(upload))
+        return super().create(validated_data)
+
     def update(self, instance, validated_data):
-        """Handle file upload update and convert to binary data"""
+        """Handle file upload update: store the new blob and point the row at it"""
         resume_file = validated_data.pop('resume', None)
-        application = super().update(instance, validated_data)
-        
+        upload = validated_data.pop('resume_upload', None)
         if resume_file:
-            # Read file content and store as binary
-            resume_file.seek(0)
-            application.resume_data = resume_file.read()
-            application.resume_filename = resume_file.name
-            application.resume_content_type = resume_file.content_type if hasattr(resume_file, 'content_type') else 'application/pdf'
-            application.save()
-        
-        return application
+            validated_data.update(self.resume_fields(resume_file))
+        elif upload:
+            validated_data.update(self.upload_fields(upload))
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        # Write only the columns this request set, not every column of the row
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+    def upload_fields(self, upload):
+        """Model fields for a completed resumable upload, which is used up by this"""
+        upload.delete()
+        return {
+            'resume_sha256': upload.sha256,
+            'resume_size': upload.size,
+            'resume_filename': upload.filename,
+            'resume_content_type': schedule_resume_processing(upload.sha256) or upload.content_type,
+        }
+
+    def resume_fields(self, resume_file):
+        """Stream the upload into the resume store and return the model fields describing it"""
+        sha256, size = store_resume(resume_file)
+        # Sniffing, text extraction and previews run in the background worker;
+        # a blob processed before (a re-used CV) already knows its real type
+        sniffed_type = schedule_resume_processing(sha256)
+        return {
+            'resume_sha256': sha256,
+            'resume_size': size,
+            'resume_filename': resume_file.name,
+            'resume_content_type': sniffed_type or (
+                resume_file.content_type if hasattr(resume_file, 'content_type') else 'application/pdf'
+            ),
+        }
     
     def to_representation(self, instance):
         """Ultra-optimized: build dict directly, skip heavy fields"""
+        fieldset = self.context.get('fieldset')
+        if fieldset is not None:
+            # ?fields= / ?omit=: only the selected keys (deferred columns are never touched)
+            return {key: self.SPARSE_VALUES[key](self, instance) for key in fieldset}
+
         # Build dict directly - much faster than super().to_representation()
-        # Exclude resume_data completely (only loaded for detail views)
         representation = {
             'id': instance.id,
             'applicant': instance.applicant_id,
@@ -59,51 +113,109 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'updated_at': instance.updated_at.isoformat() if instance.updated_at else None,
             'resume_filename': instance.resume_filename,
             'resume_content_type': instance.resume_content_type,
+            'resume_size': instance.resume_size,
             'has_resume': bool(instance.resume_filename),
         }
         
-        # Job details (already fetched via select_related - very fast)
-        if instance.job:
-            representation['job'] = {
-                'id': instance.job.id,
-                'title': instance.job.title,
-                'location': instance.job.location,
-                'salary': str(instance.job.salary),
-                'posted_at': instance.job.posted_at.isoformat() if instance.job.posted_at else None,
-                'employer': instance.job.employer_id,
-            }
-        else:
-            representation['job'] = None
-        
-        # Applicant details (already fetched via select_related - very fast)
-        if instance.applicant:
-            representation['applicant_detail'] = {
-                'id': instance.applicant.id,
-                'email': instance.applicant.email,
-                'full_name': getattr(instance.applicant, 'full_name', None) or '',
-            }
-        else:
-            representation['applicant_detail'] = None
-        
-        # Resume URL - generate for detail views, skip for list views
-        # Check if this is a detail view by checking if resume_data is loaded
-        # In list views, resume_data is deferred, so hasattr will be True but value is None
-        # In retrieve/update views, resume_data is loaded
-        try:
-            # Try to access resume_data to see if it's loaded
-            # If deferred, this will trigger a query, but only for detail views
-            resume_data_value = getattr(instance, 'resume_data', None)
-            if resume_data_value is not None:
-                # Resume data is loaded - generate URL
-                if instance.resume:
-                    representation['resume_url'] = instance.resume.url
-                else:
-                    representation['resume_url'] = None
-            else:
-                # Resume data not loaded (deferred in list views) or doesn't exist
-                representation['resume_url'] = None
-        except Exception as e:
-            # Error accessing resume_data - return None
-            representation['resume_url'] = None
-        
+        # Job and applicant details (already fetched via select_related - very fast)
+        representation['job'] = self.job_representation(instance)
+        representation['applicant_detail'] = self.applicant_representation(instance)
+        representation['resume_url'] = self.resume_url(instance)
         return representation
+
+    def job_representation(self, instance):
+        if not instance.job:
+            return None
+        return {
+            'id': instance.job.id,
+            'title': instance.job.title,
+            'location': instance.job.location,
+            'salary': str(instance.job.salary),
+            'posted_at': instance.job.posted_at.isoformat() if instance.job.posted_at else None,
+            'employer': instance.job.employer_id,
+        }
+
+    def applicant_representation(self, instance):
+        if not instance.applicant:
+            return None
+        return {
+            'id': instance.applicant.id,
+            'email': instance.applicant.email,
+            'full_name': getattr(instance.applicant, 'full_name', None) or '',
+        }
+
+    def resume_url(self, instance):
+        """A short link to the streaming download endpoint"""
+        if not instance.resume_sha256:
+            return None
+        request = self.context.get('request')
+        url = instance.resume.url
+        return request.build_absolute_uri(url) if request else url
+
+    # Output key -> value, in the order of the full representation; the views
+    # map the same keys to the columns they read (FIELD_SOURCES)
+    SPARSE_VALUES = {
+        'id': lambda self, obj: obj.id,
+        'applicant': lambda self, obj: obj.applicant_id,
+        'applied_at': lambda self, obj: obj.applied_at.isoformat() if obj.applied_at else None,
+        'status': lambda self, obj: obj.status,
+        'cover_letter': lambda self, obj: obj.cover_letter,
+        'updated_at': lambda self, obj: obj.updated_at.isoformat() if obj.updated_at else None,
+        'resume_filename': lambda self, obj: obj.resume_filename,
+        'resume_content_type': lambda self, obj: obj.resume_content_type,
+        'resume_size': lambda self, obj: obj.resume_size,
+        'has_resume': lambda self, obj: bool(obj.resume_filename),
+        'job': job_representation,
+        'applicant_detail': applicant_representation,
+        'resume_url': resume_url,
+    }
+    FIELD_SOURCES = {
+        'id': ('id',),
+        'applicant': ('applicant',),
+        'applied_at': ('applied_at',),
+        'status': ('status',),
+        'cover_letter': ('cover_letter',),
+        'updated_at': ('updated_at',),
+        'resume_filename': ('resume_filename',),
+        'resume_content_type': ('resume_content_type',),
+        'resume_size': ('resume_size',),
+        'has_resume': ('resume_filename',),
+        'job': ('job__title', 'job__location', 'job__salary', 'job__posted_at'),
+        'applicant_detail': ('applicant__email',),
+        'resume_url': ('resume_sha256',),
+    }
+
+
+class ResumeUploadSerializer(serializers.ModelSerializer):
+    """A resumable upload: POST starts one, the response tells how far it got"""
+    checksum = serializers.RegexField(r'^[0-9a-fA-F]{64}$', write_only=True, required=False,
+                                      help_text='SHA-256 of the whole file (hex); may also be sent on completion')
+    size = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = ResumeUpload
+        fields = ('id', 'filename', 'content_type', 'size', 'checksum', 'offset', 'status', 'sha256', 'expires_at')
+        read_only_fields = ('offset', 'status', 'sha256', 'expires_at')
+
+    def validate_size(self, size):
+        if size > settings.RESUME_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'Resumes are limited to {settings.RESUME_UPLOAD_MAX_SIZE} bytes.')
+        return size
+
+    def validate_checksum(self, checksum):
+        return checksum.lower()
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """Request body of POST /api/applications/bulk-status/"""
+    # Bounded so the id list fits one IN (...) clause on every backend
+    MAX_IDS = 500
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_IDS
+    )
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+
+    def validate_ids(self, ids):
+        # Drop duplicates, keep the caller's order for the per-id results
+        return list(dict.fromkeys(ids))
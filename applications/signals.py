@@ -0,0 +1,42 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.models import Job
+from .models import Application
+from .stats import adjust_stats, rebuild_stats, status_change_deltas, status_deltas
+
+
+def deleted_with_job(origin):
+    """Whether a delete() was called on a Job or a queryset of jobs (the origin of the deletion signals)"""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is Job
+
+
+@receiver(post_save, sender=Application)
+def count_saved_application(sender, instance, created, raw=False, **kwargs):
+    """Move the application between its job's counters when it is created, changes status or changes job"""
+    if raw:  # loaddata: fixtures carry their own stats rows
+        return
+    current = (instance.job_id, instance.status)
+    previous = None if created else getattr(instance, '_counted_as', None)
+    if created:
+        adjust_stats(instance.job_id, status_deltas([instance.status]))
+    elif previous is None or previous[1] is None:
+        # Built by hand or loaded with status deferred: the old status is unknown, recount
+        rebuild_stats({instance.job_id, *(previous[:1] if previous and previous[0] else ())})
+    elif previous[0] == instance.job_id:
+        if previous[1] != instance.status:
+            adjust_stats(instance.job_id, status_change_deltas([previous[1]], instance.status))
+    else:
+        adjust_stats(previous[0], status_deltas([previous[1]], sign=-1), create=False)
+        adjust_stats(instance.job_id, status_deltas([instance.status]))
+    instance._counted_as = current
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, origin=None, **kwargs):
+    if deleted_with_job(origin):
+        return  # The job's stats row is deleted along with it
+    # Other cascades (a user deleted) may take the job too; never recreate the stats row it is about to lose
+    adjust_stats(instance.job_id, status_deltas([instance.status], sign=-1), create=False)
@@ -0,0 +1,107 @@
+"""
+Per-job application counters (JobApplicationStats).
+
+Every application insert, status change and delete adds to its job's counters
+with F() expressions in the same transaction as the write, so concurrent
+writers never lose an increment and employer dashboards read one row per job
+instead of counting applications. A status or job change is counted from the
+values it overwrites, read under a row lock (Application.save()), not from a
+possibly stale instance. Single-row writes are counted by the
+receivers in applications/signals.py; queryset .update() calls (bulk status
+changes) must call adjust_stats() themselves, and bulk_create() or raw SQL
+should be followed by rebuild_stats().
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Application, JobApplicationStats
+
+STATUSES = JobApplicationStats.COUNTERS[1:]
+REBUILD_BATCH_SIZE = 1000
+
+
+def stats_representation(stats):
+    """{'total': n, 'by_status': {status: n}} for a stats row, a values() dict or None (no applications yet)"""
+    if stats is None:
+        stats = {}
+    elif not isinstance(stats, dict):
+        stats = {name: getattr(stats, name) for name in JobApplicationStats.COUNTERS}
+    return {
+        'total': stats.get('total') or 0,
+        'by_status': {status: stats.get(status) or 0 for status in STATUSES},
+    }
+
+
+def status_deltas(statuses, sign=1):
+    """Counter deltas for adding (sign=1) or removing (sign=-1) applications with these statuses"""
+    counts = Counter(statuses)
+    deltas = {status: sign * n for status, n in counts.items()}
+    deltas['total'] = sign * sum(counts.values())
+    return deltas
+
+
+def status_change_deltas(old_statuses, new_status):
+    """Counter deltas for moving applications of one job from old_statuses to new_status"""
+    deltas = status_deltas(old_statuses, sign=-1)
+    deltas['total'] = 0
+    deltas[new_status] = deltas.get(new_status, 0) + len(old_statuses)
+    return deltas
+
+
+def count_applications(job_ids=None):
+    """{job_id: {counter: n}} counted from the applications table"""
+    applications = Application.objects.all()
+    if job_ids is not None:
+        applications = applications.filter(job_id__in=job_ids)
+    counts = applications.order_by().values('job_id').annotate(
+        total=Count('pk'),
+        **{status: Count('pk', filter=Q(status=status)) for status in STATUSES},
+    )
+    return {row.pop('job_id'): row for row in counts}
+
+
+def adjust_stats(job_id, deltas, create=True):
+    """
+    Add deltas ({counter: n}) to a job's counters. Call inside the transaction
+    that made the change. A job without a stats row gets one counted from
+    scratch (which already includes the change) unless create is False, as
+    for deletes, which may be part of deleting the job itself.
+    """
+    updates = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    if not updates:
+        return
+    stats = JobApplicationStats.objects.filter(job_id=job_id)
+    if stats.update(updated_at=timezone.now(), **updates) or not create:
+        return
+    try:
+        with transaction.atomic():
+            JobApplicationStats.objects.create(job_id=job_id, **count_applications([job_id]).get(job_id, {}))
+    except IntegrityError:
+        # A concurrent transaction created the row first; its count cannot see
+        # our uncommitted change, so add it on top
+        stats.update(updated_at=timezone.now(), **updates)
+
+
+def rebuild_stats(job_ids=None):
+    """
+    Recount the stats of the given jobs (default: all jobs) from the
+    applications table, e.g. after bulk_create() or a data import. Call inside
+    a transaction.
+    """
+    rows = count_applications(job_ids)
+    if job_ids is not None:
+        # Jobs whose last application was deleted go back to zero
+        for job_id in job_ids:
+            rows.setdefault(job_id, {})
+    else:
+        JobApplicationStats.objects.update(updated_at=timezone.now(), **{name: 0 for name in JobApplicationStats.COUNTERS})
+    JobApplicationStats.objects.bulk_create(
+        [JobApplicationStats(job_id=job_id, **row) for job_id, row in rows.items()],
+        batch_size=REBUILD_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['job'],
+        update_fields=[*JobApplicationStats.COUNTERS, 'updated_at'],
+    )
@@ -0,0 +1,59 @@
+"""
+Content-addressed storage for resume files.
+
+Resumes are stored outside the database under the name of their SHA-256
+digest, so identical uploads are stored once. The backend is the
+STORAGES['resumes'] alias, which means any Django storage class works:
+FileSystemStorage locally, an S3-compatible backend in production, or
+InMemoryStorage in tests.
+"""
+import hashlib
+
+from django.core.files.storage import storages
+
+RESUME_STORAGE_ALIAS = 'resumes'
+
+
+def resume_storage():
+    return storages[RESUME_STORAGE_ALIAS]
+
+
+def blob_name(sha256):
+    """Fan out by digest prefix so no single directory grows unbounded"""
+    return f'{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def hash_file(file):
+    """Return (sha256 hex digest, size) reading the file chunk by chunk"""
+    hasher = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    for chunk in file.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return hasher.hexdigest(), size
+
+
+def store_resume(file, digest=None):
+    """
+    Store a django File (e.g. an UploadedFile) and return (sha256, size).
+
+    Uploads are read in chunks, never as a single bytes object; content that is
+    already stored is not written again. Pass digest=(sha256, size) when the
+    file was hashed already.
+    """
+    sha256, size = digest or hash_file(file)
+    storage = resume_storage()
+    name = blob_name(sha256)
+    if not storage.exists(name):
+        storage.save(name, file)
+    return sha256, size
+
+
+def delete_resume(sha256):
+    resume_storage().delete(blob_name(sha256))
+
+
+def open_resume(sha256):
+    return resume_storage().open(blob_name(sha256), 'rb')
@@ -0,0 +1,125 @@
+"""
+Post-upload resume processing, run by the background worker (tasks/queue.py)
+instead of inside the upload request.
+
+For each new blob the worker sniffs the real content type from its leading
+bytes, extracts plain text (PDF with the optional pypdf package, DOCX and
+plain text with the standard library), normalizes it and stores it with a
+short preview in ResumeAnalysis. Applications whose client-declared content
+type disagrees with the bytes are corrected, so downloads are served with
+the sniffed type.
+
+Resumable uploads (applications/uploads.py) schedule their own cleanup for
+when they expire.
+"""
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.utils import timezone
+
+from tasks.queue import enqueue, task
+
+from .models import Application, ResumeAnalysis, ResumeUpload
+from .storage import open_resume
+from .uploads import discard_upload
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # Optional: without it PDFs are sniffed but their text is not extracted
+    PdfReader = None
+
+PROCESS_RESUME = 'applications.process_resume'
+EXPIRE_UPLOAD = 'applications.expire_resume_upload'
+SNIFF_BYTES = 2048
+PREVIEW_CHARS = 500
+
+DOCX_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),  # OLE2 (.doc)
+    (b'{\\rtf', 'application/rtf'),
+    (b'PK\x03\x04', 'application/zip'),  # DOCX is a zip; told apart by its contents
+)
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def sniff_content_type(file):
+    """Content type from the file's leading bytes (magic numbers), independent of its name"""
+    head = file.read(SNIFF_BYTES)
+    file.seek(0)
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            if content_type == 'application/zip':
+                try:
+                    with zipfile.ZipFile(file) as archive:
+                        if 'word/document.xml' in archive.namelist():
+                            content_type = DOCX_TYPE
+                except zipfile.BadZipFile:
+                    pass
+                file.seek(0)
+            return content_type
+    if b'\x00' not in head:
+        try:
+            # A multi-byte character may be cut at the end of the sample
+            head.decode('utf-8')
+            return 'text/plain'
+        except UnicodeDecodeError as exc:
+            if exc.start >= len(head) - 3:
+                return 'text/plain'
+    return 'application/octet-stream'
+
+
+def extract_text(file, content_type):
+    """Plain text of the document, or '' for formats that cannot be read here"""
+    if content_type == 'text/plain':
+        return file.read(settings.RESUME_TEXT_MAX_CHARS * 4).decode('utf-8', errors='replace')
+    if content_type == DOCX_TYPE:
+        with zipfile.ZipFile(file) as archive, archive.open('word/document.xml') as document:
+            paragraphs = ElementTree.parse(document).getroot().iter(f'{WORD_NS}p')
+            return '\n'.join(''.join(node.text or '' for node in p.iter(f'{WORD_NS}t')) for p in paragraphs)
+    if content_type == 'application/pdf' and PdfReader is not None:
+        return '\n'.join(page.extract_text() or '' for page in PdfReader(file).pages)
+    return ''
+
+
+def normalize_text(text):
+    """Collapse runs of whitespace (keeping line breaks) and cap the length"""
+    lines = (re.sub(r'\s+', ' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:settings.RESUME_TEXT_MAX_CHARS]
+
+
+@task(PROCESS_RESUME, concurrency=settings.RESUME_PROCESSING_CONCURRENCY)
+def process_resume(sha256):
+    analysis = ResumeAnalysis.objects.filter(pk=sha256).first()
+    if analysis is None:
+        with open_resume(sha256) as file:
+            content_type = sniff_content_type(file)
+            text = normalize_text(extract_text(file, content_type))
+        analysis = ResumeAnalysis.objects.create(
+            sha256=sha256, content_type=content_type, text=text, preview=text[:PREVIEW_CHARS]
+        )
+    # .update() skips auto_now; bump updated_at so ETags change
+    Application.objects.filter(resume_sha256=sha256).exclude(resume_content_type=analysis.content_type).update(
+        resume_content_type=analysis.content_type, updated_at=timezone.now()
+    )
+
+
+def schedule_resume_processing(sha256):
+    """
+    Called after a resume is stored. Returns the sniffed content type when
+    the blob was processed before, otherwise queues processing and returns None.
+    """
+    content_type = ResumeAnalysis.objects.filter(pk=sha256).values_list('content_type', flat=True).first()
+    if content_type is None:
+        enqueue(PROCESS_RESUME, sha256=sha256)
+    return content_type
+
+
+@task(EXPIRE_UPLOAD)
+def expire_resume_upload(upload_id):
+    """Discard a resumable upload nobody finished or applied with in time"""
+    upload = ResumeUpload.objects.filter(pk=upload_id, expires_at__lte=timezone.now()).first()
+    if upload is not None:
+        discard_upload(upload)
@@ -1,4 +1,78 @@
 import pytest
+
+from applications.models import Application, JobApplicationStats
+from applications.stats import rebuild_stats
+
+
 @pytest.mark.django_db
 def test_applications_model_placeholder():
     assert True
+
+
+@pytest.mark.django_db
+def test_rebuild_stats_matches_counters(applicant, make_job):
+    first, second = make_job(), make_job()
+    application = Application.objects.create(applicant=applicant, job=first)
+    application.status = 'accepted'
+    application.save()
+    # Moving an application to another job moves it between the jobs' counters
+    application.job = second
+    application.save()
+    counted = list(JobApplicationStats.objects.order_by('pk').values())
+
+    JobApplicationStats.objects.update(total=99, pending=99)
+    rebuild_stats()
+    assert list(JobApplicationStats.objects.order_by('pk').values('job_id', 'total', 'accepted', 'pending')) == [
+        {'job_id': row['job_id'], 'total': row['total'], 'accepted': row['accepted'], 'pending': row['pending']}
+        for row in counted
+    ]
+    assert JobApplicationStats.objects.get(pk=second.pk).accepted == 1
+    assert JobApplicationStats.objects.get(pk=first.pk).total == 0
+
+
+@pytest.mark.django_db
+def test_concurrent_status_changes_count_what_they_overwrite(applicant, job):
+    application = Application.objects.create(applicant=applicant, job=job)
+    first, second = Application.objects.get(pk=application.pk), Application.objects.get(pk=application.pk)
+    first.status = 'reviewing'
+    first.save(update_fields=['status', 'updated_at'])
+    # Loaded as pending, but it overwrites reviewing
+    second.status = 'rejected'
+    second.save(update_fields=['status', 'updated_at'])
+    stats = JobApplicationStats.objects.get(pk=job.pk)
+    assert (stats.total, stats.pending, stats.reviewing, stats.rejected) == (1, 0, 0, 1)
+
+
+@pytest.mark.django_db
+def test_job_deletion_skips_per_application_stats_updates(make_job, django_assert_num_queries):
+    from users.models import User
+    job = make_job()
+    for i in range(3):
+        applicant = User.objects.create_user(email=f'gone{i}@example.com', password='pass12345', is_applicant=True)
+        Application.objects.create(applicant=applicant, job=job)
+    # However many applications: they are read twice (deletion, tombstones), then one
+    # tombstone insert, the stats, applications and job deletes and the job's tombstone
+    with django_assert_num_queries(7):
+        job.delete()
+    assert not JobApplicationStats.objects.exists()
+
+
+def test_resume_sniffing_and_docx_text():
+    import io
+    import zipfile
+    from applications.tasks import DOCX_TYPE, extract_text, sniff_content_type
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        '<w:p><w:r><w:t>Jane </w:t></w:r><w:r><w:t>Doe</w:t></w:r></w:p><w:p><w:r><w:t>Engineer</w:t></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    docx = io.BytesIO()
+    with zipfile.ZipFile(docx, 'w') as archive:
+        archive.writestr('word/document.xml', document)
+    docx.seek(0)
+    assert sniff_content_type(docx) == DOCX_TYPE
+    assert extract_text(docx, DOCX_TYPE) == 'Jane Doe\nEngineer'
+
+    assert sniff_content_type(io.BytesIO(b'%PDF-1.7\n...')) == 'application/pdf'
+    assert sniff_content_type(io.BytesIO('Résumé'.encode())) == 'text/plain'
+    assert sniff_content_type(io.BytesIO(b'\x89PNG\r\n\x1a\n\x00\x00')) == 'application/octet-stream'
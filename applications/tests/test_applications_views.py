@@ -1,8 +1,642 @@
+from datetime import timedelta
+
 import pytest
+from django.utils import timezone
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
 
+from applications.models import Application, JobApplicationStats
+from applications.storage import blob_name, resume_storage
+from users.models import User
+
 @pytest.mark.django_db
 def test_applications_view_placeholder():
     client = APIClient()
     response = client.get("/")  # Replace with actual path
     assert response.status_code in [200, 404]
+
+
+def resume_upload(content=b'%PDF-1.4 resume', name='resume.pdf'):
+    return SimpleUploadedFile(name, content, content_type='application/pdf')
+
+
+@pytest.mark.django_db
+def test_resume_upload_is_stored_by_hash(applicant_client, job):
+    response = applicant_client.post('/api/applications/', {'job': job.id, 'resume': resume_upload()}, format='multipart')
+    assert response.status_code == 201
+    application = Application.objects.get(pk=response.data['id'])
+    assert len(application.resume_sha256) == 64
+    assert application.resume_size == len(b'%PDF-1.4 resume')
+    assert resume_storage().exists(blob_name(application.resume_sha256))
+    assert application.resume.read() == b'%PDF-1.4 resume'
+
+
+@pytest.mark.django_db
+def test_identical_resumes_are_stored_once(applicant_client, make_job):
+    first, second = make_job(), make_job()
+    for job in (first, second):
+        response = applicant_client.post('/api/applications/', {'job': job.id, 'resume': resume_upload()}, format='multipart')
+        assert response.status_code == 201
+    digests = set(Application.objects.values_list('resume_sha256', flat=True))
+    assert len(digests) == 1
+    directories, files = resume_storage().listdir(blob_name(digests.pop()).rsplit('/', 1)[0])
+    assert len(files) == 1
+
+
+@pytest.fixture
+def application(applicant_client, job):
+    response = applicant_client.post(
+        '/api/applications/', {'job': job.id, 'resume': resume_upload(b'0123456789')}, format='multipart'
+    )
+    return Application.objects.get(pk=response.data['id'])
+
+
+@pytest.mark.django_db
+def test_resume_url_is_a_short_link(applicant_client, application):
+    for url in ('/api/applications/', f'/api/applications/{application.id}/'):
+        response = applicant_client.get(url)
+        data = response.data['results'][0] if 'results' in response.data else response.data
+        assert data['has_resume'] is True
+        assert data['resume_url'] == f'http://testserver/api/applications/{application.id}/resume/'
+
+
+def download(client, application, **headers):
+    response = client.get(f'/api/applications/{application.id}/resume/', **headers)
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    return response, body
+
+
+@pytest.mark.django_db
+def test_resume_download_streams_file(applicant_client, employer_client, application):
+    for client in (applicant_client, employer_client):
+        response, body = download(client, application)
+        assert response.status_code == 200
+        assert body == b'0123456789'
+        assert response['Content-Type'] == 'application/pdf'
+        assert response['Content-Length'] == '10'
+        assert response['ETag'] == f'"{application.resume_sha256}"'
+        assert response['Accept-Ranges'] == 'bytes'
+
+
+@pytest.mark.django_db
+def test_resume_download_requires_access(api_client, application):
+    response, _ = download(api_client, application)
+    assert response.status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_resume_download_conditional_get(applicant_client, application):
+    etag = f'"{application.resume_sha256}"'
+    response, body = download(applicant_client, application, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert body == b''
+    response, _ = download(applicant_client, application, HTTP_IF_NONE_MATCH='"stale"')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('header, status, expected, content_range', [
+    ('bytes=2-5', 206, b'2345', 'bytes 2-5/10'),
+    ('bytes=7-', 206, b'789', 'bytes 7-9/10'),
+    ('bytes=-3', 206, b'789', 'bytes 7-9/10'),
+    ('bytes=8-100', 206, b'89', 'bytes 8-9/10'),
+    ('bytes=20-30', 416, b'', 'bytes */10'),
+    ('bytes=0-1,4-5', 200, b'0123456789', None),
+])
+def test_resume_download_ranges(applicant_client, application, header, status, expected, content_range):
+    response, body = download(applicant_client, application, HTTP_RANGE=header)
+    assert response.status_code == status
+    assert body == expected
+    assert response.get('Content-Range') == content_range
+
+
+@pytest.mark.django_db
+def test_resume_download_if_range_mismatch_sends_whole_file(applicant_client, application):
+    response, body = download(applicant_client, application, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"old"')
+    assert response.status_code == 200
+    assert body == b'0123456789'
+
+
+# Query budget per endpoint. Requests are force-authenticated, so these are the
+# queries the view itself makes; a regression here means an extra fetch or a
+# lazy load crept into applications/views.py.
+@pytest.mark.django_db
+@pytest.mark.parametrize('client_name, method, path, data, budget', [
+    ('applicant_client', 'get', '/api/applications/', None, 3),  # ETag aggregate + count + page
+    ('employer_client', 'get', '/api/applications/', None, 3),
+    ('applicant_client', 'get', '/api/applications/{id}/', None, 1),
+    ('employer_client', 'get', '/api/applications/{id}/', None, 1),
+    ('applicant_client', 'get', '/api/applications/{id}/resume/', None, 1),
+    ('employer_client', 'patch', '/api/applications/{id}/', {'status': 'reviewing'}, 3),  # fetch + update + counters
+    ('applicant_client', 'patch', '/api/applications/{id}/', {'cover_letter': 'Hi'}, 2),
+    ('applicant_client', 'delete', '/api/applications/{id}/', None, 4),  # fetch + delete + counters + tombstone
+])
+def test_application_endpoint_query_budget(
+    request, django_assert_num_queries, application, client_name, method, path, data, budget
+):
+    client = request.getfixturevalue(client_name)
+    with django_assert_num_queries(budget):
+        response = getattr(client, method)(path.format(id=application.id), data, format='json')
+    if hasattr(response, 'streaming_content'):
+        b''.join(response.streaming_content)
+    assert response.status_code < 300
+
+
+@pytest.mark.django_db
+def test_application_list_and_detail_conditional_get(employer_client, application):
+    for url in ('/api/applications/', f'/api/applications/{application.id}/'):
+        etag = employer_client.get(url)['ETag']
+        assert employer_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    list_etag = employer_client.get('/api/applications/')['ETag']
+    detail_etag = employer_client.get(f'/api/applications/{application.id}/')['ETag']
+    employer_client.patch(f'/api/applications/{application.id}/', {'status': 'reviewing'}, format='json')
+    assert employer_client.get('/api/applications/', HTTP_IF_NONE_MATCH=list_etag).status_code == 200
+    assert employer_client.get(f'/api/applications/{application.id}/', HTTP_IF_NONE_MATCH=detail_etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_application_etag_follows_job_edits(employer_client, application):
+    etag = employer_client.get('/api/applications/')['ETag']
+    application.job.title = 'Renamed'
+    application.job.save()
+    response = employer_client.get('/api/applications/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data['results'][0]['job']['title'] == 'Renamed'
+
+
+@pytest.mark.django_db
+def test_application_conditional_get_is_scoped_to_user(applicant_client, application):
+    from users.models import User
+    from rest_framework.test import APIClient
+    stranger = APIClient()
+    stranger.force_authenticate(User.objects.create_user(email='x@example.com', password='pw', is_applicant=True))
+    etag = applicant_client.get(f'/api/applications/{application.id}/')['ETag']
+    assert stranger.get(f'/api/applications/{application.id}/', HTTP_IF_NONE_MATCH=etag).status_code == 404
+
+
+@pytest.mark.django_db
+def test_bulk_status_updates_only_owned_applications(
+    employer_client, applicant_client, application, make_job, django_assert_num_queries
+):
+    other_employer = User.objects.create_user(email='other@example.com', password='pass12345', is_employer=True)
+    foreign = applicant_client.post(
+        '/api/applications/', {'job': make_job(employer=other_employer).id, 'resume': resume_upload()}, format='multipart'
+    ).data['id']
+    before = application.updated_at
+
+    # SAVEPOINT + ownership SELECT + UPDATE + counter UPDATE + RELEASE
+    with django_assert_num_queries(5):
+        response = employer_client.post(
+            '/api/applications/bulk-status/',
+            {'ids': [application.id, foreign, 999999, application.id], 'status': 'shortlisted'},
+            format='json',
+        )
+    assert response.status_code == 200
+    assert response.data['updated'] == 1
+    assert response.data['results'] == [
+        {'id': application.id, 'result': 'updated'},
+        {'id': foreign, 'result': 'not_found'},
+        {'id': 999999, 'result': 'not_found'},
+    ]
+    application.refresh_from_db()
+    assert application.status == 'shortlisted'
+    assert application.updated_at > before
+    assert Application.objects.get(pk=foreign).status == 'pending'
+
+
+@pytest.mark.django_db
+def test_bulk_status_skips_invalid_transitions(employer_client, applicant, application, make_job):
+    final = Application.objects.create(applicant=applicant, job=make_job(), status='rejected')
+    response = employer_client.post(
+        '/api/applications/bulk-status/', {'ids': [application.id, final.id], 'status': 'accepted'}, format='json'
+    )
+    assert response.data['updated'] == 0  # pending cannot jump to accepted
+    assert response.data['results'] == [
+        {'id': application.id, 'result': 'invalid_transition'}, {'id': final.id, 'result': 'invalid_transition'},
+    ]
+    assert set(Application.objects.values_list('status', flat=True)) == {'pending', 'rejected'}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('data', [{'ids': [], 'status': 'accepted'}, {'ids': [1], 'status': 'hired'}])
+def test_bulk_status_validates_input(employer_client, data):
+    assert employer_client.post('/api/applications/bulk-status/', data, format='json').status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_status_is_for_employers(applicant_client, application):
+    response = applicant_client.post(
+        '/api/applications/bulk-status/', {'ids': [application.id], 'status': 'accepted'}, format='json'
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_duplicate_application_is_one_insert(applicant_client, application, job):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as queries:
+        response = applicant_client.post('/api/applications/', {'job': job.id}, format='json')
+    statements = [query['sql'].split()[0] for query in queries if 'SAVEPOINT' not in query['sql']]
+    # Job lookup, the insert the constraint rejects, then the check that it was a duplicate
+    assert statements == ['SELECT', 'INSERT', 'SELECT']
+    assert response.status_code == 400
+    assert response.json() == {'job': 'You have already applied to this job.'}
+    assert Application.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_other_integrity_errors_are_not_duplicates(applicant_client, job, monkeypatch):
+    from django.db import IntegrityError
+
+    def fail(*args, **kwargs):
+        raise IntegrityError('FOREIGN KEY constraint failed')  # As when the job is deleted mid-request
+
+    monkeypatch.setattr(Application, 'save', fail)
+    with pytest.raises(IntegrityError):
+        applicant_client.post('/api/applications/', {'job': job.id}, format='json')
+
+
+@pytest.mark.django_db
+def test_idempotency_key_replays_the_created_application(applicant_client, make_job):
+    job = make_job()
+    headers = {'Idempotency-Key': 'retry-1'}
+    data = {'job': job.id, 'cover_letter': 'Hello'}
+    first = applicant_client.post('/api/applications/', data, format='json', headers=headers)
+    assert first.status_code == 201 and 'Idempotent-Replayed' not in first
+
+    retry = applicant_client.post('/api/applications/', data, format='json', headers=headers)
+    assert retry.status_code == 201
+    assert retry['Idempotent-Replayed'] == 'true'
+    assert retry.data['id'] == first.data['id']
+    assert Application.objects.count() == 1
+
+    # The same key with another body is a client bug
+    other = applicant_client.post('/api/applications/', {**data, 'cover_letter': 'Bye'}, format='json', headers=headers)
+    assert other.status_code == 422
+    # Without a key a retry is just a duplicate
+    assert applicant_client.post('/api/applications/', data, format='json').status_code == 400
+
+
+@pytest.mark.django_db
+def test_idempotency_key_replays_an_overlapping_retry(applicant_client, make_job):
+    """The original create committed, but its key is not cached yet (or no longer)"""
+    from django.core.cache import cache
+    job = make_job()
+    headers = {'Idempotency-Key': 'retry-2'}
+    data = {'job': job.id, 'cover_letter': 'Hello'}
+    first = applicant_client.post('/api/applications/', data, format='json', headers=headers)
+    cache.clear()
+
+    retry = applicant_client.post('/api/applications/', data, format='json', headers=headers)
+    assert retry.status_code == 201
+    assert retry['Idempotent-Replayed'] == 'true'
+    assert retry.data['id'] == first.data['id']
+    assert Application.objects.count() == 1
+    # Recorded now: the next retry is answered from the cache
+    assert applicant_client.post('/api/applications/', data, format='json', headers=headers).data['id'] == first.data['id']
+
+
+@pytest.mark.django_db
+def test_idempotency_keys_are_per_user(applicant_client, make_job):
+    job = make_job()
+    headers = {'Idempotency-Key': 'shared'}
+    applicant_client.post('/api/applications/', {'job': job.id}, format='json', headers=headers)
+    other = APIClient()
+    other.force_authenticate(User.objects.create_user(email='other@example.com', password='pass12345', is_applicant=True))
+    response = other.post('/api/applications/', {'job': job.id}, format='json', headers=headers)
+    assert response.status_code == 201 and 'Idempotent-Replayed' not in response
+    assert Application.objects.count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('steps, final', [
+    (['reviewing', 'shortlisted', 'accepted'], 'accepted'),
+    (['reviewing', 'reviewing', 'rejected'], 'rejected'),
+    (['accepted'], 'pending'),  # Must be reviewed first
+    (['rejected', 'reviewing'], 'rejected'),  # Final
+    (['hired'], 'pending'),
+])
+def test_status_changes_follow_state_machine(employer_client, application, steps, final):
+    for step in steps:
+        response = employer_client.patch(f'/api/applications/{application.id}/', {'status': step}, format='json')
+        application.refresh_from_db()
+        assert response.status_code == (200 if application.status == step else 400)
+    assert application.status == final
+
+
+@pytest.mark.django_db
+def test_status_change_writes_only_status(employer_client, applicant_client, application):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as queries:
+        employer_client.patch(f'/api/applications/{application.id}/', {'status': 'reviewing'}, format='json')
+    [update] = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "applications_application"')]
+    assert update.split(' WHERE ')[0].count('=') == 2  # status, updated_at
+
+    with CaptureQueriesContext(connection) as queries:
+        applicant_client.patch(f'/api/applications/{application.id}/', {'cover_letter': 'Hi'}, format='json')
+    [update] = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "applications_application"')]
+    assert '"cover_letter"' in update and '"resume_filename"' not in update and '"status"' not in update
+
+
+@pytest.mark.django_db
+def test_status_change_conflicts_with_a_concurrent_one(employer_client, application, monkeypatch):
+    from applications.views import ApplicationViewSet
+    stale = Application.objects.select_related('job', 'applicant').get(pk=application.pk)
+    # Another request rejects it after this one read it as pending
+    Application.objects.filter(pk=application.pk).update(status='rejected')
+    monkeypatch.setattr(ApplicationViewSet, 'get_object', lambda self: stale)
+    response = employer_client.patch(f'/api/applications/{application.id}/', {'status': 'reviewing'}, format='json')
+    assert response.status_code == 409
+    application.refresh_from_db()
+    assert application.status == 'rejected'  # Final states stay final
+
+
+@pytest.mark.django_db
+def test_superusers_change_status(application):
+    admin = User.objects.create_superuser(email='admin@example.com', password='pass12345')
+    client = APIClient()
+    client.force_authenticate(admin)
+    response = client.patch(f'/api/applications/{application.id}/', {'status': 'shortlisted'}, format='json')
+    assert response.status_code == 200
+    assert response.data['status'] == 'shortlisted'
+    application.refresh_from_db()
+    assert application.status == 'shortlisted'
+    assert JobApplicationStats.objects.get(pk=application.job_id).shortlisted == 1
+
+
+@pytest.mark.django_db
+def test_applicant_updates_leave_status_to_the_employer(employer_client, applicant_client, application):
+    url = f'/api/applications/{application.id}/'
+    employer_client.patch(url, {'status': 'reviewing'}, format='json')
+    # A full update without status keeps the employer's status
+    response = applicant_client.put(url, {'job': application.job_id, 'cover_letter': 'Updated'}, format='json')
+    assert response.status_code == 200
+    assert response.data['status'] == 'reviewing'
+    # Sending the current status back is fine; changing it is not
+    assert applicant_client.patch(url, {'status': 'reviewing', 'cover_letter': 'Again'}, format='json').status_code == 200
+    response = applicant_client.patch(url, {'status': 'shortlisted'}, format='json')
+    assert response.status_code == 400
+    assert 'status' in response.data
+    application.refresh_from_db()
+    assert (application.status, application.cover_letter) == ('reviewing', 'Again')
+
+
+@pytest.fixture
+def inbox(employer, make_job):
+    """Applications to two of employer's jobs: (job, status) per applicant, oldest first"""
+    first, second = make_job(title='First'), make_job(title='Second')
+    applications = []
+    for i, (job, status) in enumerate([(first, 'pending'), (first, 'reviewing'), (second, 'pending'), (first, 'pending')]):
+        applicant = User.objects.create_user(email=f'inbox{i}@example.com', password='pass12345', is_applicant=True)
+        applications.append(Application.objects.create(applicant=applicant, job=job, status=status))
+    return first, second, applications
+
+
+@pytest.mark.django_db
+def test_inbox_filters(employer_client, inbox):
+    first, second, applications = inbox
+    Application.objects.filter(pk=applications[0].pk).update(applied_at=timezone.now() - timedelta(days=3))
+
+    def ids(**params):
+        response = employer_client.get('/api/applications/', params)
+        assert response.status_code == 200
+        return [application['id'] for application in response.data['results']]
+
+    newest_first = [application.id for application in reversed(applications)]
+    assert ids() == newest_first
+    assert ids(job=first.id) == [applications[3].id, applications[1].id, applications[0].id]
+    assert ids(job=first.id, status='pending') == [applications[3].id, applications[0].id]
+    assert ids(status='reviewing') == [applications[1].id]
+    assert ids(applied_after=(timezone.now() - timedelta(days=1)).date().isoformat()) == newest_first[:3]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [{'job': 'abc'}, {'status': 'hired'}, {'applied_after': 'yesterday'}])
+def test_inbox_filters_validate_input(employer_client, params):
+    assert employer_client.get('/api/applications/', params).status_code == 400
+
+
+@pytest.mark.django_db
+def test_inbox_cursor_pagination(employer_client, inbox, django_assert_max_num_queries):
+    first, _, applications = inbox
+    seen = []
+    url = f'/api/applications/?paginate=cursor&page_size=1&job={first.id}'
+    while url:
+        with django_assert_max_num_queries(2):  # ETag aggregate + page, no count
+            response = employer_client.get(url)
+        assert response.status_code == 200
+        seen.extend(application['id'] for application in response.data['results'])
+        url = response.data['next']
+    assert seen == [applications[3].id, applications[1].id, applications[0].id]
+
+
+@pytest.mark.django_db
+def test_inbox_query_uses_index(employer, inbox):
+    from django.db import connection
+    first = inbox[0]
+    queryset = Application.objects.filter(job=first, status='pending').order_by('-applied_at', '-id')[:20]
+    plan = queryset.explain()
+    assert 'app_job_status_applied_idx' in plan
+    if connection.vendor == 'sqlite':
+        assert 'TEMP B-TREE' not in plan  # Rows come out of the index in order, no sort
+
+
+@pytest.mark.django_db
+def test_job_stats_follow_application_writes(employer_client, applicant_client, application, job):
+    second_applicant = APIClient()
+    second_applicant.force_authenticate(
+        User.objects.create_user(email='second@example.com', password='pass12345', is_applicant=True)
+    )
+    second = second_applicant.post('/api/applications/', {'job': job.id, 'resume': resume_upload()}, format='multipart')
+
+    def stats():
+        response = employer_client.get(f'/api/jobs/{job.id}/stats/')
+        assert response.status_code == 200
+        return response.data['total'], {k: v for k, v in response.data['by_status'].items() if v}
+
+    assert stats() == (2, {'pending': 2})
+    employer_client.patch(f'/api/applications/{application.id}/', {'status': 'reviewing'}, format='json')
+    assert stats() == (2, {'pending': 1, 'reviewing': 1})
+    employer_client.post(
+        '/api/applications/bulk-status/', {'ids': [application.id, second.data['id']], 'status': 'rejected'}, format='json'
+    )
+    assert stats() == (2, {'rejected': 2})
+    applicant_client.delete(f'/api/applications/{application.id}/')
+    assert stats() == (1, {'rejected': 1})
+
+
+@pytest.mark.django_db
+def test_application_sparse_fieldsets(employer_client, application, django_assert_num_queries):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as queries:
+        response = employer_client.get('/api/applications/', {'fields': 'id,status,job'})
+    assert len(queries) == 3
+    assert list(response.data['results'][0]) == ['id', 'status', 'job']
+    assert response.data['results'][0]['job']['title'] == application.job.title
+    page_query = queries.captured_queries[-1]['sql']
+    assert '"cover_letter"' not in page_query and '"users_user"' not in page_query
+
+    full = employer_client.get(f'/api/applications/{application.id}/').data
+    with django_assert_num_queries(1):
+        response = employer_client.get(f'/api/applications/{application.id}/', {'omit': 'cover_letter,applicant_detail'})
+    assert response.data == {k: v for k, v in full.items() if k not in ('cover_letter', 'applicant_detail')}
+    assert employer_client.get('/api/applications/', {'omit': 'resume'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_resume_processing_runs_in_the_worker(applicant_client, employer_client, make_job):
+    from applications.models import ResumeAnalysis
+    from tasks.models import Task
+    from tasks.queue import Worker
+    text = b'Jane Doe\n\n   Senior   Python developer\nDjango, PostgreSQL'
+    created = applicant_client.post('/api/applications/', {'job': make_job().id, 'resume': resume_upload(text)}, format='multipart')
+    application = Application.objects.get(pk=created.data['id'])
+    # The request only stored the blob and queued the work
+    assert application.resume_content_type == 'application/pdf'
+    assert Task.objects.filter(payload={'sha256': application.resume_sha256}).count() == 1
+
+    Worker('test', burst=True).run()
+    analysis = ResumeAnalysis.objects.get(pk=application.resume_sha256)
+    assert analysis.text == 'Jane Doe\nSenior Python developer\nDjango, PostgreSQL'
+    application.refresh_from_db()
+    assert application.resume_content_type == 'text/plain'  # The bytes are not a PDF
+    assert not Task.objects.exists()
+
+    # The same CV for another job is already known: sniffed type, nothing queued
+    again = applicant_client.post('/api/applications/', {'job': make_job().id, 'resume': resume_upload(text)}, format='multipart')
+    assert again.data['resume_content_type'] == 'text/plain'
+    assert not Task.objects.exists()
+
+    search = {'job': application.job_id, 'resume_text': 'python developer'}
+    found = employer_client.get('/api/applications/', search).data['results']
+    assert [row['id'] for row in found] == [application.id]
+    assert employer_client.get('/api/applications/', {**search, 'resume_text': 'cobol'}).data['results'] == []
+    # The text is scanned, not indexed: never across the whole inbox
+    assert employer_client.get('/api/applications/', {'resume_text': 'python'}).status_code == 400
+
+
+@pytest.fixture
+def upload_dir(settings, tmp_path):
+    settings.RESUME_UPLOAD_DIR = str(tmp_path)
+    return tmp_path
+
+
+def put_chunk(client, upload_id, data, start, size):
+    return client.generic(
+        'PUT', f'/api/applications/uploads/{upload_id}/', data, content_type='application/octet-stream',
+        HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(data) - 1}/{size}',
+    )
+
+
+@pytest.mark.django_db
+def test_chunked_resume_upload(applicant_client, job, upload_dir):
+    import hashlib
+    content = b'%PDF-1.4 ' + b'x' * 1000
+    started = applicant_client.post('/api/applications/uploads/', {
+        'filename': 'cv.pdf', 'content_type': 'application/pdf', 'size': len(content),
+    })
+    assert started.status_code == 201
+    upload_id = started.data['id']
+    assert started.data['offset'] == 0 and started.data['status'] == 'uploading'
+
+    assert put_chunk(applicant_client, upload_id, content[:400], 0, len(content)).data['offset'] == 400
+    # A retried or out-of-order chunk is refused with the offset to continue from
+    conflict = put_chunk(applicant_client, upload_id, content[:400], 0, len(content))
+    assert conflict.status_code == 409 and conflict.data['offset'] == 400
+    # After a dropped connection the client asks where to resume
+    assert applicant_client.get(f'/api/applications/uploads/{upload_id}/').data['offset'] == 400
+    assert put_chunk(applicant_client, upload_id, content[400:], 400, len(content)).data['offset'] == len(content)
+
+    completed = applicant_client.post(f'/api/applications/uploads/{upload_id}/complete/', {
+        'checksum': hashlib.sha256(content).hexdigest(),
+    })
+    assert completed.status_code == 200
+    assert completed.data['status'] == 'complete' and completed.data['sha256'] == hashlib.sha256(content).hexdigest()
+    assert not list(upload_dir.iterdir())  # The temporary file moved into the resume store
+
+    applied = applicant_client.post('/api/applications/', {'job': job.id, 'resume_upload': upload_id})
+    assert applied.status_code == 201
+    application = Application.objects.get(pk=applied.data['id'])
+    assert (application.resume_filename, application.resume_size) == ('cv.pdf', len(content))
+    assert resume_storage().open(blob_name(application.resume_sha256)).read() == content
+    # An upload is used up by the application
+    assert applicant_client.get(f'/api/applications/uploads/{upload_id}/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_resume_upload_checksum_mismatch_resets(applicant_client, upload_dir):
+    import hashlib
+    content = b'%PDF-1.4 resume'
+    upload_id = applicant_client.post('/api/applications/uploads/', {
+        'filename': 'cv.pdf', 'size': len(content), 'checksum': hashlib.sha256(b'other').hexdigest(),
+    }).data['id']
+    put_chunk(applicant_client, upload_id, content, 0, len(content))
+    response = applicant_client.post(f'/api/applications/uploads/{upload_id}/complete/')
+    assert response.status_code == 400 and 'checksum' in response.data
+    assert applicant_client.get(f'/api/applications/uploads/{upload_id}/').data['offset'] == 0
+
+
+@pytest.mark.django_db
+def test_resume_upload_validation(applicant_client, employer_client, make_job, upload_dir, settings):
+    settings.RESUME_UPLOAD_MAX_SIZE = 100
+    assert applicant_client.post('/api/applications/uploads/', {'filename': 'cv.pdf', 'size': 101}).status_code == 400
+    assert employer_client.post('/api/applications/uploads/', {'filename': 'cv.pdf', 'size': 10}).status_code == 403
+    upload_id = applicant_client.post('/api/applications/uploads/', {'filename': 'cv.pdf', 'size': 10}).data['id']
+    url = f'/api/applications/uploads/{upload_id}/'
+    assert applicant_client.generic('PUT', url, b'0123456789').status_code == 400  # No Content-Range
+    assert put_chunk(applicant_client, upload_id, b'0' * 11, 0, 11).status_code == 400  # Beyond size
+    assert applicant_client.post(f'{url}complete/', {'checksum': '0' * 64}).status_code == 400  # Incomplete
+    # Unfinished uploads cannot be applied with
+    applied = applicant_client.post('/api/applications/', {'job': make_job().id, 'resume_upload': upload_id})
+    assert applied.status_code == 400 and 'resume_upload' in applied.data
+    assert applicant_client.delete(url).status_code == 204
+
+
+@pytest.mark.django_db
+def test_resume_upload_expires(applicant_client, upload_dir):
+    from datetime import timedelta
+    from django.utils import timezone
+    from applications.models import ResumeUpload
+    from tasks.models import Task
+    from tasks.queue import Worker
+    upload_id = applicant_client.post('/api/applications/uploads/', {'filename': 'cv.pdf', 'size': 10}).data['id']
+    put_chunk(applicant_client, upload_id, b'01234', 0, 10)
+    assert (upload_dir / f'{upload_id}.part').exists()
+
+    Worker('test', burst=True).run()  # Not due yet
+    assert ResumeUpload.objects.filter(pk=upload_id).exists()
+    past = timezone.now() - timedelta(seconds=1)
+    ResumeUpload.objects.update(expires_at=past)
+    Task.objects.update(run_after=past)
+    Worker('test', burst=True).run()
+    assert not ResumeUpload.objects.exists()
+    assert not list(upload_dir.iterdir())
+
+
+@pytest.mark.django_db
+def test_expired_upload_takes_its_unused_blob_along(applicant_client, job, upload_dir):
+    import hashlib
+    from applications.models import ResumeUpload
+    from applications.tasks import expire_resume_upload
+    from django.utils import timezone
+
+    def completed_upload(content):
+        upload_id = applicant_client.post('/api/applications/uploads/', {'filename': 'cv.pdf', 'size': len(content)}).data['id']
+        put_chunk(applicant_client, upload_id, content, 0, len(content))
+        applicant_client.post(f'/api/applications/uploads/{upload_id}/complete/', {'checksum': hashlib.sha256(content).hexdigest()})
+        return upload_id
+
+    unused, shared = completed_upload(b'%PDF-1.4 unused'), completed_upload(b'%PDF-1.4 shared')
+    # The same bytes, sent with an application
+    applicant_client.post('/api/applications/', {'job': job.id, 'resume': resume_upload(b'%PDF-1.4 shared')}, format='multipart')
+    ResumeUpload.objects.update(expires_at=timezone.now())
+    expire_resume_upload(upload_id=unused)
+    expire_resume_upload(upload_id=shared)
+
+    assert not ResumeUpload.objects.exists()
+    assert not resume_storage().exists(blob_name(hashlib.sha256(b'%PDF-1.4 unused').hexdigest()))
+    assert resume_storage().exists(blob_name(hashlib.sha256(b'%PDF-1.4 shared').hexdigest()))
@@ -0,0 +1,133 @@
+"""
+Resumable resume uploads for slow or unreliable connections.
+
+1. POST /api/applications/uploads/ {"filename", "size", "content_type", "checksum"?}
+   starts an upload and returns its id.
+2. PUT /api/applications/uploads/{id}/ sends the next chunk as the raw body
+   with "Content-Range: bytes <start>-<end>/<size>"; start must equal the
+   current offset. The body is streamed to a temporary file, so memory use
+   does not depend on chunk or file size. After a dropped connection,
+   GET /api/applications/uploads/{id}/ tells how many bytes arrived.
+3. POST /api/applications/uploads/{id}/complete/ {"checksum"} checks the
+   SHA-256 of the whole file and moves it into the resume store.
+4. POST /api/applications/ {"job", "resume_upload": id} applies with it.
+
+A chunk is recorded with an UPDATE conditioned on the offset it started at,
+so of two concurrent PUTs for the same range only one advances the upload;
+the checksum catches anything the loser may have written.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Application, ResumeUpload
+from .storage import delete_resume, hash_file, store_resume
+
+READ_CHUNK_SIZE = 64 * 1024
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+class OffsetConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_code = 'offset_conflict'
+
+    def __init__(self, offset):
+        super().__init__(f'Expected a chunk starting at byte {offset}.')
+        # Keep the offset a number for clients to resume from
+        self.detail = {'detail': self.detail, 'offset': offset}
+
+
+def parse_content_range(header, upload):
+    """Return (start, length) of the chunk described by a Content-Range header"""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        raise ValidationError({'detail': 'Send each chunk with "Content-Range: bytes <start>-<end>/<size>".'})
+    start, end, total = match.groups()
+    start, end = int(start), int(end)
+    if end < start or end >= upload.size or total not in ('*', str(upload.size)):
+        raise ValidationError({'detail': f'Chunk does not fit in an upload of {upload.size} bytes.'})
+    return start, end - start + 1
+
+
+def append_chunk(upload, stream, start, length):
+    """
+    Write up to length bytes from stream at byte start of the upload's file
+    and record the new offset. Returns the number of bytes received; fewer
+    than length means the client went away mid-chunk, and the bytes that did
+    arrive still count.
+    """
+    if upload.status != ResumeUpload.UPLOADING:
+        raise ValidationError({'detail': 'This upload is already complete.'})
+    if start != upload.offset:
+        raise OffsetConflict(upload.offset)
+    os.makedirs(settings.RESUME_UPLOAD_DIR, exist_ok=True)
+    received = 0
+    with open(upload.temp_path, 'r+b' if os.path.exists(upload.temp_path) else 'wb') as file:
+        # Drop whatever an interrupted earlier attempt left past the recorded offset
+        file.seek(start)
+        file.truncate()
+        while received < length:
+            chunk = stream.read(min(READ_CHUNK_SIZE, length - received)) if stream else b''
+            if not chunk:
+                break
+            file.write(chunk)
+            received += len(chunk)
+    advanced = ResumeUpload.objects.filter(pk=upload.pk, offset=start, status=ResumeUpload.UPLOADING).update(
+        offset=start + received, updated_at=timezone.now()
+    )
+    if not advanced:
+        upload.refresh_from_db(fields=['offset'])
+        raise OffsetConflict(upload.offset)
+    upload.offset = start + received
+    return received
+
+
+def complete_upload(upload, checksum):
+    """Verify the received bytes against the SHA-256 checksum and move them into the resume store"""
+    if upload.status == ResumeUpload.COMPLETE:
+        return upload
+    if upload.offset != upload.size:
+        raise ValidationError({'detail': f'Upload incomplete: {upload.offset} of {upload.size} bytes received.'})
+    checksum = (checksum or upload.checksum).lower()
+    if not checksum:
+        raise ValidationError({'checksum': ['A SHA-256 checksum of the whole file is required.']})
+    with open(upload.temp_path, 'rb') as fh:
+        file = File(fh, name=upload.filename)
+        digest = hash_file(file)
+        if digest[0] != checksum:
+            # Something got corrupted on the way: make the client start over
+            fh.close()
+            discard_file(upload)
+            ResumeUpload.objects.filter(pk=upload.pk).update(offset=0, updated_at=timezone.now())
+            raise ValidationError({'checksum': ['Checksum mismatch; the upload was reset, send it again.']})
+        upload.sha256, _ = store_resume(file, digest=digest)
+    discard_file(upload)
+    upload.status = ResumeUpload.COMPLETE
+    upload.save(update_fields=['sha256', 'status', 'updated_at'])
+    return upload
+
+
+def discard_file(upload):
+    try:
+        os.remove(upload.temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def discard_upload(upload):
+    """
+    Delete an upload and its partial file. A completed upload's blob goes too
+    unless an application or another upload refers to the same bytes.
+    """
+    discard_file(upload)
+    upload.delete()
+    if upload.sha256 and not (
+        Application.objects.filter(resume_sha256=upload.sha256).exists()
+        or ResumeUpload.objects.filter(sha256=upload.sha256).exists()
+    ):
+        delete_resume(upload.sha256)
@@ -1,9 +1,11 @@
 
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import ApplicationViewSet
+from .views import ApplicationViewSet, ResumeUploadViewSet
 
 router = DefaultRouter()
+# Before '' so 'uploads' is not taken for an application id
+router.register('uploads', ResumeUploadViewSet, basename='resume-upload')
 router.register('', ApplicationViewSet)
 
 urlpatterns = [
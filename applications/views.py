@@ -1,10 +1,48 @@
 
-from rest_framework import viewsets
-from .models import Application
-from .serializers import ApplicationSerializer
-from jobs.permissions import IsApplicationOwnerOrJobOwner
+from collections import defaultdict
+from datetime import timedelta
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.response import Response
+from users.models import User
+from tasks.queue import enqueue
+from .models import Application, ResumeAnalysis, ResumeUpload
+from .serializers import ApplicationSerializer, BulkStatusSerializer, ResumeUploadSerializer
+from .downloads import resume_response
+from .filters import APPLICATION_ORDERING, filter_applications
+from .pagination import ApplicationCursorPagination
+from .stats import adjust_stats, status_change_deltas
+from .tasks import EXPIRE_UPLOAD
+from .uploads import append_chunk, complete_upload, discard_upload, parse_content_range
+from config.async_views import AsyncReadMixin
+from config.db_router import ReplicaReadMixin
+from config.idempotency import IDEMPOTENCY_HEADER, AlreadyCreated, IdempotentCreateMixin
+from config.fieldsets import SparseFieldsetMixin
+from jobs.conditional import ConditionalResponseMixin
+from jobs.pagination import wants_cursor_pagination
+from jobs.permissions import IsApplicant, IsApplicationOwnerOrJobOwner
+
+
+class StatusConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The application\'s status changed while this request was made; reload it and try again.'
+    default_code = 'status_conflict'
+
+
+def bulk_result(pk, owned_ids, changed_ids):
+    if pk in changed_ids:
+        return 'updated'
+    return 'invalid_transition' if pk in owned_ids else 'not_found'
+
+
+class ApplicationViewSet(ConditionalResponseMixin, SparseFieldsetMixin, ReplicaReadMixin, IdempotentCreateMixin,
+                         AsyncReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing job applications.
     
@@ -12,10 +50,40 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     - Only authenticated applicants can create applications (POST)
     - Applicants can view/update/delete only their own applications (GET, PUT, PATCH, DELETE)
     - Employers can view applications submitted to their job postings (GET only)
+
+    List and detail responses carry an ETag (details also Last-Modified) so polling dashboards
+    get 304s while nothing changed. ?fields=id,status,job or ?omit=cover_letter
+    trims them and the columns read to match (see config/fieldsets.py).
+    Lists are newest first and take ?job=, ?status= and ?applied_after=, and
+    with ?job= also ?resume_text=;
+    ?paginate=cursor switches to keyset pages for deep inboxes.
+    Under ASGI, list and retrieve run as async views (config/async_views.py).
+    POSTs with an Idempotency-Key header can be retried safely (config/idempotency.py).
     """
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [IsApplicationOwnerOrJobOwner]
+    # The representation embeds job details, so job edits must change the ETag too
+    conditional_timestamp_fields = ('updated_at', 'job__updated_at')
+    sparse_fields = ApplicationSerializer.FIELD_SOURCES
+    # Permission checks compare applicant/job owner ids; validators read the timestamps,
+    # cursor pages the ordering
+    sparse_always_load = ('id', 'applicant', 'updated_at', 'applied_at', 'job__employer', 'job__updated_at')
+
+    @property
+    def paginator(self):
+        """Cursor pages when the client opts in (?paginate=cursor), numbered pages otherwise"""
+        if not hasattr(self, '_paginator'):
+            if wants_cursor_pagination(self.request):
+                self._paginator = ApplicationCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_serializer_class(self):
+        if self.action == 'bulk_status':
+            return BulkStatusSerializer
+        return super().get_serializer_class()
 
     def get_serializer_context(self):
         """Add request to serializer context"""
@@ -23,17 +91,21 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
     
-    def get_object(self):
-        """
-        Override to ensure resume_data is loaded for detail views.
-        """
-        # Get object from queryset (which may have deferred resume_data for list views)
-        obj = super().get_object()
-        # For retrieve/update/partial_update, reload without defer to get resume_data
-        if self.action in ['retrieve', 'update', 'partial_update']:
-            # Get fresh object with all fields loaded (not deferred)
-            obj = Application.objects.select_related('job', 'applicant', 'job__employer').get(pk=obj.pk)
-        return obj
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+        # ?job=, ?status=, ?applied_after=, each backed by an index (see applications/filters.py)
+        queryset = filter_applications(queryset, self.request.query_params)
+        # ?resume_text=<words>: resumes whose extracted text (applications/tasks.py) contains them.
+        # Not indexed: each resume's text is scanned, so only within one job's applications
+        text = self.request.query_params.get('resume_text', '').strip()
+        if text:
+            if not self.request.query_params.get('job'):
+                raise ValidationError({'resume_text': 'Search resumes within one job: add ?job=<id>.'})
+            matching = ResumeAnalysis.objects.filter(sha256=OuterRef('resume_sha256'), text__icontains=text)
+            queryset = queryset.filter(Exists(matching))
+        return queryset
 
     def get_queryset(self):
         """
@@ -47,67 +119,203 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             return Application.objects.none()
         
-        # Use select_related to optimize queries and prevent N+1 problem
-        queryset = Application.objects.select_related('job', 'applicant', 'job__employer')
-        
-        # For list views, defer resume_data to avoid loading huge binary data
-        # For retrieve (detail) views, include resume_data so resume can be viewed
-        if self.action == 'list':
-            queryset = queryset.defer('resume_data')
-        # For retrieve/update/partial_update actions, ensure resume_data is loaded
+        # Use select_related to optimize queries and prevent N+1 problem.
+        # This is the only fetch detail actions make: serialization and the
+        # permission checks read job/applicant from it and compare ids.
+        queryset = Application.objects.select_related('job', 'applicant').order_by(*APPLICATION_ORDERING)
         
         # Superusers can see all applications
         if user.is_superuser:
-            return queryset.all()
+            return self.apply_fieldset(queryset.all())
         
         # Applicants see only their own applications
         if user.is_applicant:
-            return queryset.filter(applicant=user)
+            return self.apply_fieldset(queryset.filter(applicant_id=user.id))
         
         # Employers see applications for their jobs
         if user.is_employer:
-            return queryset.filter(job__employer=user)
+            return self.apply_fieldset(queryset.filter(job__employer_id=user.id))
         
         return Application.objects.none()
 
+    @action(detail=True, methods=['get'])
+    def resume(self, request, pk=None):
+        """
+        Stream the resume file for an application.
+
+        Supports Range requests (206) and conditional GET: the ETag is the
+        blob's SHA-256, so If-None-Match answers 304 without reading storage.
+        """
+        application = self.get_object()
+        if not application.resume_sha256:
+            raise NotFound('This application has no resume.')
+        return resume_response(request, application)
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """
+        Set one status on many applications: {"ids": [...], "status": "reviewing"}.
+
+        Employers may only change applications to their own jobs. Ownership is
+        checked with one query and the change applied with one UPDATE, which
+        repeats the ownership condition, plus one counter UPDATE per affected
+        job. Ids that do not exist or belong to another employer's job are
+        reported as not_found.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids, status = serializer.validated_data['ids'], serializer.validated_data['status']
+
+        user = request.user
+        owned = Application.objects.filter(id__in=ids)
+        if not user.is_superuser:
+            owned = owned.filter(job__employer_id=user.id)
+        with transaction.atomic():
+            rows = list(owned.select_for_update(of=('self',)).values_list('id', 'job_id', 'status'))
+            owned_ids = {pk for pk, _, _ in rows}
+            rows = [row for row in rows if Application.can_change_status(row[2], status)]
+            changed_ids = {pk for pk, _, _ in rows}
+            # .update() skips auto_now; bump updated_at so ETags change
+            updated = owned.filter(id__in=changed_ids).update(status=status, updated_at=timezone.now())
+            # .update() sends no signals either: move the rows between their jobs' counters here
+            moved = defaultdict(list)
+            for _, job_id, old_status in rows:
+                if old_status != status:
+                    moved[job_id].append(old_status)
+            for job_id, old_statuses in moved.items():
+                adjust_stats(job_id, status_change_deltas(old_statuses, status))
+
+        return Response({
+            'status': status,
+            'updated': updated,
+            'results': [{'id': pk, 'result': bulk_result(pk, owned_ids, changed_ids)} for pk in ids],
+        })
+
     def perform_create(self, serializer):
         """
         Automatically assign the current user as the applicant when creating an application.
         Only applicants can reach this point due to permission checks.
+
+        Duplicates are caught by the (applicant, job) unique constraint rather
+        than a prior lookup: one query less, and no race between check and insert.
+        Only a failed insert pays for the lookup telling a duplicate from any
+        other integrity error (the job deleted meanwhile), which is re-raised.
+        With an Idempotency-Key the duplicate is taken for a retry of the
+        request that created it and answered with that application.
         """
-        applicant = self.request.user
-        job = serializer.validated_data['job']
-        
-        # Check if user has already applied to this job
-        if Application.objects.filter(applicant=applicant, job=job).exists():
-            from rest_framework.exceptions import ValidationError
+        user = self.request.user
+        # A token user (JWT_STATELESS_AUTH) is not a model instance; assign it by id
+        applicant = {'applicant': user} if isinstance(user, User) else {'applicant_id': user.id}
+        try:
+            # Also rolls back what saving did before the insert failed (a used-up resume upload)
+            with transaction.atomic():
+                serializer.save(status='pending', **applicant)
+        except IntegrityError:
+            job = serializer.validated_data['job']
+            existing = Application.objects.filter(applicant_id=user.id, job=job).first()
+            if existing is None:
+                raise
+            if self.request.headers.get(IDEMPOTENCY_HEADER):
+                # Most likely a retry that overlapped the original; IdempotentCreateMixin replays it
+                raise AlreadyCreated(existing)
             raise ValidationError({'job': 'You have already applied to this job.'})
-        
-        serializer.save(applicant=applicant, status='pending')
     
     def perform_update(self, serializer):
         """
-        Handle update operations - allow employers to update status only.
+        Handle update operations - allow employers (and superusers) to update status only.
         """
         user = self.request.user
         application = serializer.instance
         
         # If employer is updating, only allow status field updates
-        if user.is_employer and application.job.employer == user:
-            # Employers can only update status field
+        if application.status_editable_by(user):
+            # Employers and superusers can only update status field
             validated_data = serializer.validated_data
             
             # Get only the status field from validated_data
             # Filter out other fields that might be in the request
             if 'status' in validated_data:
-                application.status = validated_data['status']
-                application.save()
+                self.change_status(application, validated_data['status'])
             else:
                 # No status in request, don't update
-                from rest_framework.exceptions import ValidationError
                 raise ValidationError({
                     'status': 'Status field is required for updates.'
                 })
         else:
-            # Applicants can update their own applications (all fields except applicant)
+            # Applicants can update their own applications (all fields except applicant and status;
+            # validate_status let through only the status the application already has)
+            serializer.validated_data.pop('status', None)
             serializer.save()
+
+    def change_status(self, application, status):
+        """
+        Apply a status change the serializer checked against application.status.
+
+        The UPDATE repeats that status as a condition: if a concurrent request
+        changed it since the row was read, nothing is written and the client
+        gets 409, so no change skips the state machine.
+        """
+        old_status, now = application.status, timezone.now()
+        with transaction.atomic(savepoint=False):
+            changed = Application.objects.filter(pk=application.pk, status=old_status).update(
+                status=status, updated_at=now
+            )
+            # .update() sends no signals: move the row between its job's counters here
+            if changed and old_status != status:
+                adjust_stats(application.job_id, status_change_deltas([old_status], status))
+        if not changed:
+            raise StatusConflict()
+        application.status, application.updated_at = status, now
+        application._counted_as = (application.job_id, status)
+
+
+class ResumeUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin,
+                          viewsets.GenericViewSet):
+    """
+    Resumable resume uploads for applicants (protocol in applications/uploads.py).
+
+    POST starts an upload, PUT appends the chunk described by its
+    Content-Range header, GET reports the offset to resume from after a
+    dropped connection, POST .../complete/ verifies the checksum, and DELETE
+    abandons the upload. Uploads not used for an application within
+    RESUME_UPLOAD_EXPIRY seconds are discarded by the background worker.
+    """
+    serializer_class = ResumeUploadSerializer
+    permission_classes = [IsApplicant]
+
+    def get_queryset(self):
+        return ResumeUpload.objects.filter(owner_id=self.request.user.id)
+
+    def perform_create(self, serializer):
+        expires_at = timezone.now() + timedelta(seconds=settings.RESUME_UPLOAD_EXPIRY)
+        with transaction.atomic():
+            upload = serializer.save(owner_id=self.request.user.id, expires_at=expires_at)
+            enqueue(EXPIRE_UPLOAD, run_after=expires_at, upload_id=str(upload.pk))
+
+    def update(self, request, *args, **kwargs):
+        """
+        Append one chunk: the raw request body, placed by
+        "Content-Range: bytes <start>-<end>/<size>". Answers with the upload
+        (its offset is where the next chunk starts), 409 with the expected
+        offset if start is not it, or 400 if the body ended early.
+        """
+        upload = self.get_object()
+        start, length = parse_content_range(request.META.get('HTTP_CONTENT_RANGE'), upload)
+        # Read the body straight from the socket; request.data would buffer it
+        received = append_chunk(upload, request.stream, start, length)
+        if received < length:
+            return Response(
+                {'detail': f'Chunk incomplete: {received} of {length} bytes received.', 'offset': upload.offset},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Finish the upload: {"checksum": "<sha256 hex>"} unless it was given when starting"""
+        upload = self.get_object()
+        complete_upload(upload, request.data.get('checksum', ''))
+        return Response(self.get_serializer(upload).data)
+
+    def perform_destroy(self, instance):
+        discard_upload(instance)
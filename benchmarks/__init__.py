@@ -0,0 +1,8 @@
+"""
+Performance benchmarks. Each module is a script run from the repository root:
+
+    python -m benchmarks.bench_job_serialization --rows 100000
+
+Benchmarks run against a throwaway test database and print a summary; pass
+--output results.json to keep a machine-readable copy for comparing commits.
+"""
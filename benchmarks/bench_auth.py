@@ -0,0 +1,71 @@
+"""
+Login and registration cost per password hashing policy.
+
+Each hasher in settings.PASSWORD_HASHERS (with its configured cost) is made
+the preferred one in turn; logins and registrations then go through the real
+views in-process on a single thread, so requests per second is per core.
+
+    python -m benchmarks.bench_auth --logins 50
+    ARGON2_TIME_COST=3 python -m benchmarks.bench_auth --hashers argon2
+"""
+import json
+
+from .common import argument_parser, benchmark_database, measure, report, setup_django, summarize
+
+PASSWORD = 'bench-password'
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument('--logins', type=int, default=30, help='timed logins (and registrations) per hasher')
+    parser.add_argument('--hashers', nargs='*', default=['argon2', 'bcrypt', 'pbkdf2'])
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.hashers import get_hasher
+    from django.test import Client
+    from django.test.utils import override_settings
+    from users.models import User
+
+    client = Client()
+    hasher_paths = settings.PASSWORD_HASHER_CLASSES
+    counter = iter(range(10 ** 9))
+
+    def post(path, payload, expected):
+        response = client.post(path, json.dumps(payload), content_type='application/json')
+        assert response.status_code == expected, response.content
+
+    results = {}
+    with benchmark_database(keepdb=args.keepdb):
+        for name in args.hashers:
+            preferred = hasher_paths[name]
+            with override_settings(PASSWORD_HASHERS=[preferred] + [p for p in hasher_paths.values() if p != preferred]):
+                try:
+                    get_hasher().encode(PASSWORD, get_hasher().salt())
+                except ValueError as exc:  # Library not installed
+                    print(f'  {name}: skipped ({exc})')
+                    continue
+                email = f'bench-login-{name}@example.com'
+                User.objects.create_user(email=email, password=PASSWORD)
+                cost = {
+                    'argon2': f't={settings.ARGON2_TIME_COST},m={settings.ARGON2_MEMORY_COST},p={settings.ARGON2_PARALLELISM}',
+                    'bcrypt': f'rounds={settings.BCRYPT_ROUNDS}',
+                    'pbkdf2': f'iterations={settings.PBKDF2_ITERATIONS}',
+                }[name]
+                cases = {
+                    'login': lambda: post('/api/users/login/', {'email': email, 'password': PASSWORD}, 200),
+                    'register': lambda: post(
+                        '/api/users/register/', {'email': f'bench-new-{next(counter)}@example.com', 'password': PASSWORD}, 201
+                    ),
+                }
+                for case, func in cases.items():
+                    summary = summarize(measure(func, args.logins))
+                    summary['per_sec_per_core'] = round(1000 / summary['mean_ms'], 1)
+                    summary['cost'] = cost
+                    results[f'{name}.{case}'] = summary
+        report('auth', {'logins': args.logins, 'hashers': args.hashers}, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,414 @@
+"""
+Load test for every API endpoint in users, jobs and applications.
+
+Seeds a throwaway database (see benchmarks/seed.py), then drives each endpoint
+either in-process through Django's test client (default) or over HTTP against
+a local server on the same database: gunicorn with sync workers (--server
+gunicorn, the WSGI deployment) or with uvicorn workers running config.asgi
+(--server uvicorn, the ASGI deployment with async reads). Reports
+p50/p95/p99 latency, queries per request (from the Server-Timing header),
+status codes, response size and throughput per case, plus peak RSS.
+
+--db-latency-ms delays every query in the server by a fixed time, like the
+round trip to a remote database, to compare how the two deployments hold up
+under concurrency with the same number of worker processes (equal memory).
+
+    python -m benchmarks.bench_endpoints
+    python -m benchmarks.bench_endpoints --server gunicorn --workers 4 --concurrency 8
+    python -m benchmarks.bench_endpoints --server uvicorn --workers 2 --concurrency 32 --db-latency-ms 20
+    python -m benchmarks.bench_endpoints --cases jobs. --requests 500 --output endpoints.json
+"""
+import http.client
+import importlib.util
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .common import REPO_ROOT, argument_parser, benchmark_database, report, setup_django, summarize
+from .common import temporary_resume_storage
+from .seed import LOCATIONS, PASSWORD, SKILLS, resume_upload, seed
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+MULTIPART_BOUNDARY = 'BenchBoundary7MA4YWxkTrZu0gW'
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    role: str = 'anonymous'
+    json: dict = None
+    multipart: dict = None
+    headers: dict = field(default_factory=dict)
+
+
+@dataclass
+class Result:
+    duration: float
+    status: int
+    size: int
+    queries: int = None
+
+
+class InProcessClient:
+    """Django test client; the response body (streamed or not) is fully consumed"""
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def send(self, request, headers):
+        """Return (duration, status, body, lower-cased response headers)"""
+        from django.test.client import encode_multipart
+        kwargs = {f'HTTP_{name.upper().replace("-", "_")}': value for name, value in headers.items()}
+        if request.json is not None:
+            kwargs.update(data=json.dumps(request.json), content_type='application/json')
+        elif request.multipart is not None:
+            kwargs.update(
+                data=encode_multipart(MULTIPART_BOUNDARY, request.multipart),
+                content_type=f'multipart/form-data; boundary={MULTIPART_BOUNDARY}',
+            )
+        start = time.perf_counter()
+        response = self.client.generic(request.method, request.path, **kwargs)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        duration = time.perf_counter() - start
+        return duration, response.status_code, body, {name.lower(): value for name, value in response.items()}
+
+
+class HttpClient:
+    """Keep-alive HTTP/1.1 connections to a local server, one per thread"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.local = threading.local()
+
+    def connection(self):
+        if getattr(self.local, 'connection', None) is None:
+            self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        return self.local.connection
+
+    def send(self, request, headers):
+        from django.test.client import encode_multipart
+        headers = dict(headers)
+        body = None
+        if request.json is not None:
+            body = json.dumps(request.json).encode()
+            headers['Content-Type'] = 'application/json'
+        elif request.multipart is not None:
+            body = encode_multipart(MULTIPART_BOUNDARY, request.multipart)
+            headers['Content-Type'] = f'multipart/form-data; boundary={MULTIPART_BOUNDARY}'
+        start = time.perf_counter()
+        try:
+            connection = self.connection()
+            connection.request(request.method, request.path, body=body, headers=headers)
+            response = connection.getresponse()
+            content = response.read()
+        except (http.client.HTTPException, OSError):
+            # The server closed an idle keep-alive connection; retry once on a new one
+            self.local.connection = None
+            connection = self.connection()
+            connection.request(request.method, request.path, body=body, headers=headers)
+            response = connection.getresponse()
+            content = response.read()
+        duration = time.perf_counter() - start
+        return duration, response.status, content, {name.lower(): value for name, value in response.getheaders()}
+
+
+class Context:
+    """Seeded ids, per-role credentials and counters shared by the cases"""
+
+    def __init__(self, client, data, rng, resume_kb):
+        self.client = client
+        self.data = data
+        self.rng = rng
+        self.resume_kb = resume_kb
+        self.tokens = {}
+        self.counter = 0
+        self.open_jobs = iter(data.open_job_ids)
+        employers = len(data.employer_ids)
+        # bulk seeding assigns job i to employer i % employers
+        self.employer_job_ids = data.job_ids[::employers]
+        self.etags = {}
+
+    def next_id(self):
+        self.counter += 1
+        return self.counter
+
+    def login(self, role):
+        """Access/refresh tokens for the first seeded user of role"""
+        if role not in self.tokens:
+            email = {'employer': self.data.employer_emails, 'applicant': self.data.applicant_emails}[role][0]
+            _, status, body, _ = self.client.send(
+                Request('POST', '/api/users/login/', json={'email': email, 'password': PASSWORD}), {}
+            )
+            if status != 200:
+                raise RuntimeError(f'login as {email} failed with HTTP {status}: {body[:200]!r}')
+            self.tokens[role] = json.loads(body)['tokens']
+        return self.tokens[role]
+
+    def headers(self, request):
+        headers = dict(request.headers)
+        if request.role != 'anonymous':
+            headers['Authorization'] = f'Bearer {self.login(request.role)["access"]}'
+        return headers
+
+    def etag(self, path, role):
+        """ETag of a GET response, fetched once, for revalidation cases"""
+        key = (path, role)
+        if key not in self.etags:
+            request = Request('GET', path, role)
+            _, _, _, headers = self.client.send(request, self.headers(request))
+            self.etags[key] = headers['etag']
+        return self.etags[key]
+
+
+def status_toggle(ctx):
+    # Allowed from pending, reviewing and shortlisted alike (Application.STATUS_TRANSITIONS)
+    return ctx.rng.choice(('reviewing', 'shortlisted'))
+
+
+# name -> function(ctx) returning the next Request. Names are grouped by app
+# so --cases can select a prefix such as "jobs." or "applications.list".
+CASES = {
+    'users.register': lambda ctx: Request('POST', '/api/users/register/', json={
+        'email': f'bench-new-{ctx.next_id()}@example.com', 'password': PASSWORD,
+    }),
+    'users.login': lambda ctx: Request('POST', '/api/users/login/', json={
+        'email': ctx.rng.choice(ctx.data.applicant_emails), 'password': PASSWORD,
+    }),
+    'users.token_refresh': lambda ctx: Request('POST', '/api/token/refresh/', json={
+        'refresh': ctx.login('applicant')['refresh'],
+    }),
+    'jobs.list.anonymous': lambda ctx: Request('GET', '/api/jobs/'),
+    'jobs.list.authenticated': lambda ctx: Request('GET', '/api/jobs/', 'applicant'),
+    'jobs.list.revalidate': lambda ctx: Request('GET', '/api/jobs/', 'applicant', headers={
+        'If-None-Match': ctx.etag('/api/jobs/', 'applicant'),
+    }),
+    'jobs.list.search': lambda ctx: Request(
+        'GET', f'/api/jobs/?q={ctx.rng.choice(SKILLS).replace(" ", "+")}', 'applicant'
+    ),
+    'jobs.list.filtered': lambda ctx: Request(
+        'GET', f'/api/jobs/?location={ctx.rng.choice(LOCATIONS).replace(" ", "+")}'
+               f'&salary_min={ctx.rng.randrange(30000, 150000, 10000)}&ordering=-salary',
+        'applicant',
+    ),
+    'jobs.list.cursor': lambda ctx: Request('GET', '/api/jobs/?paginate=cursor&page_size=50', 'applicant'),
+    'jobs.list.ndjson': lambda ctx: Request('GET', '/api/jobs/?stream=ndjson', 'applicant'),
+    'jobs.retrieve.anonymous': lambda ctx: Request('GET', f'/api/jobs/{ctx.rng.choice(ctx.data.job_ids)}/'),
+    'jobs.retrieve.authenticated': lambda ctx: Request(
+        'GET', f'/api/jobs/{ctx.rng.choice(ctx.data.job_ids)}/', 'applicant'
+    ),
+    'jobs.create': lambda ctx: Request('POST', '/api/jobs/', 'employer', json={
+        'title': f'Benchmark Engineer {ctx.next_id()}',
+        'description': 'Measure, profile and speed up the job portal. ' * 5,
+        'location': ctx.rng.choice(LOCATIONS),
+        'salary': '120000.00',
+    }),
+    'jobs.update': lambda ctx: Request(
+        'PATCH', f'/api/jobs/{ctx.rng.choice(ctx.employer_job_ids)}/', 'employer',
+        json={'salary': f'{ctx.rng.randrange(60000, 200000, 1000)}.00'},
+    ),
+    'applications.list.applicant': lambda ctx: Request('GET', '/api/applications/', 'applicant'),
+    'applications.list.employer': lambda ctx: Request('GET', '/api/applications/', 'employer'),
+    'applications.retrieve': lambda ctx: Request(
+        'GET', f'/api/applications/{ctx.rng.choice(ctx.data.employer_application_ids)}/', 'employer'
+    ),
+    'applications.resume': lambda ctx: Request(
+        'GET', f'/api/applications/{ctx.rng.choice(ctx.data.applicant_application_ids)}/resume/', 'applicant'
+    ),
+    'applications.create': lambda ctx: Request('POST', '/api/applications/', 'applicant', multipart={
+        'job': next(ctx.open_jobs),
+        'cover_letter': 'Benchmark application',
+        'resume': resume_upload(ctx.rng, ctx.resume_kb),
+    }),
+    'applications.update_status': lambda ctx: Request(
+        'PATCH', f'/api/applications/{ctx.rng.choice(ctx.data.employer_open_application_ids)}/', 'employer',
+        json={'status': status_toggle(ctx)},
+    ),
+}
+
+
+def run_case(ctx, make_request, requests, warmup, concurrency):
+    """Warm up, then send requests (built in order, sent by concurrency threads)"""
+    def send(request):
+        duration, status, body, headers = ctx.client.send(request, ctx.headers(request))
+        match = SERVER_TIMING_QUERIES.search(headers.get('server-timing', ''))
+        return Result(duration, status, len(body), int(match.group(1)) if match else None)
+
+    for _ in range(warmup):
+        send(make_request(ctx))
+    # Build requests up front: the generators share one RNG and are not thread-safe
+    batch = [make_request(ctx) for _ in range(requests)]
+    for request in batch:
+        ctx.headers(request)  # log in before the clock starts
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(send, batch))
+    else:
+        results = [send(request) for request in batch]
+    elapsed = time.perf_counter() - start
+
+    summary = summarize([result.duration for result in results])
+    queries = [result.queries for result in results if result.queries is not None]
+    summary['queries_per_request'] = round(sum(queries) / len(queries), 2) if queries else None
+    summary['mean_bytes'] = round(sum(result.size for result in results) / len(results))
+    summary['requests_per_sec'] = round(len(results) / elapsed, 1)
+    summary['status'] = dict(sorted(Counter(result.status for result in results).items()))
+    return summary
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(port, workers, database, resume_root, asgi=False, db_latency_ms=0):
+    """
+    Serve the benchmark database with gunicorn (uvicorn workers and
+    config.asgi when asgi is set); returns the process once it accepts
+    connections.
+    """
+    from django.db import connection
+    env = dict(
+        os.environ, RESUME_STORAGE_ROOT=str(resume_root), DEBUG='False',
+        SERVER_MODE='asgi' if asgi else 'wsgi', BENCH_DB_LATENCY_MS=str(db_latency_ms),
+    )
+    if connection.vendor == 'sqlite':
+        env['SQLITE_PATH'] = str(database)
+    else:
+        env['SUPABASE_DB'] = connection.settings_dict['NAME']
+    worker_class = ['--worker-class', 'uvicorn_worker.UvicornWorker'] if asgi else []
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'benchmarks.server:application', *worker_class,
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning'],
+        cwd=REPO_ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start within 30 seconds')
+
+
+def process_tree_peak_rss_mb(pid):
+    """Peak RSS (VmHWM) of pid and its direct children, in MiB, per process; Linux only"""
+    proc = Path('/proc')
+    if not proc.exists():
+        return None
+    pids = [pid]
+    for entry in proc.iterdir():
+        if entry.name.isdigit():
+            try:
+                # Field 4 of /proc/<pid>/stat is the parent pid; the name in field 2 has no spaces here
+                if int((entry / 'stat').read_text().split()[3]) == pid:
+                    pids.append(int(entry.name))
+            except (OSError, ValueError, IndexError):
+                continue
+    peaks = {}
+    for child in pids:
+        try:
+            for line in (proc / str(child) / 'status').read_text().splitlines():
+                if line.startswith('VmHWM:'):
+                    peaks[child] = round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            continue
+    return {'master': peaks.get(pid), 'workers': [peak for child, peak in peaks.items() if child != pid]}
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument('--server', choices=('inprocess', 'gunicorn', 'uvicorn'), default='inprocess',
+                        help='gunicorn: sync WSGI workers; uvicorn: gunicorn with uvicorn (ASGI) workers')
+    parser.add_argument('--workers', type=int, default=2, help='server worker processes')
+    parser.add_argument('--concurrency', type=int, default=1, help='parallel clients (servers only)')
+    parser.add_argument('--db-latency-ms', type=float, default=0,
+                        help='delay added to every query in the server, like a remote database (servers only)')
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per case')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per case')
+    parser.add_argument('--cases', nargs='*', default=[], help='only run cases starting with these prefixes')
+    parser.add_argument('--employers', type=int, default=20)
+    parser.add_argument('--applicants', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--applications', type=int, default=5000)
+    parser.add_argument('--resumes', type=int, default=50, help='distinct resume files shared by applications')
+    parser.add_argument('--resume-kb', type=int, default=200, help='mean resume size')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    if args.server == 'uvicorn' and importlib.util.find_spec('uvicorn_worker') is None:
+        parser.error('--server uvicorn needs the uvicorn worker: pip install uvicorn-worker')
+    setup_django()
+
+    cases = {
+        name: make_request for name, make_request in CASES.items()
+        if not args.cases or name.startswith(tuple(args.cases))
+    }
+    served = args.server != 'inprocess'
+    concurrency = args.concurrency if served else 1
+    with tempfile.TemporaryDirectory(prefix='bench-endpoints-') as scratch:
+        scratch = Path(scratch)
+        resume_root = scratch / 'resumes'
+        database = scratch / 'bench.sqlite3'
+        # A file database only when another process needs to open it
+        sqlite_path = database if served else None
+        with temporary_resume_storage(resume_root), benchmark_database(sqlite_path=sqlite_path):
+            data = seed(
+                employers=args.employers, applicants=args.applicants, jobs=args.jobs,
+                applications=args.applications, resumes=args.resumes, resume_kb=args.resume_kb,
+                # One unapplied job per application create
+                open_jobs=args.requests + args.warmup, random_seed=args.seed,
+            )
+            server = None
+            if served:
+                port = free_port()
+                server = start_gunicorn(
+                    port, args.workers, database, resume_root,
+                    asgi=args.server == 'uvicorn', db_latency_ms=args.db_latency_ms,
+                )
+                client = HttpClient('127.0.0.1', port)
+            else:
+                client = InProcessClient()
+            try:
+                ctx = Context(client, data, random.Random(args.seed), args.resume_kb)
+                results = {}
+                for name, make_request in cases.items():
+                    results[name] = run_case(ctx, make_request, args.requests, args.warmup, concurrency)
+                    print(f'  {name}: p50={results[name]["p50_ms"]}ms', file=sys.stderr)
+                params = {
+                    key: getattr(args, key) for key in (
+                        'server', 'requests', 'warmup', 'employers', 'applicants', 'jobs', 'applications',
+                        'resumes', 'resume_kb', 'seed',
+                    )
+                }
+                params['concurrency'] = concurrency
+                if server:
+                    params['workers'] = args.workers
+                    params['db_latency_ms'] = args.db_latency_ms
+                    params['server_peak_rss_mb'] = process_tree_peak_rss_mb(server.pid)
+            finally:
+                if server:
+                    server.terminate()
+                    server.wait(timeout=30)
+            report('endpoints', params, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
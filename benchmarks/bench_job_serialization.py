@@ -0,0 +1,63 @@
+"""
+Job list serialization throughput: DRF JobSerializer + JSONRenderer versus
+FastJobSerializer (values_list rows) + ORJSONRenderer.
+
+    python -m benchmarks.bench_job_serialization --rows 100000
+"""
+from .common import argument_parser, benchmark_database, measure, report, setup_django, summarize
+
+
+def seed_jobs(rows, batch_size=5000):
+    from jobs.models import Job
+    from users.models import User
+    employer = User.objects.create_user(email='bench-employer@example.com', password='bench', is_employer=True)
+    for start in range(0, rows, batch_size):
+        Job.objects.bulk_create([
+            Job(
+                employer=employer,
+                title=f'Software Engineer {i}',
+                description='Design, build and operate backend services. ' * 10,
+                location=('Remote', 'Berlin', 'London', 'New York')[i % 4],
+                salary=50000 + i % 1000 * 100,
+            )
+            for i in range(start, min(start + batch_size, rows))
+        ])
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+    from config.renderers import ORJSONRenderer
+    from jobs.models import Job
+    from jobs.serializers import FastJobSerializer, JobSerializer
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not Job.objects.exists():
+            seed_jobs(args.rows)
+        queryset = Job.objects.order_by('-posted_at', '-id')[:args.rows]
+        rows = Job.objects.count()
+
+        cases = {
+            'drf_serializer': lambda: JobSerializer(queryset.all(), many=True).data,
+            'fast_serializer': lambda: FastJobSerializer(queryset.all()).data,
+            'drf_serializer+json_render': lambda: JSONRenderer().render(JobSerializer(queryset.all(), many=True).data),
+            'fast_serializer+orjson_render': lambda: ORJSONRenderer().render(FastJobSerializer(queryset.all()).data),
+        }
+        results = {}
+        for name, func in cases.items():
+            summary = summarize(measure(func, args.repeat))
+            summary['rows_per_sec'] = round(rows / (summary['p50_ms'] / 1000))
+            results[name] = summary
+        baseline = results['drf_serializer+json_render']['p50_ms']
+        results['fast_serializer+orjson_render']['speedup'] = round(
+            baseline / results['fast_serializer+orjson_render']['p50_ms'], 2
+        )
+        report('job_serialization', {'rows': rows, 'repeat': args.repeat}, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
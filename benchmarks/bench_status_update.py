@@ -0,0 +1,112 @@
+"""
+Bytes written per application status change: a full save() (every column,
+as PATCH {"status"} used to do) versus save(update_fields=['status', 'updated_at']).
+
+Reports the size of the UPDATE statements and their parameters sent to the
+database and, on PostgreSQL, the WAL bytes each change generated.
+
+    python -m benchmarks.bench_status_update --changes 500 --cover-kb 8
+"""
+from contextlib import contextmanager
+
+from .common import argument_parser, benchmark_database, measure, report, setup_django, summarize
+
+TOGGLE = {'reviewing': 'shortlisted', 'shortlisted': 'reviewing'}
+
+
+def seed_applications(count, cover_kb):
+    from applications.models import Application
+    from applications.stats import rebuild_stats
+    from jobs.models import Job
+    from users.models import User
+    employer = User.objects.create_user(email='bench-employer@example.com', password='bench', is_employer=True)
+    jobs = Job.objects.bulk_create([
+        Job(employer=employer, title=f'Job {i}', description='Build things.', location='Remote', salary=50000)
+        for i in range(count)
+    ])
+    applicant = User.objects.create_user(email='bench-applicant@example.com', password='bench', is_applicant=True)
+    Application.objects.bulk_create([
+        Application(
+            applicant=applicant, job=job, status='reviewing',
+            resume_sha256='0' * 64, resume_size=200 * 1024, resume_filename='resume.pdf',
+            resume_content_type='application/pdf', cover_letter='x' * (cover_kb * 1024),
+        )
+        for job in jobs
+    ])
+    rebuild_stats()
+
+
+@contextmanager
+def count_bytes_sent(totals):
+    """Add the size of every statement and its parameters to totals['bytes_sent']"""
+    from django.db import connection
+
+    def wrapper(execute, sql, params, many, context):
+        totals['bytes_sent'] += len(sql.encode()) + sum(len(str(param).encode()) for param in params or ())
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield
+
+
+def wal_position():
+    from django.db import connection
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_current_wal_insert_lsn()')
+        return cursor.fetchone()[0]
+
+
+def wal_bytes_since(start):
+    from django.db import connection
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)', [start])
+        return int(cursor.fetchone()[0])
+
+
+def change_statuses(applications, narrow):
+    """Toggle every application's status the way PATCH {"status"} does"""
+    for application in applications:
+        application.status = TOGGLE[application.status]
+        if narrow:
+            application.save(update_fields=['status', 'updated_at'])
+        else:
+            application.save()
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument('--changes', type=int, default=500, help='status changes per run')
+    parser.add_argument('--cover-kb', type=int, default=8, help='cover letter size of each application')
+    args = parser.parse_args()
+    setup_django()
+
+    from applications.models import Application
+
+    with benchmark_database(keepdb=args.keepdb):
+        if not Application.objects.exists():
+            seed_applications(args.changes, args.cover_kb)
+        # Loaded like get_object() does: every column
+        applications = list(Application.objects.select_related('job', 'applicant')[:args.changes])
+
+        results = {}
+        for name, narrow in (('full_save', False), ('update_fields', True)):
+            summary = summarize(measure(lambda: change_statuses(applications, narrow), args.repeat))
+            totals = {'bytes_sent': 0}
+            wal_start = wal_position()
+            with count_bytes_sent(totals):
+                change_statuses(applications, narrow)
+            summary['bytes_sent_per_change'] = round(totals['bytes_sent'] / len(applications))
+            if wal_start is not None:
+                summary['wal_bytes_per_change'] = round(wal_bytes_since(wal_start) / len(applications))
+            results[name] = summary
+        report(
+            'status_update',
+            {'changes': len(applications), 'cover_kb': args.cover_kb, 'repeat': args.repeat},
+            results, args.output,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Helpers shared by the benchmark scripts"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def argument_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case')
+    parser.add_argument('--output', help='also write results as JSON to this path')
+    parser.add_argument('--keepdb', action='store_true', help='reuse the benchmark database between runs')
+    return parser
+
+
+@contextmanager
+def benchmark_database(keepdb=False, sqlite_path=None):
+    """
+    Run against Django's test database (test_<NAME>) so real data is never touched.
+
+    On SQLite the test database lives in memory unless sqlite_path is given;
+    pass a file path when another process (e.g. a gunicorn server) must see it.
+    """
+    from django.db import connections
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+    if sqlite_path and connections['default'].vendor == 'sqlite':
+        connections['default'].settings_dict['TEST']['NAME'] = str(sqlite_path)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+@contextmanager
+def temporary_resume_storage(location):
+    """Point the resume blob store at a scratch directory for the duration"""
+    from django.conf import settings
+    from django.test.utils import override_settings
+    storages = {
+        **settings.STORAGES,
+        'resumes': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': str(location), 'allow_overwrite': True},
+        },
+    }
+    with override_settings(STORAGES=storages):
+        yield
+
+
+def measure(func, repeat):
+    """Call func repeat times (after one warm-up call) and return durations in seconds"""
+    func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations):
+    """Latency summary in milliseconds"""
+    return {
+        'runs': len(durations),
+        'min_ms': round(min(durations) * 1000, 3),
+        'mean_ms': round(statistics.fmean(durations) * 1000, 3),
+        'p50_ms': round(percentile(durations, 50) * 1000, 3),
+        'p95_ms': round(percentile(durations, 95) * 1000, 3),
+        'p99_ms': round(percentile(durations, 99) * 1000, 3),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (Linux/macOS)"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(name, params, results, output=None):
+    """Print results and optionally write them, with run metadata, as JSON"""
+    import django
+    from django.db import connection
+    document = {
+        'benchmark': name,
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'cpu_count': os.cpu_count(),
+        'params': params,
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results,
+    }
+    print(f'{name} @ {document["commit"]} ({document["database"]})')
+    for case, values in results.items():
+        summary = ', '.join(f'{key}={value}' for key, value in values.items())
+        print(f'  {case}: {summary}')
+    print(f'  peak_rss_mb={document["peak_rss_mb"]}')
+    if output:
+        Path(output).write_text(json.dumps(document, indent=2) + '\n')
+    return document
@@ -0,0 +1,147 @@
+"""
+Deterministic data generator for the benchmarks.
+
+Seeds employers, applicants, job postings and applications with resumes of
+realistic size (PDF-like blobs of a few hundred KB, shared between
+applications the way re-used CVs are). The same arguments and seed always
+produce the same data set.
+"""
+import io
+import random
+from dataclasses import dataclass, field
+
+PASSWORD = 'bench-password'
+LOCATIONS = ('Remote', 'Berlin', 'London', 'New York', 'Bangalore', 'San Francisco', 'Toronto', 'Sydney')
+TITLES = ('Backend Engineer', 'Frontend Developer', 'Data Scientist', 'Product Manager', 'DevOps Engineer',
+          'QA Analyst', 'Mobile Developer', 'Security Engineer', 'Technical Writer', 'Site Reliability Engineer')
+SKILLS = ('python', 'django', 'postgres', 'react', 'kubernetes', 'aws', 'typescript', 'golang', 'terraform',
+          'kafka', 'redis', 'graphql', 'machine learning', 'rust', 'java')
+STATUSES = ('pending', 'reviewing', 'shortlisted', 'accepted', 'rejected')
+
+
+@dataclass
+class Dataset:
+    """Primary keys and credentials the benchmark cases pick from"""
+    employer_emails: list = field(default_factory=list)
+    applicant_emails: list = field(default_factory=list)
+    employer_ids: list = field(default_factory=list)
+    applicant_ids: list = field(default_factory=list)
+    job_ids: list = field(default_factory=list)
+    # Jobs nobody has applied to yet, for measuring application creates
+    open_job_ids: list = field(default_factory=list)
+    application_ids: list = field(default_factory=list)
+    # Applications to jobs of employer_ids[0], keyed for employer-side cases
+    employer_application_ids: list = field(default_factory=list)
+    # Those of them not yet accepted or rejected, whose status can still change
+    employer_open_application_ids: list = field(default_factory=list)
+    # Applications by applicant_ids[0]
+    applicant_application_ids: list = field(default_factory=list)
+    resume_sizes: list = field(default_factory=list)
+
+
+def make_resume(rng, size_kb):
+    """PDF-looking bytes of roughly size_kb KiB (+-50%)"""
+    size = max(1024, int(size_kb * 1024 * rng.uniform(0.5, 1.5)))
+    header = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'
+    return header + rng.randbytes(size - len(header) - 6) + b'\n%%EOF'
+
+
+def job_description(rng):
+    skills = ', '.join(rng.sample(SKILLS, 4))
+    return (
+        f'We are looking for an engineer experienced with {skills}. '
+        'You will design, build and operate services used by thousands of customers, '
+        'review code, mentor colleagues and take part in an on-call rotation. '
+    ) * rng.randint(2, 6)
+
+
+def seed(employers=20, applicants=200, jobs=2000, applications=5000, resumes=50, resume_kb=200,
+         open_jobs=100, batch_size=1000, random_seed=42):
+    """Bulk-insert the data set and return a Dataset describing it"""
+    from django.contrib.auth.hashers import make_password
+    from django.core.files.base import ContentFile
+    from applications.models import Application
+    from applications.stats import rebuild_stats
+    from applications.storage import store_resume
+    from jobs.models import Job
+    from users.models import User
+
+    rng = random.Random(random_seed)
+    data = Dataset()
+    # Hashing is deliberately slow; every seeded user shares one hash
+    password = make_password(PASSWORD)
+
+    def create_users(prefix, count, **roles):
+        emails = [f'bench-{prefix}-{i}@example.com' for i in range(count)]
+        User.objects.bulk_create(
+            [User(email=email, password=password, **roles) for email in emails], batch_size=batch_size
+        )
+        ids = dict(User.objects.filter(email__in=emails).values_list('email', 'id'))
+        return emails, [ids[email] for email in emails]
+
+    data.employer_emails, data.employer_ids = create_users('employer', employers, is_employer=True)
+    data.applicant_emails, data.applicant_ids = create_users('applicant', applicants, is_applicant=True)
+
+    total_jobs = jobs + open_jobs
+    Job.objects.bulk_create([
+        Job(
+            employer_id=data.employer_ids[i % employers],
+            title=f'{rng.choice(TITLES)} {i}',
+            description=job_description(rng),
+            location=rng.choice(LOCATIONS),
+            salary=rng.randrange(30000, 250000, 500),
+        )
+        for i in range(total_jobs)
+    ], batch_size=batch_size)
+    job_ids = list(Job.objects.order_by('id').values_list('id', flat=True))
+    data.job_ids, data.open_job_ids = job_ids[:jobs], job_ids[jobs:]
+
+    blobs = []
+    for i in range(resumes):
+        content = make_resume(rng, resume_kb)
+        sha256, size = store_resume(ContentFile(content, name=f'resume-{i}.pdf'))
+        blobs.append((sha256, size))
+        data.resume_sizes.append(size)
+
+    # Applicant a applies to consecutive jobs starting at a * stride, so
+    # applications spread over the catalog and unique_together always holds
+    applications = min(applications, applicants * jobs)
+    stride = max(1, jobs // applicants)
+    pending = []
+    for i in range(applications):
+        sha256, size = blobs[i % resumes]
+        applicant, nth = i % applicants, i // applicants
+        pending.append(Application(
+            applicant_id=data.applicant_ids[applicant],
+            job_id=data.job_ids[(applicant * stride + nth) % jobs],
+            resume_sha256=sha256,
+            resume_size=size,
+            resume_filename=f'resume-{i % resumes}.pdf',
+            resume_content_type='application/pdf',
+            status=rng.choice(STATUSES),
+            cover_letter='I would love to join your team. ' * rng.randint(1, 10),
+        ))
+        if len(pending) == batch_size:
+            Application.objects.bulk_create(pending)
+            pending = []
+    Application.objects.bulk_create(pending)
+    # bulk_create skips the signals that maintain the per-job counters
+    rebuild_stats()
+
+    rows = Application.objects.order_by('id').values_list('id', 'applicant_id', 'job__employer_id', 'status')
+    for pk, applicant_id, employer_id, status in rows:
+        data.application_ids.append(pk)
+        if employer_id == data.employer_ids[0]:
+            data.employer_application_ids.append(pk)
+            if Application.STATUS_TRANSITIONS[status]:
+                data.employer_open_application_ids.append(pk)
+        if applicant_id == data.applicant_ids[0]:
+            data.applicant_application_ids.append(pk)
+    return data
+
+
+def resume_upload(rng, size_kb, name='resume.pdf'):
+    """A fresh in-memory upload for POST /api/applications/"""
+    upload = io.BytesIO(make_resume(rng, size_kb))
+    upload.name = name
+    return upload
@@ -0,0 +1,32 @@
+"""
+Application served by bench_endpoints --server gunicorn|uvicorn.
+
+SERVER_MODE picks config.wsgi or config.asgi. BENCH_DB_LATENCY_MS adds a
+fixed delay to every database query, standing in for the network round trip
+to a remote database (Supabase) that a local SQLite file does not have. The
+delay blocks the calling thread, as a database driver waiting for a reply does.
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+if os.environ.get('SERVER_MODE') == 'asgi':
+    from config.asgi import application  # noqa: F401
+else:
+    from config.wsgi import application  # noqa: F401
+
+DB_LATENCY = float(os.environ.get('BENCH_DB_LATENCY_MS', 0)) / 1000
+
+
+def delay_query(execute, sql, params, many, context):
+    time.sleep(DB_LATENCY)
+    return execute(sql, params, many, context)
+
+
+def add_latency(sender, connection, **kwargs):
+    connection.execute_wrappers.append(delay_query)
+
+
+if DB_LATENCY:
+    connection_created.connect(add_latency, weak=False)
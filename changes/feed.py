@@ -0,0 +1,180 @@
+"""
+Change feed for incremental sync: GET /api/changes/?since=<cursor>.
+
+Returns the jobs and applications the user can see that were created or
+changed after the cursor, and tombstones for the ones deleted since, oldest
+first, with the cursor to send next time. Without since it returns
+everything, so a client syncs in full once and afterwards only pays for what
+changed. Employers get their jobs and the applications to them, applicants
+their own applications, superusers everything.
+
+An entry changes when its updated_at does or when something embedded in its
+representation does: a job's application_stats, an application's job.
+
+Timestamps are taken when a row is saved, before its transaction commits, so
+a slow transaction can commit a change older than one already sent. The feed
+therefore ends CHANGES_FEED_SETTLE_SECONDS before now: changes appear that
+much later, but none is skipped. For the same reason it always reads the
+primary database, never a replica that may lag.
+
+A page holds up to CHANGES_FEED_LIMIT changes, more only when more than that
+share one timestamp (a bulk status change); has_more asks the client to fetch
+again right away. Tombstones are kept CHANGES_TOMBSTONE_DAYS, and an older
+cursor is refused with 410: the client has to sync from scratch.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from applications.models import Application, JobApplicationStats
+from jobs.models import Job
+from .models import Tombstone
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'This cursor is older than the deletions on record; sync again without since.'
+    default_code = 'cursor_expired'
+
+
+@dataclass
+class Change:
+    type: str
+    id: int
+    changed_at: datetime
+    instance: object = None  # None for deletions
+
+
+def horizon():
+    """Where the feed ends: changes after this may still be committing"""
+    return timezone.now() - timedelta(seconds=settings.CHANGES_FEED_SETTLE_SECONDS)
+
+
+def check_cursor(since):
+    if since is not None and since < timezone.now() - timedelta(days=settings.CHANGES_TOMBSTONE_DAYS):
+        raise CursorExpired()
+
+
+def job_changes(user, since):
+    jobs = Job.objects.select_related('application_stats').annotate(
+        changed_at=Greatest('updated_at', Coalesce('application_stats__updated_at', 'updated_at'))
+    )
+    if not (user.is_superuser or user.is_employer):
+        return []
+    if not user.is_superuser:
+        jobs = jobs.filter(employer_id=user.id)  # job_employer_updated_idx
+    counted = jobs
+    if since is not None:
+        # Start from the counters that changed (app_stats_updated_at_idx), not from every job
+        counted = jobs.filter(pk__in=JobApplicationStats.objects.filter(updated_at__gt=since).values('job_id'))
+    return [(jobs, 'updated_at'), (counted, 'application_stats__updated_at')]
+
+
+def visible_to(user, applicant, employer):
+    """Q for the rows user may see, given the lookups matching them as applicant and as employer"""
+    visible = Q(pk__in=[])
+    if user.is_applicant:
+        visible |= applicant
+    if user.is_employer:
+        visible |= employer
+    return visible
+
+
+def application_changes(user):
+    applications = Application.objects.select_related('job', 'applicant').annotate(
+        changed_at=Greatest('updated_at', 'job__updated_at')
+    )
+    if user.is_superuser:
+        scopes = [applications]
+    else:
+        # One scope at a time: an OR of both could not be read from either index
+        scopes = []
+        if user.is_applicant:
+            scopes.append(applications.filter(applicant_id=user.id))  # app_applicant_updated_idx
+        if user.is_employer:
+            scopes.append(applications.filter(job__employer_id=user.id))  # app_job_updated_idx per job
+    return [(scope, column) for scope in scopes for column in ('updated_at', 'job__updated_at')]
+
+
+def deletions(user, since):
+    if since is None:
+        return []  # Nothing synced yet that could have gone
+    tombstones = Tombstone.objects.annotate(changed_at=F('deleted_at'))
+    if not user.is_superuser:
+        tombstones = tombstones.filter(visible_to(
+            user, Q(type=Tombstone.APPLICATION, applicant_id=user.id), Q(employer_id=user.id)
+        ))
+    return [(tombstones, 'deleted_at')]  # tombstone_deleted_at_idx
+
+
+def sources(user, since):
+    """
+    (type, queryset annotated with changed_at, column) for each kind of change
+    the user sees. A change is found through any column that moved past since,
+    each read by its own index, so a sync costs what changed rather than what
+    exists; a row found through two columns is one change.
+    """
+    return [
+        *((Tombstone.JOB, queryset, column) for queryset, column in job_changes(user, since)),
+        *((Tombstone.APPLICATION, queryset, column) for queryset, column in application_changes(user)),
+        *((None, queryset, column) for queryset, column in deletions(user, since)),  # Type per row
+    ]
+
+
+def changed_rows(queryset, column, since, until):
+    """Rows whose column is in (since, until] and whose changed_at is no later than until, in column order"""
+    rows = queryset.annotate(position=F(column)).filter(position__lte=until, changed_at__lte=until)
+    if since is not None:
+        rows = rows.filter(position__gt=since)
+    return rows.order_by('position', 'pk')
+
+
+def to_change(type, row):
+    if type is None:
+        return Change(row.type, row.object_id, row.changed_at)
+    return Change(type, row.pk, row.changed_at, row)
+
+
+def merge(changes):
+    """Drop repeats of a change found through more than one column; oldest first"""
+    unique = {(change.type, change.id, change.instance is None): change for change in changes}
+    return sorted(unique.values(), key=lambda change: change.changed_at)
+
+
+def changes_between(user, since, until, limit):
+    """
+    Changes in (since, until], oldest first, and the cursor to continue from:
+    (changes, cursor, has_more). One query per source column.
+    """
+    changes, complete_before = [], None
+    for type, queryset, column in sources(user, since):
+        rows = list(changed_rows(queryset, column, since, until)[:limit + 1])
+        changes.extend(to_change(type, row) for row in rows)
+        if len(rows) > limit:
+            # Cut short: every change before this position was read, as changed_at >= position
+            position = rows[-1].position
+            complete_before = position if complete_before is None else min(complete_before, position)
+    changes = merge(changes)
+    if complete_before is None and len(changes) <= limit:
+        return changes, until, False
+
+    cutoff = min(
+        value for value in (complete_before, changes[limit].changed_at if len(changes) > limit else None)
+        if value is not None
+    )
+    page = [change for change in changes if change.changed_at < cutoff]
+    if page:
+        return page, page[-1].changed_at, True
+    # More than limit changes at one instant: send all of them
+    page = merge(
+        to_change(type, row)
+        for type, queryset, column in sources(user, since)
+        for row in changed_rows(queryset, column, since, cutoff).filter(changed_at=cutoff)
+    )
+    return page, cutoff, True
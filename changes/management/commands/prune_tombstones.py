@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from changes.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete change feed tombstones older than CHANGES_TOMBSTONE_DAYS; '
+        'the feed refuses cursors that old anyway. Run daily.'
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.CHANGES_TOMBSTONE_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f'Deleted {deleted} tombstones.')
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('job', 'Job'), ('application', 'Application')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('employer_id', models.BigIntegerField(blank=True, null=True)),
+                ('applicant_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Marks a deleted job or application for the change feed (changes/feed.py),
+    so clients that synced it can drop it. Kept for CHANGES_TOMBSTONE_DAYS;
+    `manage.py prune_tombstones` deletes older ones.
+    """
+    JOB = 'job'
+    APPLICATION = 'application'
+    TYPE_CHOICES = [
+        (JOB, 'Job'),
+        (APPLICATION, 'Application'),
+    ]
+
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    # Who may see the deletion: the job's employer and, for applications, the applicant.
+    # Plain ids, the users' own rows may be gone too.
+    employer_id = models.BigIntegerField(null=True, blank=True)
+    applicant_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.type} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}'
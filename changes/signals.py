@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from applications.models import Application
+from applications.signals import deleted_with_job
+from jobs.models import Job
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Job)
+def record_deleted_job(sender, instance, **kwargs):
+    Tombstone.objects.create(type=Tombstone.JOB, object_id=instance.pk, employer_id=instance.employer_id)
+
+
+@receiver(pre_delete, sender=Job)
+def record_cascaded_applications(sender, instance, origin=None, **kwargs):
+    """A job deletion takes its applications along: one insert for all of them, while the job still knows its employer"""
+    if not deleted_with_job(origin):
+        return
+    Tombstone.objects.bulk_create([
+        Tombstone(type=Tombstone.APPLICATION, object_id=pk, employer_id=instance.employer_id, applicant_id=applicant_id)
+        for pk, applicant_id in Application.objects.filter(job_id=instance.pk).values_list('pk', 'applicant_id')
+    ])
+
+
+@receiver(post_delete, sender=Application)
+def record_deleted_application(sender, instance, origin=None, **kwargs):
+    if deleted_with_job(origin):
+        return  # Recorded by record_cascaded_applications
+    if Application.job.is_cached(instance):  # Deleted through the API: loaded with select_related
+        employer_id = instance.job.employer_id
+    else:
+        # Another cascade (a user deleted): the job row is still there until the applications are gone
+        employer_id = Job.objects.filter(pk=instance.job_id).values_list('employer_id', flat=True).first()
+    Tombstone.objects.create(
+        type=Tombstone.APPLICATION, object_id=instance.pk,
+        employer_id=employer_id, applicant_id=instance.applicant_id,
+    )
@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from applications.models import Application
+from changes.models import Tombstone
+from jobs.models import Job
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def no_settle_delay(settings):
+    settings.CHANGES_FEED_SETTLE_SECONDS = 0
+
+
+def sync(client, since=None, **params):
+    response = client.get('/api/changes/', {**({'since': since} if since else {}), **params})
+    assert response.status_code == 200
+    return response.data
+
+
+def summary(feed):
+    return [(change['type'], change['id'], change['deleted']) for change in feed['changes']]
+
+
+@pytest.mark.django_db
+def test_full_then_incremental_sync(employer_client, applicant_client, applicant, job, make_job):
+    application = Application.objects.create(applicant=applicant, job=job)
+    first = sync(employer_client)
+    # The job last changed when its application_stats counted the application
+    assert summary(first) == [('application', application.id, False), ('job', job.id, False)]
+    assert first['changes'][0]['data']['status'] == 'pending'
+    assert first['changes'][1]['data']['title'] == job.title
+    assert first['has_more'] is False
+
+    # Nothing changed: nothing to download
+    assert sync(employer_client, first['cursor'])['changes'] == []
+
+    other = make_job(title='Other')
+    employer_client.patch(f'/api/applications/{application.id}/', {'status': 'reviewing'}, format='json')
+    job_id = job.id
+    job.delete()  # Cascades to the application
+    second = sync(employer_client, first['cursor'])
+    assert summary(second) == [
+        ('job', other.id, False), ('application', application.id, True), ('job', job_id, True),
+    ]
+
+    # The applicant sees their application go, not the employer's jobs
+    assert summary(sync(applicant_client, first['cursor'])) == [('application', application.id, True)]
+
+
+@pytest.mark.django_db
+def test_embedded_changes_count(employer_client, applicant_client, applicant, job):
+    application = Application.objects.create(applicant=applicant, job=job)
+    cursor = sync(applicant_client)['cursor']
+    # A job edit changes the applicant's application (it embeds the job)
+    employer_client.patch(f'/api/jobs/{job.id}/', {'title': 'Renamed'}, format='json')
+    feed = sync(applicant_client, cursor)
+    assert summary(feed) == [('application', application.id, False)]
+    assert feed['changes'][0]['data']['job']['title'] == 'Renamed'
+
+    # A new application changes the job's application_stats for its employer
+    cursor = sync(employer_client)['cursor']
+    second = User.objects.create_user(email='second@example.com', password='pass12345', is_applicant=True)
+    Application.objects.create(applicant=second, job=job)
+    feed = sync(employer_client, cursor)
+    assert [change['type'] for change in feed['changes']] == ['application', 'job']
+    assert feed['changes'][1]['data']['application_stats']['total'] == 2
+
+
+@pytest.mark.django_db
+def test_feed_is_scoped_to_user(api_client, applicant_client, employer, applicant, job):
+    other_employer = User.objects.create_user(email='other@example.com', password='pass12345', is_employer=True)
+    other_client = APIClient()
+    other_client.force_authenticate(other_employer)
+    Application.objects.create(applicant=applicant, job=job)
+    assert sync(other_client)['changes'] == []
+    assert [change['type'] for change in sync(applicant_client)['changes']] == ['application']
+    assert api_client.get('/api/changes/').status_code == 401
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('limit', [1, 2])
+def test_feed_pages(employer_client, make_job, django_assert_max_num_queries, limit):
+    jobs = [make_job(title=f'Job {i}') for i in range(5)]
+    # Two jobs changed at the same instant stay on one page, even when it then exceeds limit
+    same = timezone.now()
+    Job.objects.filter(pk__in=[jobs[1].pk, jobs[2].pk]).update(updated_at=same)
+    Job.objects.filter(pk=jobs[0].pk).update(updated_at=same - timedelta(seconds=1))
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        # Jobs by updated_at and by stats, applications by updated_at and by job, tombstones
+        # (twice for a tie over limit)
+        with django_assert_max_num_queries(10):
+            feed = sync(employer_client, cursor, limit=limit)
+        seen.extend(change['id'] for change in feed['changes'])
+        cursor, pages = feed['cursor'], pages + 1
+        if not feed['has_more']:
+            break
+    assert sorted(seen) == sorted(job.id for job in jobs)
+    assert len(seen) == len(set(seen))
+    assert pages >= 3
+
+
+@pytest.mark.django_db
+def test_feed_follows_embedded_changes_across_pages(applicant_client, applicant, make_job):
+    jobs = [make_job(title=f'Job {i}') for i in range(4)]
+    applications = [Application.objects.create(applicant=applicant, job=job) for job in jobs]
+    cursor = sync(applicant_client)['cursor']
+    # Found through the application, through its job, and through both
+    Application.objects.filter(pk=applications[0].pk).update(updated_at=timezone.now())
+    Job.objects.filter(pk__in=[jobs[1].pk, jobs[2].pk]).update(updated_at=timezone.now())
+    Application.objects.filter(pk=applications[2].pk).update(updated_at=timezone.now())
+    seen = []
+    while True:
+        feed = sync(applicant_client, cursor, limit=1)
+        seen.extend(change['id'] for change in feed['changes'])
+        cursor = feed['cursor']
+        if not feed['has_more']:
+            break
+    assert sorted(seen) == sorted(application.id for application in applications[:3])
+
+
+@pytest.mark.django_db
+def test_feed_queries_use_indexes(employer, applicant):
+    from django.db import connection
+    from changes.feed import changed_rows, sources
+    since = timezone.now()
+    plans = {
+        user: '\n'.join(
+            changed_rows(queryset, column, since, since)[:100].explain() for _, queryset, column in sources(user, since)
+        )
+        for user in (employer, applicant)
+    }
+    for name in ('job_employer_updated_idx', 'app_stats_updated_at_idx', 'app_job_updated_idx', 'tombstone_deleted_at_idx'):
+        assert name in plans[employer]
+    assert 'app_applicant_updated_idx' in plans[applicant]
+    if connection.vendor == 'sqlite':
+        # Every table is searched by a key, none read in full
+        assert not any(line.split()[3] == 'SCAN' for plan in plans.values() for line in plan.splitlines())
+
+
+@pytest.mark.django_db
+def test_changes_wait_until_settled(employer_client, job, settings):
+    settings.CHANGES_FEED_SETTLE_SECONDS = 60
+    feed = sync(employer_client)
+    assert feed['changes'] == []
+    settings.CHANGES_FEED_SETTLE_SECONDS = 0
+    assert [change['id'] for change in sync(employer_client, feed['cursor'])['changes']] == [job.id]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params, status', [
+    ({'since': 'yesterday'}, 400),
+    ({'limit': '0'}, 400),
+    ({'since': (timezone.now() - timedelta(days=400)).isoformat()}, 410),
+])
+def test_feed_validates_input(employer_client, params, status):
+    assert employer_client.get('/api/changes/', params).status_code == status
+
+
+@pytest.mark.django_db
+def test_prune_tombstones(job, settings):
+    from django.core.management import call_command
+    job_id = job.id
+    job.delete()
+    Tombstone.objects.create(type=Tombstone.JOB, object_id=0, deleted_at=timezone.now() - timedelta(days=365))
+    call_command('prune_tombstones', stdout=open('/dev/null', 'w'))
+    assert list(Tombstone.objects.values_list('object_id', flat=True)) == [job_id]
+
+
+@pytest.mark.django_db
+def test_job_deletion_records_application_tombstones_in_one_insert(job):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    applicants = [
+        User.objects.create_user(email=f'cascade{i}@example.com', password='pass12345', is_applicant=True)
+        for i in range(5)
+    ]
+    ids = {Application.objects.create(applicant=applicant, job=job).id for applicant in applicants}
+    with CaptureQueriesContext(connection) as queries:
+        job.delete()
+    inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "changes_tombstone"')]
+    assert len(inserts) == 2  # The applications', then the job's
+    tombstones = Tombstone.objects.filter(type=Tombstone.APPLICATION)
+    assert set(tombstones.values_list('object_id', flat=True)) == ids
+    assert set(tombstones.values_list('employer_id', flat=True)) == {job.employer_id}
+    assert set(tombstones.values_list('applicant_id', flat=True)) == {applicant.id for applicant in applicants}
@@ -0,0 +1,76 @@
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from applications.serializers import ApplicationSerializer
+from jobs.filters import parse_datetime_param
+from jobs.serializers import JobSerializer, format_datetime
+from .feed import changes_between, check_cursor, horizon
+
+SERIALIZERS = {'job': JobSerializer, 'application': ApplicationSerializer}
+
+
+def format_cursor(value):
+    return format_datetime(value, dt_timezone.utc)
+
+
+class ChangeFeedView(APIView):
+    """
+    Jobs and applications created, updated or deleted since a cursor (see changes/feed.py).
+
+    Each change is {"type": "job"|"application", "id", "changed_at", "deleted"}
+    plus "data", the same representation as the jobs/applications endpoints,
+    unless deleted. Apply them in order, then call again with the returned
+    cursor; immediately while has_more is true.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(manual_parameters=[
+        openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                          description='Cursor from the previous response; omit for a full sync'),
+        openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                          description=f'Changes per page, at most {settings.CHANGES_FEED_LIMIT}'),
+    ])
+    def get(self, request):
+        since = parse_datetime_param(request.query_params, 'since')
+        check_cursor(since)
+        limit = self.get_limit(request)
+        until = horizon()
+        if since is not None and since > until:
+            until = since  # Never hand back a cursor older than the one sent
+        changes, cursor, has_more = changes_between(request.user, since, until, limit)
+
+        # One serializer call per type, as the list endpoints do
+        representations = {}
+        for type, serializer_class in SERIALIZERS.items():
+            instances = [change.instance for change in changes if change.type == type and change.instance is not None]
+            data = serializer_class(instances, many=True, context={'request': request}).data
+            representations.update(((type, instance.pk), item) for instance, item in zip(instances, data))
+        return Response({
+            'changes': [
+                {
+                    'type': change.type,
+                    'id': change.id,
+                    'changed_at': format_cursor(change.changed_at),
+                    'deleted': change.instance is None,
+                    **({} if change.instance is None else {'data': representations[change.type, change.id]}),
+                }
+                for change in changes
+            ],
+            'cursor': format_cursor(cursor),
+            'has_more': has_more,
+        })
+
+    def get_limit(self, request):
+        value = request.query_params.get('limit')
+        if not value:
+            return settings.CHANGES_FEED_LIMIT
+        if not value.isdigit() or not 0 < int(value) <= settings.CHANGES_FEED_LIMIT:
+            raise ValidationError({'limit': f'A number from 1 to {settings.CHANGES_FEED_LIMIT} is required.'})
+        return int(value)
@@ -1,4 +1,6 @@
 import os
 from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-application = get_asgi_application()
\ No newline at end of file
+# Serve the read-heavy endpoints with async views (config/async_views.py)
+os.environ.setdefault('ASYNC_API_VIEWS', 'True')
+application = get_asgi_application()
@@ -0,0 +1,145 @@
+"""
+Async read paths for ASGI deployments (see gunicorn.conf.py).
+
+DRF views are synchronous: under ASGI each one runs in a worker thread that
+sits idle for every database round trip. With ASYNC_API_VIEWS on (config/asgi.py
+turns it on), routes whose viewset has async twins of its read actions
+(alist(), aretrieve(), see AsyncReadMixin) are served by async_viewset_view():
+those GETs read the database through Django's async ORM, so one worker keeps
+many slow queries in flight. Authentication, permissions, query building,
+fieldsets and content negotiation are the viewset's own, unchanged; writes
+and read modes without an async implementation run the viewset as usual in a
+thread.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.urls import URLPattern, URLResolver
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+async def apaginate_queryset(paginator, queryset, request):
+    """PageNumberPagination.paginate_queryset() with the count and the page read by the async ORM"""
+    page_size = paginator.get_page_size(request)
+    if not page_size:
+        return None
+    pages = paginator.django_paginator_class(queryset, page_size)
+    pages.count = await queryset.acount()  # Paginator.count is a cached property
+    page_number = paginator.get_page_number(request, pages)
+    try:
+        page = pages.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    page.object_list = [obj async for obj in page.object_list]
+    if pages.num_pages > 1 and paginator.template is not None:
+        paginator.display_page_controls = True
+    paginator.page, paginator.request = page, request
+    return page.object_list
+
+
+class AsyncReadMixin:
+    """
+    Async twins of ListModelMixin.list() and RetrieveModelMixin.retrieve().
+
+    Mixins that override list()/retrieve() (conditional GETs, caching) override
+    alist()/aretrieve() the same way. serves_async() tells whether the async
+    twin covers a request; if not, the sync action handles it.
+    """
+    async_actions = ('list', 'retrieve')
+
+    def serves_async(self):
+        return self.paginator is None or isinstance(self.paginator, PageNumberPagination)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            # Same message as get_object_or_404()
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def aserialize_many(self, queryset):
+        if hasattr(self.get_serializer_class(), 'adata'):
+            return await self.get_serializer(queryset, many=True).adata()
+        return self.get_serializer([obj async for obj in queryset], many=True).data
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            page = await apaginate_queryset(self.paginator, queryset, request)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(await self.aserialize_many(queryset))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+
+def async_viewset_view(viewset_class, actions, **initkwargs):
+    """
+    Async equivalent of viewset_class.as_view(actions, **initkwargs): GETs of
+    the viewset's async_actions are dispatched on the event loop, every other
+    request goes to the regular view in a thread.
+    """
+    sync_view = viewset_class.as_view(actions, **initkwargs)
+    run_sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        action = actions.get(request.method.lower())
+        if request.method != 'GET' or action not in viewset_class.async_actions:
+            return await run_sync_view(request, *args, **kwargs)
+
+        # What ViewSetMixin.as_view() and APIView.dispatch() do, minus the handler call
+        self = viewset_class(**initkwargs)
+        self.action_map = actions
+        for method, name in actions.items():
+            setattr(self, method, getattr(self, name))
+        self.args, self.kwargs = args, kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            # Authentication may load the user: keep it off the event loop
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if self.serves_async():
+                response = await getattr(self, f'a{action}')(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(getattr(self, action))(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    # Schema generators (drf-yasg) introspect these like on as_view() views
+    view.cls, view.initkwargs, view.actions = sync_view.cls, sync_view.initkwargs, sync_view.actions
+    return csrf_exempt(view)
+
+
+def async_read_routes(urlpatterns):
+    """
+    Copy of urlpatterns (recursing into include()s) in which the routes of
+    viewsets with AsyncReadMixin are served by async_viewset_view().
+    """
+    routes = []
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLResolver):
+            pattern = URLResolver(
+                pattern.pattern, async_read_routes(pattern.url_patterns),
+                pattern.default_kwargs, pattern.app_name, pattern.namespace,
+            )
+        elif issubclass(getattr(pattern.callback, 'cls', object), AsyncReadMixin):
+            callback = pattern.callback
+            pattern = URLPattern(
+                pattern.pattern, async_viewset_view(callback.cls, callback.actions, **callback.initkwargs),
+                pattern.default_args, pattern.name,
+            )
+        routes.append(pattern)
+    return routes
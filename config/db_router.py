@@ -0,0 +1,140 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+When DATABASE_REPLICA_ALIAS is set (SUPABASE_REPLICA_HOST, or
+SQLITE_REPLICA_PATH locally), views with ReplicaReadMixin (jobs and
+applications) send the queries of GET/HEAD/OPTIONS requests to the replica.
+Everything else, and any query after a write in the same request, goes to
+the primary.
+
+Replicas lag behind the primary, so a client that just wrote would not see
+its own change. After every successful write request,
+ReplicaPinningMiddleware pins the client to the primary for
+DATABASE_REPLICA_PIN_SECONDS:
+- with a cookie, which works across workers;
+- for authenticated users (JWT clients often keep no cookies), with a cache
+  marker. That marker reaches every worker only when the cache is shared
+  (REDIS_URL), as with users/authentication.py.
+
+Queries made while a streaming response is consumed run after the
+middleware and go to the primary.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = 'db_pin'
+
+
+class RoutingState:
+    """Per-request routing decision, shared by the threads that serve the request"""
+
+    def __init__(self):
+        self.replica = False  # Set by ReplicaReadMixin for safe requests of unpinned clients
+        self.wrote = False
+
+    @property
+    def reads_from_replica(self):
+        return self.replica and not self.wrote
+
+
+routing_state = ContextVar('db_routing_state', default=None)
+
+
+def pin_key(user_id):
+    return f'db:pin:user:{user_id}'
+
+
+def is_pinned(request):
+    """Did this client write recently enough that the replica may not have its change yet?"""
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and cache.get(pin_key(user.id)))
+
+
+class ReplicaRouter:
+    """Primary for writes (and migrations); the replica only for reads the request state allows"""
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if settings.DATABASE_REPLICA_ALIAS and state is not None and state.reads_from_replica:
+            return settings.DATABASE_REPLICA_ALIAS
+        # Explicit, so instances read from the replica are never written back to it
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.wrote = True  # Read our own write for the rest of the request
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Same data on both
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.DATABASE_REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """View mixin: safe-method requests of unpinned clients read from the replica"""
+
+    def reads_replica(self, request):
+        return request.method in SAFE_METHODS and not is_pinned(request)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = routing_state.get()
+        # After authentication, so the per-user pin can be checked
+        if state is not None and self.reads_replica(request):
+            state.replica = True
+
+
+class ReplicaPinningMiddleware:
+    """Sets up the routing state of each request and pins clients to the primary after a write"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICA_ALIAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routing_state.set(RoutingState())
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = routing_state.set(RoutingState())
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.pin(request, response)
+
+    def pin(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return response
+        seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+        response.set_cookie(
+            PIN_COOKIE, '1', max_age=seconds, httponly=True,
+            secure=settings.SESSION_COOKIE_SECURE, samesite=settings.SESSION_COOKIE_SAMESITE,
+        )
+        # DRF sets the authenticated user on the Django request too
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cache.set(pin_key(user.id), True, seconds)
+        return response
@@ -0,0 +1,69 @@
+"""
+Sparse fieldsets: ?fields=id,title returns only those keys, ?omit=description
+returns everything else. Both take comma-separated output keys and may be
+combined.
+
+The selection is pushed into the queryset with .only(), so columns that are
+not sent (large text fields, nested objects) are not read either. Views list
+the model fields each output key reads in sparse_fields and the ones every
+response needs regardless (ETag timestamps, ownership checks, cursor
+ordering) in sparse_always_load.
+"""
+from rest_framework.exceptions import ValidationError
+
+
+def split_names(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def parse_fieldset(query_params, available):
+    """Selected output keys in their usual order, or None when the full representation is wanted"""
+    fields, omit = split_names(query_params.get('fields')), split_names(query_params.get('omit'))
+    if not fields and not omit:
+        return None
+    errors = {}
+    for param, names in (('fields', fields), ('omit', omit)):
+        unknown = sorted(names - set(available))
+        if unknown:
+            errors[param] = [f'Unknown field(s): {", ".join(unknown)}. Choose from: {", ".join(available)}.']
+    if errors:
+        raise ValidationError(errors)
+    return [name for name in available if (not fields or name in fields) and name not in omit]
+
+
+class SparseFieldsetMixin:
+    """
+    ViewSet mixin for ?fields= / ?omit= on the actions in sparse_actions.
+
+    The selection is passed to serializers as context['fieldset'] (None: all
+    fields) and applied to the queryset by apply_fieldset().
+    """
+    # Output key -> model fields (only() lookups, e.g. 'job__title') it reads
+    sparse_fields = {}
+    sparse_always_load = ('id',)
+    sparse_actions = ('list', 'retrieve')
+
+    @property
+    def fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = None
+            request, action = getattr(self, 'request', None), getattr(self, 'action', None)
+            if request is not None and request.method in ('GET', 'HEAD') and action in self.sparse_actions:
+                self._fieldset = parse_fieldset(self.request.query_params, list(self.sparse_fields))
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.fieldset
+        return context
+
+    def apply_fieldset(self, queryset):
+        """Load only the selected fields; relations nobody reads are no longer joined"""
+        if self.fieldset is None:
+            return queryset
+        lookups = list(self.sparse_always_load)
+        for key in self.fieldset:
+            lookups.extend(self.sparse_fields[key])
+        lookups = list(dict.fromkeys(lookups))
+        relations = dict.fromkeys(lookup.split('__')[0] for lookup in lookups if '__' in lookup)
+        return queryset.select_related(None).select_related(*relations).only(*lookups)
@@ -0,0 +1,93 @@
+"""
+Idempotency-Key support for POST creates.
+
+A client that times out on a POST cannot tell whether it went through. When
+it sends an Idempotency-Key header (any unique string, e.g. a UUID, reused on
+every retry of the same request), the first successful create records the
+new object's id under that key for IDEMPOTENCY_KEY_TTL seconds; a retry with
+the same key and body gets that object back (201, Idempotent-Replayed: true)
+instead of creating it again or failing as a duplicate. Reusing a key with a
+different body is an error (422). A retry that overlaps the original, before
+its key is recorded (or after the cache lost it), runs into the object the
+original created; a view that can tell raises AlreadyCreated with it, and the
+retry gets it back the same way.
+
+Keys are scoped to the user and the view. They are kept in the default cache,
+which reaches every worker only when it is shared (REDIS_URL).
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'This Idempotency-Key was already used for a different request.'
+    default_code = 'idempotency_key_reused'
+
+
+class AlreadyCreated(Exception):
+    """Raised by perform_create() when the object this request would create exists already"""
+
+    def __init__(self, instance):
+        super().__init__(instance)
+        self.instance = instance
+
+
+def describe(value):
+    return (value.name, value.size) if hasattr(value, 'read') else value
+
+
+def request_fingerprint(request):
+    """Hash of the request body as parsed; uploaded files count by name and size"""
+    data = request.data
+    if hasattr(data, 'lists'):  # Form and multipart bodies
+        data = {key: [describe(value) for value in values] for key, values in data.lists()}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """ViewSet mixin: create() honours the Idempotency-Key header"""
+
+    def idempotency_cache_key(self, request, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f'idempotency:{self.basename}:{request.user.id}:{digest}'
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({'detail': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters.'})
+
+        cache_key, fingerprint = self.idempotency_cache_key(request, key), request_fingerprint(request)
+        entry = cache.get(cache_key)
+        if entry is not None:
+            if entry['fingerprint'] != fingerprint:
+                raise IdempotencyKeyReused()
+            instance = self.get_queryset().filter(pk=entry['pk']).first()
+            if instance is not None:
+                return self.replay(instance)
+            # Created, then deleted: a retry creates it anew
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except AlreadyCreated as created:
+            # Another attempt of this request got there first
+            response = self.replay(self.get_queryset().get(pk=created.instance.pk))
+        if response.status_code == status.HTTP_201_CREATED:
+            cache.set(cache_key, {'fingerprint': fingerprint, 'pk': response.data['id']}, settings.IDEMPOTENCY_KEY_TTL)
+        return response
+
+    def replay(self, instance):
+        response = Response(self.get_serializer(instance).data, status=status.HTTP_201_CREATED)
+        response['Idempotent-Replayed'] = 'true'
+        return response
@@ -0,0 +1,126 @@
+"""
+In-process request metrics, exported in Prometheus text format at /api/metrics/.
+
+RequestMetricsMiddleware (config/middleware.py) records one observation per
+request; this module aggregates them per (view, method). Aggregates are
+per worker process, so a scrape sees the worker that answered it.
+Other modules can add gauges with register_collector().
+
+The endpoint exposes traffic per endpoint: outside DEBUG it answers only
+scrapers that send METRICS_TOKEN, and is closed when no token is set.
+"""
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+
+# Request duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def label_value(value):
+    """Escape a Prometheus label value: backslash, double quote and newline"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(**values):
+    return ','.join(f'{name}="{label_value(value)}"' for name, value in values.items())
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'errors', 'duration', 'buckets', 'queries', 'db_time', 'serialize_time', 'bytes')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.bytes = 0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._collectors = []
+
+    def observe(self, view, method, status, duration, queries, db_time, serialize_time, size):
+        with self._lock:
+            stats = self._stats.get((view, method))
+            if stats is None:
+                stats = self._stats[(view, method)] = EndpointStats()
+            stats.requests += 1
+            if status >= 500:
+                stats.errors += 1
+            stats.duration += duration
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.queries += queries
+            stats.db_time += db_time
+            stats.serialize_time += serialize_time
+            stats.bytes += size
+
+    def register_collector(self, collector):
+        """collector() returns an iterable of Prometheus text lines, read at scrape time"""
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def render(self):
+        with self._lock:
+            snapshot = sorted(self._stats.items())
+            lines = []
+            counters = [
+                ('http_requests_total', 'Requests handled', 'requests'),
+                ('http_request_errors_total', 'Requests answered with a 5xx status', 'errors'),
+                ('http_request_db_queries_total', 'SQL queries executed while handling requests', 'queries'),
+                ('http_request_db_seconds_total', 'Time spent in SQL queries', 'db_time'),
+                ('http_request_serialize_seconds_total', 'Time spent rendering response bodies', 'serialize_time'),
+                ('http_response_bytes_total', 'Response body bytes (streamed bodies excluded)', 'bytes'),
+            ]
+            for name, help_text, attr in counters:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for (view, method), stats in snapshot:
+                    lines.append(f'{name}{{{labels(view=view, method=method)}}} {getattr(stats, attr)}')
+
+            name = 'http_request_duration_seconds'
+            lines.append(f'# HELP {name} Request handling time')
+            lines.append(f'# TYPE {name} histogram')
+            for (view, method), stats in snapshot:
+                endpoint = labels(view=view, method=method)
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{endpoint},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{endpoint},le="+Inf"}} {stats.requests}')
+                lines.append(f'{name}_sum{{{endpoint}}} {stats.duration}')
+                lines.append(f'{name}_count{{{endpoint}}} {stats.requests}')
+
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+register_collector = registry.register_collector
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. When METRICS_TOKEN is set, scrapers must send
+    Authorization: Bearer <token>; without a token it is only open with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        return HttpResponse('Metrics are disabled: set METRICS_TOKEN', status=403, content_type='text/plain')
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,138 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .metrics import registry
+
+
+class QueryTimer:
+    """connection.execute_wrapper hook counting queries and the time spent in them"""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Records per-view query count, DB time, serialization (render) time and
+    response size; exposes them as a Server-Timing header and feeds the
+    /api/metrics/ aggregates.
+
+    Overhead is a few perf_counter() calls per query and one lock per request.
+    Queries issued while a streaming response is being consumed happen after
+    this middleware returns and are not counted. Disable with
+    REQUEST_METRICS_ENABLED=False.
+
+    Works under ASGI too: connections belong to the thread that runs a
+    request's ORM calls, so the query timer is installed from that thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def install_timer(stack, timer):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        request._metrics_serialize_time = 0.0
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self.install_timer(stack, timer)
+            response = self.get_response(request)
+        return self.record(request, response, timer, start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        request._metrics_serialize_time = 0.0
+        start = time.perf_counter()
+        stack = ExitStack()
+        # Async ORM calls run in the request's thread-sensitive worker thread
+        await sync_to_async(self.install_timer)(stack, timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.record(request, response, timer, start)
+
+    def record(self, request, response, timer, start):
+        duration = time.perf_counter() - start
+
+        serialize_time = request._metrics_serialize_time
+        size = 0 if response.streaming else len(response.content)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.queries} queries"',
+            f'serialize;dur={serialize_time * 1000:.1f}',
+            f'total;dur={duration * 1000:.1f}',
+        ])
+
+        match = request.resolver_match
+        view = (match.view_name or match.route) if match else '<unmatched>'
+        registry.observe(
+            view, request.method, response.status_code,
+            duration, timer.queries, timer.duration, serialize_time, size,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Responses are rendered after the view returns; time that step
+        start = time.perf_counter()
+
+        def record_render_time(rendered):
+            request._metrics_serialize_time += time.perf_counter() - start
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can run in an async middleware chain. WhiteNoise itself is
+    sync-only, which under ASGI would push every request below it, async views
+    included, into a worker thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,38 @@
+"""
+orjson-based JSON rendering, selected with API_JSON_RENDERER=orjson.
+
+orjson encodes several times faster than the stdlib json module DRF uses by
+default and produces the same compact UTF-8 output.
+"""
+import json
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Only required when API_JSON_RENDERER=orjson
+    orjson = None
+
+# Types orjson doesn't know (Decimal, lazy strings, ...) go through DRF's encoder
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for rest_framework.renderers.JSONRenderer"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_encoder.default, option=option)
+
+
+def dumps(data):
+    """Encode data to JSON bytes with the configured renderer's encoder"""
+    if settings.API_JSON_RENDERER == 'orjson':
+        return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
@@ -1,4 +1,5 @@
 
+import importlib.util
 import os
 from pathlib import Path
 from decouple import config
@@ -58,12 +59,16 @@ INSTALLED_APPS = [
     'users',
     'jobs',
     'applications',
+    'tasks',
+    'changes',
     'corsheaders',
 ]
 
 MIDDLEWARE = [
+    'config.middleware.RequestMetricsMiddleware',  # Outermost so it times the whole request
+    'config.db_router.ReplicaPinningMiddleware',  # Only with a read replica configured
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'config.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise, async-capable for ASGI
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,6 +78,11 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-endpoint query count / latency metrics: Server-Timing headers and /api/metrics/
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=True, cast=bool)
+# /api/metrics/ requires "Authorization: Bearer <token>"; with no token it is only served when DEBUG is on
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [{
@@ -91,6 +101,11 @@ TEMPLATES = [{
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# ASGI deployment (SERVER_MODE=asgi in gunicorn.conf.py; config/asgi.py turns this on):
+# job list/retrieve and application list/retrieve are served by async views
+# (config/async_views.py) that don't hold a thread during database round trips.
+ASYNC_API_VIEWS = config('ASYNC_API_VIEWS', default=False, cast=bool)
+
 # Supabase Configuration - Simple setup
 # Get values directly from .env file
 SUPABASE_USER = config('SUPABASE_USER', default='')
@@ -100,6 +115,25 @@ SUPABASE_USE_SSL = config('SUPABASE_USE_SSL', default=True, cast=bool)
 SUPABASE_DB = config('SUPABASE_DB', default='')
 SUPABASE_PASSWORD = config('SUPABASE_PASSWORD', default='')
 
+# Connection pooling for PostgreSQL, either or both:
+# - DATABASE_POOL: a psycopg 3 pool in each worker process (pip install "psycopg[binary,pool]");
+#   requests borrow a connection and return it, instead of each thread keeping its own.
+# - DATABASE_PGBOUNCER: connecting through PgBouncer or Supabase's pooler in transaction mode
+#   (port 6543). Consecutive transactions may run on different server connections, so server-side
+#   cursors and prepared statements, which outlive a transaction, are turned off; .iterator()
+#   (job streams and exports) then reads the whole result set client-side.
+DATABASE_POOL = config('DATABASE_POOL', default=False, cast=bool)
+DATABASE_POOL_MIN_SIZE = config('DATABASE_POOL_MIN_SIZE', default=2, cast=int)
+DATABASE_POOL_MAX_SIZE = config('DATABASE_POOL_MAX_SIZE', default=10, cast=int)
+DATABASE_PGBOUNCER = config('DATABASE_PGBOUNCER', default=False, cast=bool)
+
+# Optional read replica (config/db_router.py): job and application reads go to it, except for
+# clients pinned to the primary for DATABASE_REPLICA_PIN_SECONDS after a write (replication lag)
+SUPABASE_REPLICA_HOST = config('SUPABASE_REPLICA_HOST', default='')
+SUPABASE_REPLICA_PORT = config('SUPABASE_REPLICA_PORT', default=SUPABASE_PORT)
+SQLITE_REPLICA_PATH = config('SQLITE_REPLICA_PATH', default='')  # Local stand-in: a copy of the database file
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=5, cast=int)
+
 # Database Configuration - Use Supabase PostgreSQL if credentials are provided
 if SUPABASE_HOST and SUPABASE_DB and SUPABASE_USER and SUPABASE_PASSWORD:
     DATABASES = {
@@ -110,21 +144,73 @@ if SUPABASE_HOST and SUPABASE_DB and SUPABASE_USER and SUPABASE_PASSWORD:
             'PASSWORD': SUPABASE_PASSWORD,
             'HOST': SUPABASE_HOST,
             'PORT': SUPABASE_PORT,
-            'CONN_MAX_AGE': 600,  # Reuse DB connections for 10 min (avoids reconnecting to Supabase each request)
+            # Reuse DB connections for 10 min (avoids reconnecting to Supabase each request).
+            # Not under ASGI: every request runs in a new thread with its own connection,
+            # and persistent ones would pile up until the server's limit. Nor with a pool.
+            'CONN_MAX_AGE': 0 if ASYNC_API_VIEWS or DATABASE_POOL else 600,
             'OPTIONS': {
                 'sslmode': 'require' if SUPABASE_USE_SSL else 'disable',
             },
         }
     }
+    if DATABASE_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': DATABASE_POOL_MIN_SIZE,
+            'max_size': DATABASE_POOL_MAX_SIZE,
+        }
+    if DATABASE_PGBOUNCER:
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        if importlib.util.find_spec('psycopg'):
+            # psycopg 3 prepares statements run repeatedly; psycopg2 never does
+            DATABASES['default']['OPTIONS']['prepare_threshold'] = None
+    if SUPABASE_REPLICA_HOST:
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': SUPABASE_REPLICA_HOST,
+            'PORT': SUPABASE_REPLICA_PORT,
+            'OPTIONS': {**DATABASES['default']['OPTIONS']},  # Its own pool
+            'TEST': {'MIRROR': 'default'},
+        }
 else:
     # Fallback to SQLite for local development
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / "db.sqlite3",
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / "db.sqlite3")),
+            # Concurrent writers (run_worker threads, gunicorn workers) wait for the
+            # write lock at BEGIN instead of failing with "database is locked"
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+        }
+    }
+    if SQLITE_REPLICA_PATH:
+        DATABASES['replica'] = {**DATABASES['default'], 'NAME': SQLITE_REPLICA_PATH, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_REPLICA_ALIAS = 'replica' if 'replica' in DATABASES else None
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+
+
+# Cache - local memory by default; set REDIS_URL (and pip install redis) to share it across workers
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         }
     }
 
+# Public job catalog cache (jobs/cache.py). With the per-process local-memory cache,
+# other workers only see a write once their entries expire, so keep the timeout short.
+JOBS_CACHE_ENABLED = config('JOBS_CACHE_ENABLED', default=True, cast=bool)
+JOBS_CACHE_ALIAS = 'default'
+JOBS_CACHE_TIMEOUT = config('JOBS_CACHE_TIMEOUT', default=300 if REDIS_URL else 30, cast=int)
+
 
 AUTH_PASSWORD_VALIDATORS = [{
     'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -132,6 +218,26 @@ AUTH_PASSWORD_VALIDATORS = [{
     'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
 }]
 
+# Password hashing (users/hashers.py). PASSWORD_HASHER picks the algorithm for new hashes:
+# 'argon2' (argon2-cffi), 'bcrypt' (pip install bcrypt) or 'pbkdf2'. The others stay listed
+# so existing hashes still verify; they are rehashed with the current policy on next login.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='argon2')
+PASSWORD_HASHER_CLASSES = {
+    'argon2': 'users.hashers.Argon2PasswordHasher',
+    'bcrypt': 'users.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'users.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+# Cost parameters; measure them on the production machine with `python manage.py calibrate_hasher`.
+# Defaults follow the OWASP password storage recommendations.
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+BCRYPT_ROUNDS = config('BCRYPT_ROUNDS', default=12, cast=int)
+PBKDF2_ITERATIONS = config('PBKDF2_ITERATIONS', default=600000, cast=int)
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -139,22 +245,55 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'  # Gzip/Brotli compress static files
 
-# Media files - Not needed since resumes are stored in database rows as BinaryField
-# Keep minimal media settings for any other future file uploads
+# Media files - Keep minimal media settings for any other future file uploads
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resumes are content-addressed blobs (see applications/storage.py). They live outside
+# MEDIA_ROOT so they are never served publicly; swap the backend for any Django
+# storage class (e.g. an S3-compatible one) via RESUME_STORAGE_BACKEND.
+RESUME_STORAGE_BACKEND = config('RESUME_STORAGE_BACKEND', default='django.core.files.storage.FileSystemStorage')
+RESUME_STORAGE_ROOT = config('RESUME_STORAGE_ROOT', default=os.path.join(BASE_DIR, 'resume_store'))
+RESUME_STORAGE_OPTIONS = {}
+if RESUME_STORAGE_BACKEND == 'django.core.files.storage.FileSystemStorage':
+    # Blobs are named by content hash, so overwriting one just rewrites identical bytes
+    RESUME_STORAGE_OPTIONS = {'location': RESUME_STORAGE_ROOT, 'allow_overwrite': True}
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',  # Gzip/Brotli compress static files
+    },
+    'resumes': {
+        'BACKEND': RESUME_STORAGE_BACKEND,
+        'OPTIONS': RESUME_STORAGE_OPTIONS,
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
 
 from datetime import timedelta
 
+# JSON encoder for API responses: 'orjson' (fast, config/renderers.py) or 'json' (DRF default)
+API_JSON_RENDERER = config('API_JSON_RENDERER', default='orjson')
+
+# Authenticate API requests from the role claims in the access token instead of loading
+# the user (users/authentication.py). Role changes reach tokens at their next refresh,
+# or immediately when the cache is shared across workers (REDIS_URL).
+JWT_STATELESS_AUTH = config('JWT_STATELESS_AUTH', default=False, cast=bool)
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer' if API_JSON_RENDERER == 'orjson' else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.RoleClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Allow public read access, individual views control write access
@@ -163,11 +302,45 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,  # Return 20 results per page instead of all records
 }
 
+# Build job list responses straight from database rows (jobs.serializers.FastJobSerializer)
+JOBS_FAST_SERIALIZER = config('JOBS_FAST_SERIALIZER', default=True, cast=bool)
+
+# Upper bound on rows per POST /api/jobs/import/ request (jobs/bulk.py)
+JOBS_IMPORT_MAX_ROWS = config('JOBS_IMPORT_MAX_ROWS', default=10000, cast=int)
+
+# Background task queue (tasks/queue.py), run with `manage.py run_worker`
+TASK_WORKER_CONCURRENCY = config('TASK_WORKER_CONCURRENCY', default=2, cast=int)
+TASK_MAX_ATTEMPTS = config('TASK_MAX_ATTEMPTS', default=5, cast=int)
+TASK_RETRY_DELAY = config('TASK_RETRY_DELAY', default=30, cast=int)  # Seconds before the first retry, doubled each time
+TASK_LEASE_SECONDS = config('TASK_LEASE_SECONDS', default=300, cast=int)  # Running longer than this counts as a dead worker
+
+# Resume processing after upload (applications/tasks.py): at most this many run at
+# once across all workers; extracted text is capped at RESUME_TEXT_MAX_CHARS
+RESUME_PROCESSING_CONCURRENCY = config('RESUME_PROCESSING_CONCURRENCY', default=4, cast=int)
+RESUME_TEXT_MAX_CHARS = config('RESUME_TEXT_MAX_CHARS', default=100000, cast=int)
+
+# Resumable resume uploads (applications/uploads.py). Partial uploads are kept in
+# RESUME_UPLOAD_DIR, which every web worker must share, until they complete or expire.
+RESUME_UPLOAD_DIR = config('RESUME_UPLOAD_DIR', default=os.path.join(BASE_DIR, 'resume_uploads'))
+RESUME_UPLOAD_MAX_SIZE = config('RESUME_UPLOAD_MAX_SIZE', default=25 * 1024 * 1024, cast=int)  # Bytes
+RESUME_UPLOAD_EXPIRY = config('RESUME_UPLOAD_EXPIRY', default=24 * 3600, cast=int)  # Seconds
+
+# How long a POST's Idempotency-Key is remembered for retries (config/idempotency.py)
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=24 * 3600, cast=int)  # Seconds
+
+# Change feed for incremental sync (changes/feed.py)
+CHANGES_FEED_LIMIT = config('CHANGES_FEED_LIMIT', default=500, cast=int)  # Changes per page
+# Changes younger than this are held back: their transactions may not have committed yet
+CHANGES_FEED_SETTLE_SECONDS = config('CHANGES_FEED_SETTLE_SECONDS', default=2, cast=float)
+CHANGES_TOMBSTONE_DAYS = config('CHANGES_TOMBSTONE_DAYS', default=30, cast=int)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': False,
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.RoleTokenRefreshSerializer',
 }
 
 
@@ -0,0 +1,107 @@
+import types
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import resolve
+from rest_framework.test import APIClient
+
+from applications.models import Application
+from config.async_views import async_read_routes
+from users.authentication import RoleRefreshToken
+
+
+@pytest.fixture
+def async_urls(settings):
+    """The URLconf an ASGI deployment (ASYNC_API_VIEWS=True) serves"""
+    from config import urls
+    module = types.ModuleType('async_urls')
+    module.urlpatterns = async_read_routes(urls.urlpatterns)
+    settings.ROOT_URLCONF = module
+    return module
+
+
+def bearer(user):
+    return {'Authorization': f'Bearer {RoleRefreshToken.for_user(user).access_token}'}
+
+
+def async_get(path, headers=None, **params):
+    return async_to_sync(AsyncClient().get)(path, params, headers=headers or {})
+
+
+@pytest.fixture
+def applications(applicant, make_job):
+    return [
+        Application.objects.create(job=make_job(title=f'Job {i}'), applicant=applicant, cover_letter=f'Letter {i}')
+        for i in range(3)
+    ]
+
+
+def test_reads_are_routed_to_async_views(async_urls):
+    assert iscoroutinefunction(resolve('/api/jobs/').func)
+    assert iscoroutinefunction(resolve('/api/jobs/1/').func)
+    assert iscoroutinefunction(resolve('/api/applications/').func)
+    # Viewsets without async reads keep their regular views
+    assert not iscoroutinefunction(resolve('/api/users/login/').func)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('role, path, params', [
+    (None, '/api/jobs/', {}),
+    (None, '/api/jobs/', {'salary_min': '90000', 'ordering': 'salary'}),
+    ('employer', '/api/jobs/', {}),
+    ('employer', '/api/jobs/', {'fields': 'id,title,application_stats'}),
+    ('applicant', '/api/jobs/', {'omit': 'description'}),
+    (None, '/api/jobs/{job}/', {}),
+    ('employer', '/api/jobs/{job}/', {}),
+    (None, '/api/jobs/999999/', {}),
+    ('employer', '/api/applications/', {}),
+    ('applicant', '/api/applications/', {'fields': 'id,status'}),
+    ('applicant', '/api/applications/', {'page': '7'}),
+    ('applicant', '/api/applications/{application}/', {}),
+    (None, '/api/applications/', {}),
+])
+def test_async_reads_match_sync_views(employer, applicant, applications, role, path, params, async_urls, settings):
+    path = path.format(job=applications[0].job_id, application=applications[0].id)
+    headers = bearer({'employer': employer, 'applicant': applicant}[role]) if role else {}
+    settings.ROOT_URLCONF = 'config.urls'
+    expected = APIClient().get(path, params, headers=headers)
+    settings.ROOT_URLCONF = async_urls
+    response = async_get(path, headers, **params)
+    assert response.status_code == expected.status_code
+    assert response.json() == expected.json()
+    assert response.get('ETag') == expected.get('ETag')
+
+
+@pytest.mark.django_db
+def test_async_job_list_revalidation_and_cache(async_urls, employer, make_job):
+    make_job()
+    first = async_get('/api/jobs/')
+    assert first['X-Cache'] == 'MISS'
+    assert 'desc="2 queries"' in first['Server-Timing']  # ETag aggregate + rows, counted under ASGI too
+    second = async_get('/api/jobs/')
+    assert second['X-Cache'] == 'HIT' and 'desc="0 queries"' in second['Server-Timing']
+
+    headers = bearer(employer)
+    etag = async_get('/api/jobs/', headers)['ETag']
+    revalidated = async_get('/api/jobs/', {**headers, 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert 'desc="2 queries"' in revalidated['Server-Timing']  # User lookup + ETag aggregate
+
+
+@pytest.mark.django_db
+def test_async_routes_fall_back_to_sync_views(async_urls, employer, make_job):
+    make_job()
+    created = async_to_sync(AsyncClient().post)('/api/jobs/', {
+        'title': 'Async Engineer', 'description': 'Event loops.', 'location': 'Remote', 'salary': '1.00',
+    }, content_type='application/json', headers=bearer(employer))
+    assert created.status_code == 201
+    # Cursor pages and streams have no async implementation
+    page = async_get('/api/jobs/', paginate='cursor', page_size='1')
+    assert len(page.json()['results']) == 1 and page.json()['next']
+    stream = async_get('/api/jobs/', stream='ndjson')
+    assert len(b''.join(async_to_sync(collect)(stream)).splitlines()) == 2
+
+
+async def collect(response):
+    return [chunk async for chunk in response]
@@ -0,0 +1,113 @@
+import types
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connections
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from applications.models import Application
+from config import urls
+from config.async_views import async_read_routes
+from config.db_router import PIN_COOKIE, ReplicaRouter, pin_key
+from users.authentication import RoleRefreshToken
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    """A 'replica' alias on the test database's own connection; returns the aliases reads were routed to"""
+    settings.DATABASE_REPLICA_ALIAS = 'replica'
+    connections['replica'] = connections['default']
+    reads = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def recording_db_for_read(self, model, **hints):
+        alias = db_for_read(self, model, **hints)
+        reads.append(alias)
+        return alias
+
+    monkeypatch.setattr(ReplicaRouter, 'db_for_read', recording_db_for_read)
+    yield reads
+    del connections['replica']
+
+
+@pytest.mark.django_db
+def test_safe_requests_read_from_replica(replica, make_job, applicant):
+    job = make_job()
+    client = APIClient()
+    client.force_authenticate(applicant)
+    assert client.get('/api/jobs/').status_code == 200
+    assert client.get(f'/api/jobs/{job.id}/').status_code == 200
+    assert replica and set(replica) == {'replica'}
+
+
+@pytest.mark.django_db
+def test_catalog_cache_is_filled_from_primary(replica, job):
+    response = APIClient().get('/api/jobs/')
+    assert response['X-Cache'] == 'MISS'
+    assert set(replica) == {'default'}
+
+
+@pytest.mark.django_db
+def test_other_views_and_writes_use_primary(replica, employer, employer_client, job):
+    login = APIClient().post('/api/users/login/', {'email': employer.email, 'password': 'pass12345'}, format='json')
+    assert login.status_code == 200
+    response = employer_client.patch(f'/api/jobs/{job.id}/', {'title': 'Renamed'}, format='json')
+    assert response.status_code == 200
+    assert set(replica) == {'default'}
+
+
+@pytest.mark.django_db
+def test_writer_is_pinned_to_primary(replica, applicant, job, settings):
+    client = APIClient()
+    client.force_authenticate(applicant)
+    response = client.post('/api/applications/', {'job': job.id, 'cover_letter': 'Hello'}, format='json')
+    assert response.status_code == 201
+    assert response.cookies[PIN_COOKIE]['max-age'] == settings.DATABASE_REPLICA_PIN_SECONDS
+
+    replica.clear()
+    assert client.get('/api/applications/').json()['count'] == 1
+    assert set(replica) == {'default'}
+
+    # Without cookies (token clients), the per-user marker still pins
+    client.cookies.clear()
+    replica.clear()
+    client.get(f'/api/applications/{response.json()["id"]}/')
+    assert set(replica) == {'default'}
+
+    # Once it lapses, reads go back to the replica
+    cache.delete(pin_key(applicant.id))
+    replica.clear()
+    client.get('/api/applications/')
+    assert set(replica) == {'replica'}
+
+
+@pytest.mark.django_db
+def test_failed_writes_do_not_pin(replica, applicant, job):
+    Application.objects.create(job=job, applicant=applicant)
+    client = APIClient()
+    client.force_authenticate(applicant)
+    response = client.post('/api/applications/', {'job': job.id}, format='json')
+    assert response.status_code == 400
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_router_defaults_to_primary_without_replica(settings):
+    settings.DATABASE_REPLICA_ALIAS = None
+    router = ReplicaRouter()
+    assert router.db_for_read(Application) == 'default'
+    assert router.db_for_write(Application) == 'default'
+    assert router.allow_migrate('default', 'applications')
+
+
+@pytest.mark.django_db
+def test_async_reads_use_replica(replica, settings, make_job, employer):
+    settings.ROOT_URLCONF = types.ModuleType('async_urls')
+    settings.ROOT_URLCONF.urlpatterns = async_read_routes(urls.urlpatterns)
+    make_job()
+    token = RoleRefreshToken.for_user(employer).access_token
+    response = async_to_sync(AsyncClient().get)('/api/jobs/', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    # The user lookup authenticating the request comes first, then the view's reads
+    assert replica == ['default', 'replica', 'replica']
@@ -0,0 +1,67 @@
+import pytest
+
+from config.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.mark.django_db
+def test_server_timing_header_reports_queries(api_client, make_job):
+    make_job()
+    response = api_client.get('/api/jobs/')
+    timing = response['Server-Timing']
+    assert 'db;dur=' in timing
+    assert 'desc="2 queries"' in timing  # ETag aggregate + rows
+    assert 'serialize;dur=' in timing
+    assert 'total;dur=' in timing
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_aggregates_per_view(api_client, make_job, settings):
+    settings.DEBUG = True  # No METRICS_TOKEN needed
+    job = make_job()
+    api_client.get('/api/jobs/')
+    api_client.get('/api/jobs/')
+    api_client.get(f'/api/jobs/{job.id}/')
+    response = api_client.get('/api/metrics/')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    body = response.content.decode()
+    assert 'http_requests_total{view="job-list",method="GET"} 2' in body
+    assert 'http_requests_total{view="job-detail",method="GET"} 1' in body
+    assert 'http_request_db_queries_total{view="job-list",method="GET"} 2' in body  # second one is a cache hit
+    assert 'http_request_duration_seconds_bucket{view="job-list",method="GET",le="+Inf"} 2' in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_token(api_client, settings):
+    settings.METRICS_TOKEN = 'secret'
+    assert api_client.get('/api/metrics/').status_code == 401
+    assert api_client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer secret').status_code == 200
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_closed_without_token(api_client, settings):
+    settings.METRICS_TOKEN = ''
+    assert api_client.get('/api/metrics/').status_code == 403
+    settings.DEBUG = True
+    assert api_client.get('/api/metrics/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_metrics_escape_label_values():
+    registry.observe('odd"view\\\n', 'GET', 200, 0.001, 0, 0.0, 0.0, 0)
+    assert 'http_requests_total{view="odd\\"view\\\\\\n",method="GET"} 1' in registry.render().splitlines()
+
+
+@pytest.mark.django_db
+def test_metrics_can_be_disabled(settings, make_job):
+    from rest_framework.test import APIClient
+    settings.REQUEST_METRICS_ENABLED = False
+    response = APIClient().get('/api/jobs/')
+    assert 'Server-Timing' not in response
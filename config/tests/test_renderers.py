@@ -0,0 +1,21 @@
+from decimal import Decimal
+from datetime import datetime, timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers import ORJSONRenderer
+
+
+def test_orjson_renderer_matches_drf_json_renderer():
+    data = {
+        'text': 'café ✓',
+        'number': 3,
+        'decimal': Decimal('10.50'),
+        'nested': [{'a': None, 'b': True}],
+        'when': datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc).isoformat(),
+    }
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_handles_empty_body():
+    assert ORJSONRenderer().render(None) == b''
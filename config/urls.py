@@ -7,6 +7,8 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
+from .async_views import async_read_routes
+from .metrics import metrics_view
 
 schema_view = get_schema_view(
     openapi.Info(title="Job Portal API", default_version='v1'),
@@ -19,8 +21,10 @@ urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/jobs/', include('jobs.urls')),
     path('api/applications/', include('applications.urls')),
+    path('api/changes/', include('changes.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/metrics/', metrics_view, name='metrics'),
 ]
 
 # Only expose Swagger docs and media files in development
@@ -29,3 +33,7 @@ if settings.DEBUG:
         path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     ]
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.ASYNC_API_VIEWS:
+    # ASGI: reads with async implementations run on the event loop
+    urlpatterns = async_read_routes(urlpatterns)
@@ -0,0 +1,77 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from users.models import User
+from jobs.models import Job
+
+
+@pytest.fixture(autouse=True)
+def in_memory_resume_storage(settings):
+    """Keep resume blobs written by tests out of the real resume store"""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'resumes': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    }
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hashing(settings):
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def employer(db):
+    return User.objects.create_user(email='employer@example.com', password='pass12345', is_employer=True)
+
+
+@pytest.fixture
+def applicant(db):
+    return User.objects.create_user(email='applicant@example.com', password='pass12345', is_applicant=True)
+
+
+@pytest.fixture
+def employer_client(employer):
+    client = APIClient()
+    client.force_authenticate(user=employer)
+    return client
+
+
+@pytest.fixture
+def applicant_client(applicant):
+    client = APIClient()
+    client.force_authenticate(user=applicant)
+    return client
+
+
+@pytest.fixture
+def job(make_job):
+    return make_job()
+
+
+@pytest.fixture
+def make_job(employer):
+    """Factory for jobs owned by the default employer"""
+    def make_job(**kwargs):
+        fields = {
+            'employer': employer,
+            'title': 'Backend Engineer',
+            'description': 'Build APIs with Django.',
+            'location': 'Remote',
+            'salary': '100000.00',
+        }
+        fields.update(kwargs)
+        return Job.objects.create(**fields)
+    return make_job
@@ -106,12 +106,8 @@ const Dashboard = () => {
     try {
       setLoadingResumeId(applicationId)
       const { applicationsAPI } = await import('../services/api')
-      const data = await applicationsAPI.getById(applicationId)
-      if (data.resume_url) {
-        setResumeModal({ open: true, url: data.resume_url })
-      } else {
-        alert('Resume not available.')
-      }
+      const url = await applicationsAPI.getResumeUrl(applicationId)
+      setResumeModal({ open: true, url })
     } catch (err) {
       console.error('Error loading resume:', err)
       alert('Failed to load resume. Please try again.')
@@ -121,6 +117,9 @@ const Dashboard = () => {
   }
 
   const closeResumeModal = () => {
+    if (resumeModal.url) {
+      URL.revokeObjectURL(resumeModal.url)
+    }
     setResumeModal({ open: false, url: null })
   }
 
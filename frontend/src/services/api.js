@@ -93,6 +93,12 @@ export const jobsAPI = {
     return response.data
   },
 
+  // Application counts (total and per status) for one of the employer's jobs
+  getStats: async (id) => {
+    const response = await api.get(`/jobs/${id}/stats/`)
+    return response.data
+  },
+
   create: async (jobData) => {
     const response = await api.post('/jobs/', jobData)
     return response.data
@@ -122,6 +128,13 @@ export const applicationsAPI = {
     return response.data
   },
 
+  // Resume bytes come from a dedicated endpoint that needs the auth header,
+  // so fetch them as a blob and hand back a local object URL for display
+  getResumeUrl: async (id) => {
+    const response = await api.get(`/applications/${id}/resume/`, { responseType: 'blob' })
+    return URL.createObjectURL(response.data)
+  },
+
   create: async (applicationData) => {
     const formData = new FormData()
     // Ensure job ID is sent as a number (FormData will convert to string)
@@ -138,6 +151,12 @@ export const applicationsAPI = {
     return response.data
   },
 
+  // One request for many applications; returns a result ('updated' or 'not_found') per id
+  bulkUpdateStatus: async (ids, status) => {
+    const response = await api.post('/applications/bulk-status/', { ids, status })
+    return response.data
+  },
+
   delete: async (id) => {
     const response = await api.delete(`/applications/${id}/`)
     return response.data
@@ -0,0 +1,23 @@
+"""
+gunicorn settings for `gunicorn -c gunicorn.conf.py` (Procfile, render.yaml).
+
+SERVER_MODE=wsgi (default): sync workers running config.wsgi, one request
+per worker at a time.
+SERVER_MODE=asgi: uvicorn workers (pip install uvicorn-worker) running
+config.asgi, which serves job and application reads with async views
+(config/async_views.py), so a worker keeps serving while queries are in
+flight. Compare both with `python -m benchmarks.bench_endpoints --server`.
+"""
+import os
+
+mode = os.environ.get('SERVER_MODE', 'wsgi')
+if mode == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif mode == 'wsgi':
+    wsgi_app = 'config.wsgi:application'
+else:
+    raise RuntimeError(f'SERVER_MODE must be "wsgi" or "asgi", not {mode!r}')
+
+bind = f'0.0.0.0:{os.environ.get("PORT", "8000")}'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
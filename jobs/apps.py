@@ -1,4 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def repair_search_index(sender, using, **kwargs):
+    """SQLite drops triggers when Django rebuilds a table; put them back after migrate"""
+    from django.db import connections
+    from . import search
+    conn = connections[using]
+    if conn.vendor == 'sqlite' and search.FTS_TABLE in conn.introspection.table_names():
+        search.install(conn)
+
+
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'jobs'
\ No newline at end of file
+    name = 'jobs'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - connects cache invalidation receivers
+        post_migrate.connect(repair_search_index, sender=self)
@@ -0,0 +1,163 @@
+"""
+Bulk job import and export (POST /api/jobs/import/, GET /api/jobs/export/).
+
+Imports are read incrementally from the request body or an uploaded file,
+one line at a time. Each row goes through JobSerializer validation and valid
+rows are inserted with bulk_create every IMPORT_BATCH_SIZE rows, so memory
+stays flat regardless of file size. Invalid rows are skipped and reported by
+row number (the header line of a CSV file is not counted).
+"""
+import codecs
+import csv
+import json
+import os
+
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
+
+from config.renderers import dumps
+
+from .models import Job
+from .serializers import FastJobSerializer, JobSerializer
+
+IMPORT_BATCH_SIZE = 500
+READ_CHUNK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+EXPORT_CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8', 'ndjson': 'application/x-ndjson'}
+
+
+def import_source(request):
+    """
+    Return (file-like object, format) for an import request: either the raw
+    body (Content-Type text/csv or application/x-ndjson) or the multipart
+    field "file", whose format comes from its content type or extension.
+    """
+    content_type = request.content_type.split(';')[0].strip().lower()
+    if content_type == 'multipart/form-data':
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['No file was submitted.']})
+        upload_type = (upload.content_type or '').split(';')[0].strip().lower()
+        fmt = CONTENT_TYPES.get(upload_type) or EXTENSIONS.get(os.path.splitext(upload.name)[1].lower())
+        if fmt is None:
+            raise UnsupportedMediaType(upload_type or upload.name)
+        return upload, fmt
+    if content_type not in CONTENT_TYPES:
+        raise UnsupportedMediaType(content_type)
+    # Read the body as it arrives instead of through DRF's parsers
+    return request.stream, CONTENT_TYPES[content_type]
+
+
+def iter_lines(stream):
+    """Decode a binary stream chunk by chunk into text lines (line endings kept)"""
+    if stream is None:  # Empty request body
+        return
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='strict')
+    pending = ''
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        try:
+            pending += decoder.decode(chunk or b'', final=not chunk)
+        except UnicodeDecodeError:
+            raise ValidationError({'detail': 'Import files must be UTF-8 encoded.'})
+        # Only '\n' ends a line (CSV cells may contain other separators);
+        # the last piece may be incomplete and waits for the next chunk
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+        if not chunk:
+            if pending:
+                yield pending
+            return
+
+
+def parse_rows(stream, fmt):
+    """Yield (row number, dict) pairs; a row that cannot be parsed yields its error message instead"""
+    lines = iter_lines(stream)
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        try:
+            for number, row in enumerate(reader, start=1):
+                # Cells beyond the header are collected under the None key
+                row.pop(None, None)
+                yield number, row
+        except csv.Error as exc:
+            raise ValidationError({'detail': f'Malformed CSV near line {reader.line_num}: {exc}'})
+        return
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, f'Invalid JSON: {exc}'
+            continue
+        yield number, row if isinstance(row, dict) else 'Each line must be a JSON object.'
+
+
+def import_rows(rows, employer_id, max_rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validate rows with JobSerializer and bulk insert the valid ones for employer_id.
+    Call inside a transaction; more than max_rows rows raises ValidationError.
+    Returns {'created': n, 'errors': [{'row': n, 'errors': {...}}]}.
+    """
+    validator = JobSerializer()
+    batch, errors = [], []
+    created = 0
+    for number, row in rows:
+        if number > max_rows:
+            raise ValidationError({'detail': f'Imports are limited to {max_rows} rows.'})
+        if isinstance(row, str):
+            errors.append({'row': number, 'errors': {'non_field_errors': [row]}})
+            continue
+        try:
+            data = validator.run_validation(row)
+        except ValidationError as exc:
+            errors.append({'row': number, 'errors': exc.detail})
+            continue
+        batch.append(Job(employer_id=employer_id, **data))
+        if len(batch) >= batch_size:
+            Job.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        Job.objects.bulk_create(batch)
+        created += len(batch)
+    return {'created': created, 'errors': errors}
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(queryset, fmt, chunk_size, context=None):
+    """
+    Encode jobs as CSV (with a header) or NDJSON, one line at a time.
+
+    context is the serializer context: 'fieldset' selects the columns, and
+    with a 'request' NDJSON rows carry application_stats for the requester's
+    jobs. CSV columns are flat, so CSV never has them.
+    """
+    context = context or {}
+    if fmt == 'csv':
+        context = {'fieldset': context.get('fieldset')}
+    serializer = FastJobSerializer(queryset, context=context)
+    rows = serializer.iter_rows(chunk_size=chunk_size)
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow([key for key, _ in serializer.selected]).encode()
+        for row in rows:
+            yield writer.writerow(row.values()).encode()
+    else:
+        for row in rows:
+            yield dumps(row) + b'\n'
@@ -0,0 +1,166 @@
+"""
+Versioned cache for the public job catalog.
+
+Cache keys embed version counters instead of being deleted on writes:
+
+- List responses are keyed by the catalog version, which every job
+  save/delete bumps, so all cached listings go stale at once.
+- Detail responses are keyed by a per-job version, so editing one posting
+  only invalidates that posting's detail entry (and the listings).
+
+Stale entries are never read again and simply expire. Only anonymous GETs
+are cached. The backend is the JOBS_CACHE_ALIAS cache: local memory by
+default (per process, so keep JOBS_CACHE_TIMEOUT short with several
+workers) or Redis when REDIS_URL is set.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+CATALOG_VERSION_KEY = 'jobs:catalog:version'
+
+
+def catalog_cache():
+    return caches[settings.JOBS_CACHE_ALIAS]
+
+
+def job_version_key(pk):
+    return f'jobs:job:{pk}:version'
+
+
+def get_version(key):
+    cache = catalog_cache()
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a counter lost to eviction or a restart
+        # never restarts below a version that still has live entries
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(key):
+    cache = catalog_cache()
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns() // 1000, timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(key):
+    cache = catalog_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+
+
+def invalidate_catalog(job_ids=()):
+    """
+    Invalidate cached listings and the detail entries of job_ids.
+
+    Runs now and again on commit: the second bump discards anything a
+    concurrent reader cached from the pre-commit state.
+    """
+    def bump():
+        bump_version(CATALOG_VERSION_KEY)
+        for pk in job_ids:
+            bump_version(job_version_key(pk))
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def request_fingerprint(request):
+    """Absolute URI including the query string (pagination links embed the host)"""
+    return hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+
+class CatalogCacheMixin:
+    """
+    Serve list/retrieve (and their async twins alist/aretrieve) from the
+    catalog cache for anonymous GET requests. Must come before
+    ConditionalResponseMixin, whose validators are cached alongside the data.
+    """
+
+    def is_cacheable(self, request):
+        return settings.JOBS_CACHE_ENABLED and request.method == 'GET' and not request.user.is_authenticated
+
+    def cached_entry_response(self, entry):
+        # Conditional GETs are answered from the cached validators, no query needed
+        etag, last_modified = entry['etag'], entry['last_modified']
+        response = self.conditional_response(self.request, etag, last_modified) or Response(entry['data'])
+        response = self.add_validator_headers(response, etag, last_modified)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def cache_entry(self, response):
+        """What to cache for response, or None"""
+        if response.status_code != 200:
+            return None
+        etag, last_modified = getattr(self, 'validators', (None, None))
+        return {'data': response.data, 'etag': etag, 'last_modified': last_modified}
+
+    def cached_response(self, key, render):
+        cache = catalog_cache()
+        entry = cache.get(key)
+        if entry is not None:
+            return self.cached_entry_response(entry)
+        response = render()
+        entry = self.cache_entry(response)
+        if entry is not None:
+            cache.set(key, entry, settings.JOBS_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def acached_response(self, key, render):
+        """cached_response() for async views; render is a coroutine function"""
+        cache = catalog_cache()
+        entry = await cache.aget(key)
+        if entry is not None:
+            return self.cached_entry_response(entry)
+        response = await render()
+        entry = self.cache_entry(response)
+        if entry is not None:
+            await cache.aset(key, entry, settings.JOBS_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list_key(self, request, version):
+        return f'jobs:list:{version}:{request_fingerprint(request)}'
+
+    def detail_key(self, request, pk, version):
+        return f'jobs:detail:{pk}:{version}:{request_fingerprint(request)}'
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().list(request, *args, **kwargs)
+        key = self.list_key(request, get_version(CATALOG_VERSION_KEY))
+        return self.cached_response(key, lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs))
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return await super().alist(request, *args, **kwargs)
+        key = self.list_key(request, await aget_version(CATALOG_VERSION_KEY))
+        return await self.acached_response(key, lambda: super(CatalogCacheMixin, self).alist(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().retrieve(request, *args, **kwargs)
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        key = self.detail_key(request, pk, get_version(job_version_key(pk)))
+        return self.cached_response(key, lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return await super().aretrieve(request, *args, **kwargs)
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        key = self.detail_key(request, pk, await aget_version(job_version_key(pk)))
+        return await self.acached_response(
+            key, lambda: super(CatalogCacheMixin, self).aretrieve(request, *args, **kwargs)
+        )
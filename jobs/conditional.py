@@ -0,0 +1,143 @@
+"""
+Conditional GET (ETag / Last-Modified) for list and detail endpoints.
+
+Validators are derived from the row count and the newest timestamp over the
+rows a response would contain, computed with one aggregate query. A matching
+If-None-Match (or If-Modified-Since) is answered with 304 before anything is
+serialized. Lists send only the ETag: the newest timestamp of a list does
+not move when a row is deleted or leaves its filter, so If-Modified-Since
+would call a changed list unmodified. Their ETag also covers the row count.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+class ConditionalResponseMixin:
+    """
+    Adds ETag to list responses and ETag/Last-Modified to retrieve responses.
+
+    conditional_timestamp_fields lists the timestamps (lookups allowed, e.g.
+    'job__updated_at') whose newest value changes whenever the representation
+    does. alist()/aretrieve() do the same for async views (config/async_views.py).
+    """
+    conditional_timestamp_fields = ('updated_at',)
+
+    def make_validators(self, count, timestamps):
+        timestamps = [ts for ts in timestamps if ts is not None]
+        last_modified = max(timestamps) if timestamps else None
+        user = self.request.user
+        raw = ':'.join([
+            str(count),
+            last_modified.isoformat() if last_modified else '',
+            self.request.get_full_path(),
+            str(user.pk) if user.is_authenticated else '',
+        ])
+        return f'"{hashlib.md5(raw.encode()).hexdigest()}"', last_modified
+
+    def validator_aggregates(self):
+        maxima = {f'max_{i}': Max(field) for i, field in enumerate(self.conditional_timestamp_fields)}
+        return {'count': Count('pk'), **maxima}
+
+    def aggregate_validators(self, queryset):
+        """Return (row count, (etag, last_modified)) using one aggregate query"""
+        result = queryset.order_by().aggregate(**self.validator_aggregates())
+        count = result.pop('count')
+        return count, self.make_validators(count, result.values())
+
+    async def aaggregate_validators(self, queryset):
+        result = await queryset.order_by().aaggregate(**self.validator_aggregates())
+        count = result.pop('count')
+        return count, self.make_validators(count, result.values())
+
+    def object_validators(self, obj):
+        """Same validators as aggregate_validators gives for a one-row queryset, without a query"""
+        timestamps = []
+        for field in self.conditional_timestamp_fields:
+            value = obj
+            for part in field.split('__'):
+                value = getattr(value, part, None)
+            timestamps.append(value)
+        return self.make_validators(1, timestamps)
+
+    def conditional_response(self, request, etag, last_modified):
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def add_validator_headers(self, response, etag, last_modified):
+        self.validators = (etag, last_modified)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            # Always revalidate instead of letting browsers heuristically cache
+            patch_cache_control(response, no_cache=True, private=self.request.user.is_authenticated)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        _, (etag, _) = self.aggregate_validators(self.filter_queryset(self.get_queryset()))
+        last_modified = None  # See the module docstring
+        response = self.conditional_response(request, etag, last_modified)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.add_validator_headers(response, etag, last_modified)
+
+    async def alist(self, request, *args, **kwargs):
+        _, (etag, _) = await self.aaggregate_validators(self.filter_queryset(self.get_queryset()))
+        last_modified = None  # See the module docstring
+        response = self.conditional_response(request, etag, last_modified)
+        if response is None:
+            response = await super().alist(request, *args, **kwargs)
+        return self.add_validator_headers(response, etag, last_modified)
+
+    def is_revalidation(self, request):
+        return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+    def object_queryset(self, kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        return self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup]})
+
+    def revalidated_response(self, request, count, etag, last_modified):
+        """304 for a revalidation whose object exists and did not change, else None"""
+        if count:
+            response = self.conditional_response(request, etag, last_modified)
+            if response is not None:
+                return self.add_validator_headers(response, etag, last_modified)
+        return None
+
+    def add_object_validator_headers(self, response):
+        if response.status_code == 200:
+            etag, last_modified = self.object_validators(self.object)
+            response = self.add_validator_headers(response, etag, last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.is_revalidation(request):
+            count, (etag, last_modified) = self.aggregate_validators(self.object_queryset(kwargs))
+            response = self.revalidated_response(request, count, etag, last_modified)
+            if response is not None:
+                return response
+        return self.add_object_validator_headers(super().retrieve(request, *args, **kwargs))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        if self.is_revalidation(request):
+            count, (etag, last_modified) = await self.aaggregate_validators(self.object_queryset(kwargs))
+            response = self.revalidated_response(request, count, etag, last_modified)
+            if response is not None:
+                return response
+        return self.add_object_validator_headers(await super().aretrieve(request, *args, **kwargs))
+
+    def get_object(self):
+        # Keep the instance so retrieve() can derive validators from it
+        self.object = super().get_object()
+        return self.object
+
+    async def aget_object(self):
+        self.object = await super().aget_object()
+        return self.object
@@ -0,0 +1,97 @@
+"""
+Server-side filtering and ordering for the job listing.
+
+Every filter here is backed by an index declared on Job.Meta, so a filtered
+listing plans as an index range scan instead of a sequential scan:
+
+- ?salary_min= / ?salary_max=        -> job_salary_id_idx
+- ?location= (exact) / ?location_prefix= -> job_location_posted_at_idx
+- ?posted_after=                      -> job_posted_at_id_idx
+"""
+from datetime import datetime, time, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+# Public ?ordering= values mapped to the model ordering they stand for.
+# id is always the tie-breaker so cursor pagination stays stable.
+JOB_ORDERINGS = {
+    'posted_at': ('posted_at', 'id'),
+    '-posted_at': ('-posted_at', '-id'),
+    'salary': ('salary', 'id'),
+    '-salary': ('-salary', '-id'),
+}
+DEFAULT_JOB_ORDERING = '-posted_at'
+
+
+def parse_decimal(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        number = None
+    if number is None or not number.is_finite():
+        raise ValidationError({name: 'A valid number is required.'})
+    return number
+
+
+def parse_datetime_param(params, name):
+    """Accept an ISO 8601 datetime or a plain date (midnight UTC)"""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            parsed = datetime.combine(date, time.min) if date else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Use an ISO 8601 date or datetime.'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def filter_jobs(queryset, params):
+    """Apply ?salary_min, ?salary_max, ?location, ?location_prefix and ?posted_after"""
+    salary_min = parse_decimal(params, 'salary_min')
+    if salary_min is not None:
+        queryset = queryset.filter(salary__gte=salary_min)
+
+    salary_max = parse_decimal(params, 'salary_max')
+    if salary_max is not None:
+        queryset = queryset.filter(salary__lte=salary_max)
+
+    location = params.get('location')
+    if location:
+        queryset = queryset.filter(location=location)
+
+    # Case-sensitive prefix so PostgreSQL can use the varchar_pattern_ops index
+    location_prefix = params.get('location_prefix')
+    if location_prefix:
+        queryset = queryset.filter(location__startswith=location_prefix)
+
+    posted_after = parse_datetime_param(params, 'posted_after')
+    if posted_after is not None:
+        queryset = queryset.filter(posted_at__gt=posted_after)
+
+    return queryset
+
+
+def get_job_ordering(params):
+    """
+    Return the requested ordering as a tuple of model fields, or None when the
+    client didn't ask for one.
+    """
+    ordering = params.get('ordering')
+    if not ordering:
+        return None
+    if ordering not in JOB_ORDERINGS:
+        raise ValidationError({'ordering': f"Choose one of: {', '.join(JOB_ORDERINGS)}."})
+    return JOB_ORDERINGS[ordering]
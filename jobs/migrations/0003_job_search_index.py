@@ -0,0 +1,24 @@
+# Full-text search index: tsvector + GIN on PostgreSQL, FTS5 on SQLite
+
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from jobs import search
+    search.install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from jobs import search
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_posted_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
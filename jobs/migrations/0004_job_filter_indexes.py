@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary', 'id'], name='job_salary_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location', 'posted_at'], name='job_location_posted_at_idx', opclasses=['varchar_pattern_ops', 'timestamptz_ops']),
+        ),
+    ]
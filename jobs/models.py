@@ -9,3 +9,23 @@ class Job(models.Model):
     location = models.CharField(max_length=255)
     salary = models.DecimalField(max_digits=10, decimal_places=2)
     posted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination seeks on (posted_at, id) instead of using OFFSET
+            models.Index(fields=['posted_at', 'id'], name='job_posted_at_id_idx'),
+            # Salary range filters and ?ordering=salary
+            models.Index(fields=['salary', 'id'], name='job_salary_id_idx'),
+            # Exact and prefix location filters, newest first; the pattern opclass
+            # lets PostgreSQL use the index for LIKE 'prefix%' under any collation
+            models.Index(
+                fields=['location', 'posted_at'],
+                name='job_location_posted_at_idx',
+                opclasses=['varchar_pattern_ops', 'timestamptz_ops'],
+            ),
+            # Max(updated_at) for ETags and "changed since" queries
+            models.Index(fields=['updated_at'], name='job_updated_at_idx'),
+            # An employer's jobs changed since a change-feed cursor (changes/feed.py)
+            models.Index(fields=['employer', 'updated_at', 'id'], name='job_employer_updated_idx'),
+        ]
@@ -0,0 +1,148 @@
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import BooleanField, F, Func, Q, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def position_value(value):
+    """JSON for a datetime or Decimal ordering value, read back by the model field's to_python()"""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+class RowComparison(Func):
+    """
+    (a, b) > (x, y) as one row-value comparison. PostgreSQL answers it with a
+    range seek on an index over (a, b); the equivalent
+    a > x OR (a = x AND b > y) is not always planned that way.
+    """
+    output_field = BooleanField()
+
+    def __init__(self, fields, values, operator):
+        self.operator = operator
+        super().__init__(*fields, *values)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sqls, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        width = len(sqls) // 2
+        return f'({", ".join(sqls[:width])}) {self.operator} ({", ".join(sqls[width:])})', params
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in cursor (keyset) pagination.
+
+    The cursor holds every ordering value of the row it continues from, e.g.
+    (posted_at, id), and the next page starts with an index seek past them
+    (see seek()), never an OFFSET, so the cost of fetching page N does not
+    grow with N, even within a run of equal posted_at or salary values.
+    Orderings must end with a unique column (id) and run in one direction.
+    Enabled per request with ?paginate=cursor (see wants_cursor_pagination).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # Let the view pick the ordering so ?ordering= and the cursor agree
+        if hasattr(view, 'get_cursor_ordering'):
+            return view.get_cursor_ordering()
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering]
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.decode_position(self.cursor.position)
+
+        descending = self.ordering[0].startswith('-') != reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(*(prefix + field.attname for field in self.fields))
+        if position is not None:
+            queryset = self.seek(queryset, position, descending, self.page_size + 1)
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+        # An empty page (the rows around the cursor were deleted) links nowhere
+        self.has_next = bool(self.page) and (position is not None if reverse else has_more)
+        self.has_previous = bool(self.page) and (has_more if reverse else position is not None)
+        if self.page:
+            self.next_position = self.encode_position(self.page[-1])
+            self.previous_position = self.encode_position(self.page[0])
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def seek(self, queryset, position, descending, limit):
+        """
+        queryset narrowed to the rows after position. PostgreSQL seeks an index
+        on a row-value comparison. SQLite seeks only on its first column, so a
+        page deep in a run of equal salaries would scan the run; there each
+        ordering column gets its own seek instead (salary = x AND id > y, then
+        salary > x), each reading at most limit rows, and the page is picked
+        from their primary keys.
+        """
+        if connections[queryset.db].vendor == 'postgresql':
+            return queryset.filter(RowComparison(
+                [F(field.attname) for field in self.fields],
+                [Value(value, output_field=field) for field, value in zip(self.fields, position)],
+                '<' if descending else '>',
+            ))
+        after = 'lt' if descending else 'gt'
+        seeks = Q()
+        for width in range(len(self.fields), 0, -1):
+            *equal, last = self.fields[:width]
+            rows = queryset.filter(**{
+                **{field.attname: value for field, value in zip(equal, position)},
+                f'{last.attname}__{after}': position[width - 1],
+            })
+            seeks |= Q(pk__in=rows.values('pk')[:limit])
+        return queryset.filter(seeks)
+
+    def encode_position(self, instance):
+        # Full precision: DjangoJSONEncoder would cut datetimes to milliseconds
+        return json.dumps([getattr(instance, field.attname) for field in self.fields], default=position_value)
+
+    def decode_position(self, position):
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError(position)
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+
+class JobCursorPagination(KeysetPagination):
+    """Newest jobs first, seeking on the (posted_at, id) index"""
+    ordering = ('-posted_at', '-id')
+
+
+def wants_cursor_pagination(request):
+    """True when the client asked for cursor pagination (?paginate=cursor)"""
+    return request.query_params.get('paginate') == 'cursor'
@@ -63,7 +63,7 @@ class IsJobOwnerOrReadOnly(BasePermission):
             return True
         
         # Only the job owner (employer) can update/delete their own jobs
-        return obj.employer == request.user
+        return obj.employer_id == request.user.id
 
 
 class IsApplicationOwnerOrJobOwner(BasePermission):
@@ -72,6 +72,10 @@ class IsApplicationOwnerOrJobOwner(BasePermission):
     - CREATE: Only applicants can create applications
     - READ: Applicants can see their own applications, employers can see applications for their jobs
     - UPDATE/DELETE: Only applicants can update/delete their own applications (within time limits)
+    - BULK STATUS: Only employers (ownership of each application is checked by the view)
+
+    Ownership is checked by comparing ids (obj.applicant_id, obj.job.employer_id)
+    so the check never lazy-loads a related User row.
     """
     
     def has_permission(self, request, view):
@@ -79,6 +83,12 @@ class IsApplicationOwnerOrJobOwner(BasePermission):
         if request.method in SAFE_METHODS:
             return request.user and request.user.is_authenticated
         
+        # Bulk status changes are for employers triaging their applications
+        if getattr(view, 'action', None) == 'bulk_status':
+            if not request.user or not request.user.is_authenticated:
+                return False
+            return request.user.is_superuser or request.user.is_employer
+        
         # Create operations require applicant authentication
         if request.method == 'POST':
             if not request.user or not request.user.is_authenticated:
@@ -99,25 +109,25 @@ class IsApplicationOwnerOrJobOwner(BasePermission):
         # For read operations
         if request.method in SAFE_METHODS:
             # Applicants can see their own applications
-            if obj.applicant == request.user:
+            if obj.applicant_id == request.user.id:
                 return True
             # Employers can see applications for their jobs
-            if request.user.is_employer and obj.job.employer == request.user:
+            if request.user.is_employer and obj.job.employer_id == request.user.id:
                 return True
             return False
         
         # For update operations
         if request.method in ['PUT', 'PATCH']:
             # Applicants can update their own applications
-            if obj.applicant == request.user and request.user.is_applicant:
+            if obj.applicant_id == request.user.id and request.user.is_applicant:
                 return True
             # Employers can update status of applications for their jobs
-            if request.user.is_employer and obj.job.employer == request.user:
+            if request.user.is_employer and obj.job.employer_id == request.user.id:
                 return True
             return False
         
         # For delete operations, only applicants can delete their own applications
         if request.method == 'DELETE':
-            return obj.applicant == request.user and request.user.is_applicant
+            return obj.applicant_id == request.user.id and request.user.is_applicant
         
         return False
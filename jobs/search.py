@@ -0,0 +1,147 @@
+"""
+Full-text search over job title, description and location.
+
+- PostgreSQL: a tsvector column (search_vector) kept current by a trigger,
+  indexed with GIN and ranked with ts_rank.
+- SQLite (local development): an external-content FTS5 table kept current
+  by triggers and ranked with bm25.
+- Any other backend falls back to icontains matching.
+
+The index lives entirely in the database, so bulk inserts and raw updates
+stay searchable without going through Job.save().
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Job
+
+TABLE = Job._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+
+# Title matches rank above location matches, which rank above description matches
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce({row}.title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}.location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({row}.description, '')), 'C')"
+)
+SQLITE_BM25 = f'bm25({FTS_TABLE}, 10.0, 1.0, 5.0)'  # title, description, location weights
+
+POSTGRES_INSTALL = [
+    f'ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    f"""
+    CREATE OR REPLACE FUNCTION {TABLE}_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {POSTGRES_VECTOR.format(row='NEW')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f'DROP TRIGGER IF EXISTS {TABLE}_search_vector_trigger ON {TABLE}',
+    f"""
+    CREATE TRIGGER {TABLE}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, location ON {TABLE}
+    FOR EACH ROW EXECUTE FUNCTION {TABLE}_search_vector_update()
+    """,
+    f'UPDATE {TABLE} SET search_vector = {POSTGRES_VECTOR.format(row=TABLE)}',
+    f'CREATE INDEX IF NOT EXISTS {TABLE}_search_vector_idx ON {TABLE} USING GIN (search_vector)',
+]
+
+POSTGRES_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {TABLE}_search_vector_trigger ON {TABLE}',
+    f'DROP FUNCTION IF EXISTS {TABLE}_search_vector_update()',
+    f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_FTS_INSERT = (
+    f'INSERT INTO {FTS_TABLE}(rowid, title, description, location) '
+    'VALUES (new.id, new.title, new.description, new.location);'
+)
+SQLITE_FTS_DELETE = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location);"
+)
+SQLITE_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f'AFTER INSERT ON {TABLE} BEGIN {SQLITE_FTS_INSERT} END',
+    f'{FTS_TABLE}_ad': f'AFTER DELETE ON {TABLE} BEGIN {SQLITE_FTS_DELETE} END',
+    f'{FTS_TABLE}_au': f'AFTER UPDATE ON {TABLE} BEGIN {SQLITE_FTS_DELETE} {SQLITE_FTS_INSERT} END',
+}
+
+
+def install(conn=connection):
+    """
+    Create (or repair) the search index for the given connection.
+
+    Safe to run repeatedly. On SQLite, Django rebuilds tables for many schema
+    changes, which silently drops their triggers, so this is also run after
+    every migrate (see JobsConfig.ready) and rebuilds the index if needed.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for statement in POSTGRES_INSTALL:
+                cursor.execute(statement)
+        elif conn.vendor == 'sqlite':
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+                f"title, description, location, content='{TABLE}', content_rowid='id', "
+                "tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [TABLE]
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(f'CREATE TRIGGER {name} {SQLITE_TRIGGERS[name]}')
+            if missing:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall(conn=connection):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for statement in POSTGRES_UNINSTALL:
+                cursor.execute(statement)
+        elif conn.vendor == 'sqlite':
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def search_jobs(queryset, query):
+    """
+    Filter queryset to jobs matching query and annotate search_rank
+    (higher is better). Results are ordered by rank, then newest first.
+    """
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        tsquery = "websearch_to_tsquery('english', %s)"
+        queryset = queryset.filter(
+            RawSQL(f'{TABLE}.search_vector @@ {tsquery}', [query], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank({TABLE}.search_vector, {tsquery})', [query], output_field=FloatField())
+        )
+    elif vendor == 'sqlite':
+        # Quote every word so user input can't inject FTS5 query syntax
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return queryset.none()
+        match = ' '.join(f'"{term}"' for term in terms)
+        queryset = queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -{SQLITE_BM25} FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = {TABLE}.id',
+                [match],
+                output_field=FloatField(),
+            )
+        )
+    else:
+        condition = Q()
+        for term in query.split():
+            condition &= Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+        queryset = queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by('-search_rank', '-posted_at', '-id')
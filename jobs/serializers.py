@@ -1,11 +1,164 @@
-
+from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import serializers
+from applications.models import JobApplicationStats
+from applications.stats import stats_representation
 from .models import Job
 
+
+def application_stats_viewer(context):
+    """The requesting user if they may see application stats on their jobs (employers, superusers), else None"""
+    request = (context or {}).get('request')
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and (user.is_superuser or user.is_employer):
+        return user
+    return None
+
+
+def shows_application_stats(viewer, employer_id):
+    return viewer is not None and (viewer.is_superuser or viewer.id == employer_id)
+
+
 class JobSerializer(serializers.ModelSerializer):
+    """
+    Job owners (and superusers) also get "application_stats": the total number
+    of applications and a count per status (see applications/stats.py).
+    context['fieldset'] limits the output to those keys (see config/fieldsets.py).
+    """
     employer = serializers.PrimaryKeyRelatedField(read_only=True)
     posted_at = serializers.DateTimeField(read_only=True)
-    
+
     class Meta:
         model = Job
         fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fieldset = self.context.get('fieldset')
+        if self.fieldset is not None:
+            for name in set(self.fields) - set(self.fieldset):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        wants_stats = self.fieldset is None or 'application_stats' in self.fieldset
+        if wants_stats and shows_application_stats(application_stats_viewer(self.context), instance.employer_id):
+            # Missing row (RelatedObjectDoesNotExist is an AttributeError): no applications yet
+            data['application_stats'] = stats_representation(getattr(instance, 'application_stats', None))
+        return data
+
+
+def format_datetime(value, tz):
+    """Same output as DRF's DateTimeField: ISO 8601 in the current time zone, 'Z' for UTC"""
+    if value is None:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class FastJobSerializer:
+    """
+    Read-only equivalent of JobSerializer(many=True) for list responses.
+
+    Skips DRF field introspection: given a queryset it reads plain tuples with
+    values_list() (no model instances at all); given a list of instances (a
+    paginated page) it reads their attributes directly. Output matches
+    JobSerializer field for field, including application_stats for the
+    owner when a request is in the context.
+    """
+    # (output key, model attribute) in JobSerializer's field order
+    FIELDS = (
+        ('id', 'id'),
+        ('employer', 'employer_id'),
+        ('posted_at', 'posted_at'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('location', 'location'),
+        ('salary', 'salary'),
+        ('updated_at', 'updated_at'),
+    )
+
+    STATS_ATTRS = tuple(f'application_stats__{name}' for name in JobApplicationStats.COUNTERS)
+
+    def __init__(self, instance=None, many=True, context=None, **kwargs):
+        self.instance = instance
+        # context['fieldset'] (see config/fieldsets.py) selects output keys
+        fieldset = (context or {}).get('fieldset')
+        self.selected = self.FIELDS if fieldset is None else tuple(f for f in self.FIELDS if f[0] in fieldset)
+        wants_stats = fieldset is None or 'application_stats' in fieldset
+        self.stats_viewer = application_stats_viewer(context) if wants_stats else None
+
+    def to_representation(self, values, tz):
+        id, employer_id, posted_at, title, description, location, salary, updated_at = values
+        return {
+            'id': id,
+            'employer': employer_id,
+            'posted_at': format_datetime(posted_at, tz),
+            'title': title,
+            'description': description,
+            'location': location,
+            'salary': None if salary is None else f'{salary:f}',
+            'updated_at': format_datetime(updated_at, tz),
+        }
+
+    def sparse_representation(self, keys, values, tz):
+        """to_representation() for a subset of FIELDS"""
+        row = dict(zip(keys, values))
+        for key in ('posted_at', 'updated_at'):
+            if key in row:
+                row[key] = format_datetime(row[key], tz)
+        if row.get('salary') is not None:
+            row['salary'] = f'{row["salary"]:f}'
+        return row
+
+    def job_values(self, job, attrs):
+        values = [getattr(job, attr) for attr in attrs]
+        if self.stats_viewer is not None:
+            stats = getattr(job, 'application_stats', None)
+            values.append(job.employer_id)
+            values.extend(getattr(stats, name, None) for name in JobApplicationStats.COUNTERS)
+        return values
+
+    def rows(self):
+        """values_list() queryset over the selected columns, or value lists read from instances"""
+        attrs = [attr for _, attr in self.selected]
+        if isinstance(self.instance, QuerySet):
+            # Stats columns come from a LEFT JOIN, NULL for jobs without applications
+            extra = ('employer_id', *self.STATS_ATTRS) if self.stats_viewer is not None else ()
+            return self.instance.values_list(*attrs, *extra)
+        return (self.job_values(job, attrs) for job in self.instance)
+
+    def represent_rows(self, rows):
+        keys = [key for key, _ in self.selected]
+        width = len(keys)
+        represent = self.to_representation if self.selected == self.FIELDS else (
+            lambda values, tz: self.sparse_representation(keys, values, tz)
+        )
+        viewer = self.stats_viewer
+        # Looking up the current time zone is costly; do it once, not per value
+        tz = timezone.get_current_timezone()
+        for values in rows:
+            row = represent(values[:width], tz)
+            if viewer is not None and shows_application_stats(viewer, values[width]):
+                counters = dict(zip(JobApplicationStats.COUNTERS, values[width + 1:]))
+                row['application_stats'] = stats_representation(counters)
+            yield row
+
+    def iter_rows(self, chunk_size=None):
+        rows = self.rows()
+        if chunk_size and isinstance(rows, QuerySet):
+            rows = rows.iterator(chunk_size=chunk_size)
+        return self.represent_rows(rows)
+
+    @property
+    def data(self):
+        return list(self.iter_rows())
+
+    async def adata(self):
+        """data, with the rows of a queryset read by the async ORM"""
+        rows = self.rows()
+        if isinstance(rows, QuerySet):
+            rows = [values async for values in rows]
+        return list(self.represent_rows(rows))
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_catalog
+from .models import Job
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_cached_job(sender, instance, **kwargs):
+    """Write-through invalidation: any saved or deleted posting bumps the catalog version"""
+    invalidate_catalog([instance.pk])
@@ -1,8 +1,454 @@
+import json
+import time
+
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils.http import http_date
 from rest_framework.test import APIClient
 
+from jobs.models import Job
+from users.models import User
+
 @pytest.mark.django_db
 def test_jobs_view_placeholder():
     client = APIClient()
     response = client.get("/")  # Replace with actual path
     assert response.status_code in [200, 404]
+
+
+@pytest.mark.django_db
+def test_job_list_is_unpaginated_by_default(api_client, make_job):
+    for i in range(3):
+        make_job(title=f'Job {i}')
+    response = api_client.get('/api/jobs/')
+    assert response.status_code == 200
+    assert isinstance(response.data, list)
+    assert len(response.data) == 3
+
+
+@pytest.mark.django_db
+def test_job_list_cursor_pagination_walks_all_pages(api_client, make_job):
+    ids = [make_job(title=f'Job {i}').id for i in range(5)]
+    seen = []
+    url = '/api/jobs/?paginate=cursor&page_size=2'
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert len(response.data['results']) <= 2
+        seen.extend(job['id'] for job in response.data['results'])
+        url = response.data['next']
+    assert sorted(seen) == sorted(ids)
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.django_db
+def test_job_list_ndjson_stream(api_client, make_job):
+    make_job(title='First')
+    make_job(title='Second')
+    response = api_client.get('/api/jobs/?stream=ndjson')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert {row['title'] for row in rows} == {'First', 'Second'}
+    assert set(rows[0]) == {'id', 'employer', 'title', 'description', 'location', 'salary', 'posted_at', 'updated_at'}
+
+
+@pytest.mark.django_db
+def test_job_search_ranks_title_matches_first(api_client, make_job):
+    make_job(title='Office Manager', description='Coordinate the python team schedule.')
+    make_job(title='Python Developer', description='Write services.')
+    make_job(title='Accountant', description='Spreadsheets.')
+    response = api_client.get('/api/jobs/?q=python')
+    assert response.status_code == 200
+    assert [job['title'] for job in response.data] == ['Python Developer', 'Office Manager']
+
+
+@pytest.mark.django_db
+def test_job_search_index_follows_updates_and_deletes(api_client, make_job):
+    job = make_job(title='Gardener')
+    make_job(title='Chef', location='Lisbon')
+    job.title = 'Head Chef'
+    job.save()
+    titles = {row['title'] for row in api_client.get('/api/jobs/?q=chef').data}
+    assert titles == {'Chef', 'Head Chef'}
+    job.delete()
+    titles = {row['title'] for row in api_client.get('/api/jobs/?q=chef').data}
+    assert titles == {'Chef'}
+    assert api_client.get('/api/jobs/?q=lisbon').data[0]['title'] == 'Chef'
+
+
+@pytest.mark.django_db
+def test_job_search_ignores_query_syntax(api_client, make_job):
+    make_job(title='C++ Engineer')
+    response = api_client.get('/api/jobs/', {'q': '"engineer* -('})
+    assert response.status_code == 200
+    assert len(response.data) == 1
+
+
+@pytest.mark.django_db
+def test_job_filters_salary_location_and_recency(api_client, make_job):
+    make_job(title='Cheap', salary='40000.00', location='Berlin')
+    make_job(title='Mid', salary='80000.00', location='Berlin Mitte')
+    make_job(title='Rich', salary='150000.00', location='London')
+
+    def titles(params):
+        response = api_client.get('/api/jobs/', params)
+        assert response.status_code == 200
+        return [job['title'] for job in response.data]
+
+    assert titles({'salary_min': '50000', 'ordering': 'salary'}) == ['Mid', 'Rich']
+    assert titles({'salary_max': '100000', 'ordering': '-salary'}) == ['Mid', 'Cheap']
+    assert titles({'location': 'Berlin'}) == ['Cheap']
+    assert sorted(titles({'location_prefix': 'Berlin'})) == ['Cheap', 'Mid']
+    assert titles({'posted_after': '2999-01-01'}) == []
+    assert len(titles({'posted_after': '2000-01-01T00:00:00Z'})) == 3
+
+
+@pytest.mark.django_db
+def test_job_filters_reject_bad_values(api_client):
+    assert api_client.get('/api/jobs/', {'salary_min': 'lots'}).status_code == 400
+    assert api_client.get('/api/jobs/', {'posted_after': 'yesterday'}).status_code == 400
+    assert api_client.get('/api/jobs/', {'ordering': 'title'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_job_filters_only_apply_to_lists(api_client, employer_client, job):
+    url = f'/api/jobs/{job.id}/'
+    assert api_client.get(url, {'ordering': 'bogus', 'fields': 'id,title'}).status_code == 200
+    assert api_client.get(url, {'salary_min': 'abc'}).status_code == 200
+    assert api_client.get(url, {'location': 'Nowhere'}).status_code == 200  # Would exclude the job
+    assert employer_client.delete(f'{url}?salary_min=abc').status_code == 204
+
+
+@pytest.mark.django_db
+def test_job_cursor_pagination_follows_salary_ordering(api_client, make_job):
+    for salary in ['30000.00', '10000.00', '20000.00', '10000.00']:
+        make_job(salary=salary)
+    salaries = []
+    url = '/api/jobs/?paginate=cursor&page_size=1&ordering=salary'
+    while url:
+        response = api_client.get(url)
+        salaries.extend(job['salary'] for job in response.data['results'])
+        url = response.data['next']
+    assert salaries == ['10000.00', '10000.00', '20000.00', '30000.00']
+
+
+@pytest.mark.django_db
+def test_job_cursor_pages_seek_through_ties(api_client, make_job):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    ids = [make_job(salary='50000.00').id for _ in range(25)]
+    url, pages, seen = '/api/jobs/?paginate=cursor&page_size=10&ordering=salary', [], []
+    with CaptureQueriesContext(connection) as queries:
+        while url:
+            response = api_client.get(url)
+            pages.append(response.data)
+            seen.extend(job['id'] for job in response.data['results'])
+            url = response.data['next']
+    assert seen == sorted(ids)
+    assert not any('OFFSET' in query['sql'] for query in queries)
+    # Previous links walk back over the same rows
+    previous = api_client.get(pages[-1]['previous']).data
+    assert [job['id'] for job in previous['results']] == seen[10:20]
+    assert api_client.get('/api/jobs/?paginate=cursor&cursor=bogus').status_code == 404
+
+
+@pytest.mark.django_db
+def test_job_cursor_seek_uses_index(make_job):
+    from decimal import Decimal
+    from django.db import connection
+    from jobs.pagination import KeysetPagination
+    paginator = KeysetPagination()
+    paginator.fields = [Job._meta.get_field('salary'), Job._meta.get_field('id')]
+    queryset = Job.objects.order_by('salary', 'id')
+    plan = paginator.seek(queryset, [Decimal('50000'), 7], descending=False, limit=11)[:11].explain()
+    assert 'job_salary_id_idx' in plan
+    if connection.vendor == 'sqlite':
+        # Within the run of equal salaries too: seek on both columns, not scan from its start
+        assert '(salary=? AND id>?)' in plan
+        assert 'SCAN' not in plan
+
+
+@pytest.mark.django_db
+def test_job_endpoint_query_budget(api_client, employer_client, make_job, django_assert_num_queries):
+    job = make_job()
+    with django_assert_num_queries(2):  # ETag aggregate + rows
+        assert api_client.get('/api/jobs/').status_code == 200
+    with django_assert_num_queries(1):
+        assert api_client.get(f'/api/jobs/{job.id}/').status_code == 200
+    with django_assert_num_queries(2):  # fetch + update
+        assert employer_client.patch(f'/api/jobs/{job.id}/', {'title': 'New'}, format='json').status_code == 200
+
+
+@pytest.mark.django_db
+def test_anonymous_job_reads_are_cached_until_a_write(api_client, employer_client, make_job, django_assert_num_queries):
+    job = make_job(title='Original')
+    other = make_job(title='Other')
+    assert api_client.get('/api/jobs/')['X-Cache'] == 'MISS'
+    assert api_client.get(f'/api/jobs/{job.id}/')['X-Cache'] == 'MISS'
+    assert api_client.get(f'/api/jobs/{other.id}/')['X-Cache'] == 'MISS'
+    with django_assert_num_queries(0):
+        assert api_client.get('/api/jobs/')['X-Cache'] == 'HIT'
+        assert api_client.get(f'/api/jobs/{job.id}/')['X-Cache'] == 'HIT'
+
+    employer_client.patch(f'/api/jobs/{job.id}/', {'title': 'Edited'}, format='json')
+
+    response = api_client.get('/api/jobs/')
+    assert response['X-Cache'] == 'MISS'
+    assert 'Edited' in [row['title'] for row in response.data]
+    assert api_client.get(f'/api/jobs/{job.id}/').data['title'] == 'Edited'
+    # Editing one posting leaves the other posting's detail entry alone
+    assert api_client.get(f'/api/jobs/{other.id}/')['X-Cache'] == 'HIT'
+
+
+@pytest.mark.django_db
+def test_job_cache_skips_authenticated_and_filters_separately(api_client, employer_client, make_job):
+    make_job(location='Paris')
+    make_job(location='Rome')
+    assert 'X-Cache' not in employer_client.get('/api/jobs/')
+    assert len(api_client.get('/api/jobs/', {'location': 'Paris'}).data) == 1
+    assert len(api_client.get('/api/jobs/').data) == 2
+
+
+@pytest.mark.django_db
+def test_deleted_job_drops_out_of_cached_listing(api_client, make_job):
+    job = make_job()
+    assert len(api_client.get('/api/jobs/').data) == 1
+    job.delete()
+    assert api_client.get('/api/jobs/').data == []
+    assert api_client.get(f'/api/jobs/{job.id}/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_job_list_conditional_get(employer_client, make_job, django_assert_num_queries):
+    job = make_job()
+    response = employer_client.get('/api/jobs/')
+    etag = response['ETag']
+    assert 'Last-Modified' not in response
+    with django_assert_num_queries(1):  # only the aggregate
+        response = employer_client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    job.title = 'Changed'
+    job.save()
+    response = employer_client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+    etag = response['ETag']
+    make_job(title='New').delete()
+    assert employer_client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+    job.delete()
+    assert employer_client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_job_list_ignores_if_modified_since(employer_client, make_job):
+    """The newest updated_at stays put when a job is deleted; the list has changed all the same"""
+    make_job()
+    old = make_job()
+    since = http_date(time.time() + 60)
+    assert employer_client.get('/api/jobs/', HTTP_IF_MODIFIED_SINCE=since).status_code == 200
+    old.delete()
+    response = employer_client.get('/api/jobs/', HTTP_IF_MODIFIED_SINCE=since)
+    assert response.status_code == 200 and len(response.data) == 1
+
+
+@pytest.mark.django_db
+def test_job_detail_conditional_get(api_client, employer_client, job, django_assert_num_queries):
+    etag = employer_client.get(f'/api/jobs/{job.id}/')['ETag']
+    with django_assert_num_queries(1):
+        assert employer_client.get(f'/api/jobs/{job.id}/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Anonymous requests are answered from the cached validators without any query
+    etag = api_client.get(f'/api/jobs/{job.id}/')['ETag']
+    with django_assert_num_queries(0):
+        assert api_client.get(f'/api/jobs/{job.id}/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.django_db
+def test_fast_job_serializer_matches_job_serializer(make_job):
+    from jobs.models import Job
+    from jobs.serializers import FastJobSerializer, JobSerializer
+    make_job(title='Ünïcode', salary='12.50', description='')
+    make_job(salary='99999999.99')
+    queryset = Job.objects.order_by('id')
+    expected = JobSerializer(queryset, many=True).data
+    assert FastJobSerializer(queryset).data == expected
+    assert FastJobSerializer(list(queryset)).data == expected
+
+
+@pytest.mark.django_db
+def test_job_list_fast_path_can_be_disabled(api_client, make_job, settings):
+    make_job()
+    fast = api_client.get('/api/jobs/', {'ordering': 'salary'}).content
+    settings.JOBS_FAST_SERIALIZER = False
+    settings.JOBS_CACHE_ENABLED = False
+    assert api_client.get('/api/jobs/', {'ordering': 'salary'}).content == fast
+
+
+JOBS_CSV = (
+    'title,description,location,salary\n'
+    'Backend Engineer,"Build APIs.\nOwn services.",Remote,120000\n'
+    ',Missing title,Berlin,90000\n'
+    'Data Engineer,Pipelines,London,not-a-number\n'
+    'SRE,Keep it up,Remote,110000.50\n'
+)
+
+
+@pytest.mark.django_db
+def test_job_import_csv_body_reports_bad_rows(employer_client, employer):
+    response = employer_client.generic('POST', '/api/jobs/import/', JOBS_CSV, content_type='text/csv')
+    assert response.status_code == 201
+    assert response.data['created'] == 2
+    assert [error['row'] for error in response.data['errors']] == [2, 3]
+    assert set(response.data['errors'][0]['errors']) == {'title'}
+    assert set(response.data['errors'][1]['errors']) == {'salary'}
+    jobs = Job.objects.filter(employer=employer).order_by('id')
+    assert [job.title for job in jobs] == ['Backend Engineer', 'SRE']
+    assert jobs[0].description == 'Build APIs.\nOwn services.'
+
+
+@pytest.mark.django_db
+def test_job_import_ndjson_file_upload(employer_client, employer):
+    lines = [
+        {'title': 'A', 'description': 'D', 'location': 'Remote', 'salary': 1},
+        'not json',
+        {'title': 'B', 'description': 'D', 'location': 'Remote', 'salary': '2.00', 'employer': 999},
+    ]
+    body = '\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines).encode()
+    upload = SimpleUploadedFile('jobs.ndjson', body, content_type='application/octet-stream')
+    response = employer_client.post('/api/jobs/import/', {'file': upload}, format='multipart')
+    assert response.status_code == 201
+    assert response.data['created'] == 2
+    assert response.data['errors'][0]['row'] == 2
+    # Read-only columns such as employer are ignored
+    assert set(Job.objects.values_list('employer_id', flat=True)) == {employer.id}
+
+
+@pytest.mark.django_db
+def test_job_import_atomic_rejects_everything_on_error(employer_client):
+    response = employer_client.generic('POST', '/api/jobs/import/?atomic=true', JOBS_CSV, content_type='text/csv')
+    assert response.status_code == 400
+    assert response.data['created'] == 0
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_job_import_limits_rows_and_content_types(employer_client, settings):
+    settings.JOBS_IMPORT_MAX_ROWS = 1
+    response = employer_client.generic('POST', '/api/jobs/import/', JOBS_CSV, content_type='text/csv')
+    assert response.status_code == 400
+    assert not Job.objects.exists()
+    response = employer_client.generic('POST', '/api/jobs/import/', 'x', content_type='text/plain')
+    assert response.status_code == 415
+
+
+@pytest.mark.django_db
+def test_job_import_and_export_are_for_employers(applicant_client, api_client):
+    for client in (applicant_client, api_client):
+        assert client.generic('POST', '/api/jobs/import/', JOBS_CSV, content_type='text/csv').status_code in (401, 403)
+        assert client.get('/api/jobs/export/').status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_job_export_round_trips_through_import(employer_client, make_job, employer):
+    make_job(title='Mine, with comma', description='Line one\nLine two')
+    other = User.objects.create_user(email='other@example.com', password='pass12345', is_employer=True)
+    make_job(employer=other, title='Theirs')
+
+    response = employer_client.get('/api/jobs/export/')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/csv')
+    assert response['Content-Disposition'] == 'attachment; filename="jobs.csv"'
+    exported = b''.join(response.streaming_content).decode()
+    assert 'Theirs' not in exported
+
+    response = employer_client.generic('POST', '/api/jobs/import/', exported, content_type='text/csv')
+    assert response.status_code == 201
+    assert response.data == {'created': 1, 'errors': []}
+    copies = Job.objects.filter(employer=employer, title='Mine, with comma')
+    assert [job.description for job in copies] == ['Line one\nLine two'] * 2
+
+    response = employer_client.get('/api/jobs/export/?output=ndjson')
+    rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+    assert len(rows) == 2
+    assert employer_client.get('/api/jobs/export/?output=xml').status_code == 400
+
+
+@pytest.mark.django_db
+def test_job_stream_and_export_carry_owner_stats(api_client, employer_client, applicant, job):
+    from applications.models import Application
+    Application.objects.create(applicant=applicant, job=job)
+    params = {'fields': 'id,application_stats'}
+
+    def rows(client, url, **extra):
+        response = client.get(url, {**params, **extra})
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    owner_rows = rows(employer_client, '/api/jobs/', stream='ndjson')
+    assert owner_rows == [{'id': job.id, 'application_stats': owner_rows[0]['application_stats']}]
+    assert owner_rows[0]['application_stats']['total'] == 1
+    assert rows(employer_client, '/api/jobs/export/', output='ndjson') == owner_rows
+    assert rows(api_client, '/api/jobs/', stream='ndjson') == [{'id': job.id}]
+    assert employer_client.get('/api/jobs/export/', params).status_code == 400  # CSV
+
+
+@pytest.mark.django_db
+def test_job_owner_sees_application_stats(api_client, employer_client, applicant, make_job):
+    from applications.models import Application
+    job = make_job()
+    other = User.objects.create_user(email='other@example.com', password='pass12345', is_employer=True)
+    theirs = make_job(employer=other)
+    etag = employer_client.get('/api/jobs/')['ETag']
+    Application.objects.create(applicant=applicant, job=job)
+    Application.objects.create(applicant=applicant, job=theirs, status='accepted')
+
+    # New applications change the owner's validators even though the job row did not change
+    response = employer_client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    expected = {'total': 1, 'by_status': {'pending': 1, 'reviewing': 0, 'shortlisted': 0, 'accepted': 0, 'rejected': 0}}
+    rows = {row['id']: row for row in response.data}
+    assert rows[job.id]['application_stats'] == expected
+    assert 'application_stats' not in rows[theirs.id]
+    page = employer_client.get('/api/jobs/', {'paginate': 'cursor', 'employer': job.employer_id}).data['results']
+    assert page[0]['application_stats'] == expected
+    assert employer_client.get(f'/api/jobs/{job.id}/').data['application_stats'] == expected
+    assert employer_client.get(f'/api/jobs/{job.id}/stats/').data == {'job': job.id, **expected}
+
+    assert 'application_stats' not in api_client.get(f'/api/jobs/{job.id}/').data
+    assert employer_client.get(f'/api/jobs/{theirs.id}/stats/').status_code == 403
+    assert api_client.get(f'/api/jobs/{job.id}/stats/').status_code == 401
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [{}, {'paginate': 'cursor'}])
+def test_job_sparse_fieldsets_skip_unread_columns(api_client, make_job, params):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    job = make_job(description='Long text ' * 100)
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get('/api/jobs/', {'fields': 'id,title', **params})
+    rows = response.data['results'] if params else response.data
+    assert rows == [{'id': job.id, 'title': job.title}]
+    assert not any('"description"' in query['sql'] for query in queries.captured_queries)
+
+    full = api_client.get(f'/api/jobs/{job.id}/').data
+    omitted = api_client.get(f'/api/jobs/{job.id}/', {'omit': 'description,salary'}).data
+    assert omitted == {key: value for key, value in full.items() if key not in ('description', 'salary')}
+    lines = b''.join(api_client.get('/api/jobs/', {'stream': 'ndjson', 'fields': 'salary'}).streaming_content)
+    assert json.loads(lines) == {'salary': full['salary']}
+    assert api_client.get('/api/jobs/', {'fields': 'id,password'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_job_sparse_fieldsets_keep_owner_stats(employer_client, make_job):
+    job = make_job()
+    rows = employer_client.get('/api/jobs/', {'fields': 'id,application_stats'}).data
+    assert rows == [{'id': job.id, 'application_stats': {'total': 0, 'by_status': {
+        'pending': 0, 'reviewing': 0, 'shortlisted': 0, 'accepted': 0, 'rejected': 0,
+    }}}]
+    assert employer_client.get(f'/api/jobs/{job.id}/', {'omit': 'application_stats'}).data.keys() == {
+        'id', 'employer', 'posted_at', 'title', 'description', 'location', 'salary', 'updated_at',
+    }
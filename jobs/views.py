@@ -1,37 +1,237 @@
-
-from rest_framework import viewsets
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from .models import Job
-from .serializers import JobSerializer
-from .permissions import IsJobOwnerOrReadOnly
+from applications.models import JobApplicationStats
+from applications.stats import stats_representation
+from .serializers import FastJobSerializer, JobSerializer, application_stats_viewer, shows_application_stats
+from .permissions import IsEmployer, IsJobOwnerOrReadOnly
+from .bulk import EXPORT_CONTENT_TYPES, export_lines, import_rows, import_source, parse_rows
+from .pagination import JobCursorPagination, wants_cursor_pagination
+from .search import search_jobs
+from .cache import CatalogCacheMixin, invalidate_catalog
+from .conditional import ConditionalResponseMixin
+from config.async_views import AsyncReadMixin
+from config.db_router import ReplicaReadMixin
+from config.fieldsets import SparseFieldsetMixin
+from .filters import DEFAULT_JOB_ORDERING, JOB_ORDERINGS, filter_jobs, get_job_ordering
+
+# Rows fetched per round trip when streaming from a server-side cursor
+STREAM_CHUNK_SIZE = 2000
+
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(CatalogCacheMixin, ConditionalResponseMixin, SparseFieldsetMixin, ReplicaReadMixin, AsyncReadMixin,
+                 viewsets.ModelViewSet):
     """
     ViewSet for managing job postings.
-    
+
     Permissions:
     - Anyone (authenticated or not) can view/list jobs (GET, HEAD, OPTIONS)
     - Only authenticated employers can create jobs (POST)
     - Only job owners (employers who created the job) can update/delete their jobs (PUT, PATCH, DELETE)
+
+    Listing modes:
+    - Default: every job in one response (Home page shows all jobs)
+    - ?paginate=cursor[&page_size=N]: keyset pages on (posted_at, id)
+    - ?stream=ndjson: one JSON object per line, streamed in constant memory
+    - ?q=<words>: full-text search, best matches first unless ?ordering= is given
+    - ?salary_min=, ?salary_max=, ?location=, ?location_prefix=, ?posted_after=: filters
+    - ?ordering=posted_at|-posted_at|salary|-salary (default -posted_at)
+    - ?fields=id,title,... or ?omit=description: only those keys, only those
+      columns read (see config/fieldsets.py); also applies to streams and exports
+
+    Job owners also see "application_stats" (total and per-status application
+    counts) on their jobs, and GET /api/jobs/{id}/stats/ returns just those, so
+    a dashboard never has to list applications to count them.
+
+    Employers can create jobs in bulk with POST /api/jobs/import/ and download
+    theirs with GET /api/jobs/export/ (CSV or NDJSON, see jobs/bulk.py).
+
+    Anonymous list/retrieve responses are served from the versioned catalog
+    cache (see jobs/cache.py). List responses carry an ETag, detail responses an
+    ETag and Last-Modified; conditional GETs get 304 (see jobs/conditional.py).
+
+    Under ASGI, list and retrieve run as async views (config/async_views.py),
+    except for streams and cursor pages.
     """
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsJobOwnerOrReadOnly]
     pagination_class = None  # Disable pagination — Home page shows all jobs
+    sparse_actions = ('list', 'retrieve', 'export_jobs')
+    # Actions that read ?employer=, ?q=, the filters and ?ordering=
+    listing_actions = ('list', 'export_jobs')
+
+    @property
+    def paginator(self):
+        """Use cursor pagination only when the client opts in"""
+        if not hasattr(self, '_paginator'):
+            if wants_cursor_pagination(self.request):
+                self._paginator = JobCursorPagination()
+            else:
+                self._paginator = None
+        return self._paginator
+
+    @property
+    def conditional_timestamp_fields(self):
+        # Application counters are part of the representation for employers
+        if self.stats_viewer is not None and (self.fieldset is None or 'application_stats' in self.fieldset):
+            return ('updated_at', 'application_stats__updated_at')
+        return ('updated_at',)
+
+    @property
+    def sparse_fields(self):
+        fields = {key: (key,) for key, _ in FastJobSerializer.FIELDS}
+        # Only employers are shown stats; for others selecting them reads nothing
+        fields['application_stats'] = () if self.stats_viewer is None else tuple(
+            f'application_stats__{name}' for name in ('updated_at', *JobApplicationStats.COUNTERS)
+        )
+        return fields
+
+    @property
+    def sparse_always_load(self):
+        # Ownership checks, validators and the cursor position read these
+        ordering = [field.lstrip('-') for field in self.get_cursor_ordering()]
+        return ('id', 'employer', 'updated_at', *ordering)
+
+    @property
+    def stats_viewer(self):
+        return application_stats_viewer({'request': self.request})
 
     def get_queryset(self):
-        """Optimize queryset with select_related and support server-side filtering"""
+        """Optimize queryset with select_related"""
         queryset = Job.objects.select_related('employer').all()
-        
+        if self.stats_viewer is not None:
+            queryset = queryset.select_related('application_stats')
+        return self.apply_fieldset(queryset)
+
+    def filter_queryset(self, queryset):
+        """Server-side filters and ordering; a detail URL ignores them like any other unknown parameter"""
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.listing_actions:
+            return queryset
+
         # Server-side filter: ?employer=<id> — so Dashboard doesn't fetch ALL jobs
         employer_id = self.request.query_params.get('employer')
         if employer_id:
             queryset = queryset.filter(employer_id=employer_id)
-        
+
+        # Full-text search: ?q=<words> — ranked by relevance, then newest first
+        query = self.request.query_params.get('q', '').strip()
+        if query:
+            queryset = search_jobs(queryset, query)
+
+        # Salary / location / recency filters, each backed by an index (see jobs/filters.py)
+        queryset = filter_jobs(queryset, self.request.query_params)
+
+        ordering = get_job_ordering(self.request.query_params)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        elif not query:
+            queryset = queryset.order_by(*JOB_ORDERINGS[DEFAULT_JOB_ORDERING])
         return queryset
 
+    def get_serializer_class(self):
+        """Lists are built straight from rows unless JOBS_FAST_SERIALIZER is off"""
+        if self.action == 'list' and settings.JOBS_FAST_SERIALIZER and not getattr(self, 'swagger_fake_view', False):
+            return FastJobSerializer
+        return JobSerializer
+
+    def get_cursor_ordering(self):
+        """Ordering used by cursor pagination; must be index-backed"""
+        if self.action not in self.listing_actions:
+            return JOB_ORDERINGS[DEFAULT_JOB_ORDERING]
+        return get_job_ordering(self.request.query_params) or JOB_ORDERINGS[DEFAULT_JOB_ORDERING]
+
+    def serves_async(self):
+        # Streams and cursor pages (not a PageNumberPagination) stay synchronous
+        return super().serves_async() and not (self.action == 'list' and self.wants_stream())
+
+    def reads_replica(self, request):
+        # Cache misses are read from the primary: rows from a lagging replica would be
+        # cached under the catalog version that the write just bumped
+        return super().reads_replica(request) and not self.is_cacheable(request)
+
+    def wants_stream(self):
+        return self.request.query_params.get('stream') == 'ndjson'
+
+    def list(self, request, *args, **kwargs):
+        if self.wants_stream():
+            return self.stream_rows(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
+
+    def stream_rows(self, queryset, fmt='ndjson'):
+        """
+        Stream jobs as newline-delimited JSON or CSV.
+
+        .iterator() reads through a server-side cursor on PostgreSQL, so only
+        STREAM_CHUNK_SIZE rows are held in memory at any time.
+        """
+        queryset = queryset.select_related(None).order_by(*self.get_cursor_ordering())
+        response = StreamingHttpResponse(
+            export_lines(queryset, fmt, STREAM_CHUNK_SIZE, self.get_serializer_context()),
+            content_type=EXPORT_CONTENT_TYPES[fmt],
+        )
+        response['X-Accel-Buffering'] = 'no'  # Don't let proxies buffer the whole export
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsEmployer])
+    def import_jobs(self, request):
+        """
+        Create many jobs from CSV or NDJSON (see jobs/bulk.py).
+
+        Send the file as the request body (Content-Type text/csv or
+        application/x-ndjson) or as the multipart field "file". Columns/keys
+        are JobSerializer fields; others (id, employer, ...) are ignored, so an
+        export can be re-imported. Invalid rows are skipped and reported;
+        with ?atomic=true any invalid row cancels the whole import.
+        """
+        source, fmt = import_source(request)
+        atomic = request.query_params.get('atomic', '').lower() in ('1', 'true')
+        with transaction.atomic():
+            report = import_rows(parse_rows(source, fmt), request.user.id, settings.JOBS_IMPORT_MAX_ROWS)
+            if atomic and report['errors']:
+                transaction.set_rollback(True)
+                report['created'] = 0
+            elif report['created']:
+                # bulk_create sends no post_save signals
+                invalidate_catalog()
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsEmployer])
+    def export_jobs(self, request):
+        """
+        Stream the caller's jobs (superusers: all jobs) as ?output=csv (default)
+        or ?output=ndjson. The list filters, ?ordering= and ?fields=/?omit= apply;
+        NDJSON rows also carry application_stats, which flat CSV columns cannot.
+        """
+        fmt = request.query_params.get('output', 'csv')
+        if fmt not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({'output': [f'Must be one of: {", ".join(EXPORT_CONTENT_TYPES)}.']})
+        if fmt == 'csv' and self.fieldset is not None and 'application_stats' in self.fieldset:
+            raise ValidationError({'fields': ['application_stats is only exported as NDJSON (?output=ndjson).']})
+        queryset = self.filter_queryset(self.get_queryset())
+        if not request.user.is_superuser:
+            queryset = queryset.filter(employer_id=request.user.id)
+        response = self.stream_rows(queryset, fmt)
+        response['Content-Disposition'] = f'attachment; filename="jobs.{fmt}"'
+        return response
+
+    @action(detail=True, methods=['get'], permission_classes=[IsEmployer])
+    def stats(self, request, pk=None):
+        """Application counts for one of the caller's jobs: {"job", "total", "by_status": {status: n}}"""
+        job = self.get_object()
+        if not shows_application_stats(request.user, job.employer_id):
+            self.permission_denied(request, message='Only the job owner can see its application stats.')
+        return Response({'job': job.id, **stats_representation(getattr(job, 'application_stats', None))})
+
     def perform_create(self, serializer):
         """
         Automatically assign the current user as the employer when creating a job.
         Only employers can reach this point due to permission checks.
         """
-        serializer.save(employer=self.request.user)
+        serializer.save(employer_id=self.request.user.id)
@@ -0,0 +1,36 @@
+import os
+import signal
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.queue import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks (resume processing, ...) until stopped with SIGINT/SIGTERM.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.TASK_WORKER_CONCURRENCY,
+                            help=f'tasks run at once by this worker (default: {settings.TASK_WORKER_CONCURRENCY})')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='seconds to wait when no task is due (default: 1)')
+        parser.add_argument('--task', action='append', dest='names', metavar='NAME',
+                            help='only run tasks with this name (repeatable)')
+        parser.add_argument('--burst', action='store_true', help='exit once no task is due')
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            f'{socket.gethostname()}:{os.getpid()}',
+            concurrency=max(1, options['concurrency']),
+            poll_interval=options['poll_interval'],
+            names=options['names'],
+            burst=options['burst'],
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            # Finish the tasks in hand, then exit
+            signal.signal(signum, lambda *_: worker.stop())
+        self.stdout.write(f'Worker {worker.name} running {worker.concurrency} task(s) at a time')
+        worker.run()
+        self.stdout.write(f'Processed {worker.processed} task(s), {worker.failed} failed')
@@ -0,0 +1,203 @@
+"""
+A database-backed task queue: no broker, just the Task table.
+
+enqueue() inserts a row, normally inside the transaction of the write that
+needs the follow-up work, so a rolled-back request leaves no task behind.
+Workers (`manage.py run_worker`) claim due tasks optimistically: they read a
+candidate and take it with an UPDATE conditioned on the state they read, so
+two workers never run the same attempt, on any database and without holding
+row locks. A claim is a lease of TASK_LEASE_SECONDS; a task whose worker died
+is claimed again once its lease expires.
+
+Handlers are registered with @task. A failing handler's writes are rolled
+back and the task is retried after TASK_RETRY_DELAY seconds, doubling each
+time, until max_attempts; then it stays in the table as failed. Successful
+tasks are deleted. concurrency caps how many tasks of one name run at once
+across all workers (e.g. for memory-hungry work).
+"""
+import logging
+import threading
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from config.metrics import labels
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Candidates read per claim attempt; others may be taken by competing workers
+CLAIM_BATCH_SIZE = 10
+
+
+@dataclass
+class Handler:
+    func: callable
+    max_attempts: int = None
+    concurrency: int = None
+
+    def attempts_allowed(self):
+        return self.max_attempts or settings.TASK_MAX_ATTEMPTS
+
+
+HANDLERS = {}
+
+
+def task(name, max_attempts=None, concurrency=None):
+    """Register the decorated function as the handler of tasks called name"""
+    def register(func):
+        HANDLERS[name] = Handler(func, max_attempts, concurrency)
+        return func
+    return register
+
+
+def enqueue(name, run_after=None, **payload):
+    """Queue a call of handler name with JSON-serializable keyword arguments"""
+    if name not in HANDLERS:
+        raise LookupError(f'No task handler registered as {name!r}')
+    return Task.objects.create(name=name, payload=payload, run_after=run_after or timezone.now())
+
+
+def due(now):
+    return Q(status=Task.QUEUED, run_after__lte=now) | Q(status=Task.RUNNING, locked_until__lt=now)
+
+
+def running(name, now):
+    return Task.objects.filter(name=name, status=Task.RUNNING, locked_until__gte=now).count()
+
+
+def claim(worker, names=None):
+    """Take the oldest due task for worker, or return None when there is none"""
+    now = timezone.now()
+    candidates = Task.objects.filter(due(now))
+    if names:
+        candidates = candidates.filter(name__in=names)
+    # Names already running at their concurrency limit are left alone
+    full = [name for name, handler in HANDLERS.items() if handler.concurrency and running(name, now) >= handler.concurrency]
+    if full:
+        candidates = candidates.exclude(name__in=full)
+    for candidate in candidates.order_by('run_after', 'pk').values('pk', 'name', 'status', 'attempts')[:CLAIM_BATCH_SIZE]:
+        taken = Task.objects.filter(pk=candidate['pk'], status=candidate['status'], attempts=candidate['attempts']).update(
+            status=Task.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=settings.TASK_LEASE_SECONDS),
+            updated_at=now,
+        )
+        if not taken:
+            continue  # Another worker was faster
+        handler = HANDLERS.get(candidate['name'])
+        if handler and handler.concurrency and running(candidate['name'], now) > handler.concurrency:
+            # Lost a race for the last slot: hand the task back untouched
+            Task.objects.filter(pk=candidate['pk'], locked_by=worker).update(
+                status=candidate['status'], attempts=candidate['attempts'], locked_by='', locked_until=None
+            )
+            continue
+        return Task.objects.get(pk=candidate['pk'])
+    return None
+
+
+def run(task):
+    """Run a claimed task and record the outcome; returns True on success"""
+    handler = HANDLERS.get(task.name)
+    error = None
+    if handler is None:
+        error, retry = f'No task handler registered as {task.name!r}', False
+    elif task.attempts > handler.attempts_allowed():
+        # The lease of the last attempt expired (worker died while running it)
+        error, retry = task.last_error or 'Worker lost while running the last attempt', False
+    else:
+        try:
+            with transaction.atomic():
+                handler.func(**task.payload)
+        except Exception:
+            logger.exception('Task %s failed (attempt %s)', task, task.attempts)
+            error, retry = traceback.format_exc(), task.attempts < handler.attempts_allowed()
+
+    # Only record the outcome while this worker still holds the lease
+    mine = Task.objects.filter(pk=task.pk, locked_by=task.locked_by, attempts=task.attempts)
+    if error is None:
+        mine.delete()
+        return True
+    delay = timedelta(seconds=settings.TASK_RETRY_DELAY * 2 ** (task.attempts - 1))
+    mine.update(
+        status=Task.QUEUED if retry else Task.FAILED,
+        run_after=timezone.now() + delay if retry else F('run_after'),
+        locked_by='',
+        locked_until=None,
+        last_error=error,
+        updated_at=timezone.now(),
+    )
+    return False
+
+
+class Worker:
+    """
+    Runs tasks in concurrency threads until stop() is called or, in burst
+    mode, until no task is due.
+    """
+
+    def __init__(self, name, concurrency=1, poll_interval=1.0, names=None, burst=False):
+        self.name = name
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.names = names
+        self.burst = burst
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+
+    def stop(self):
+        self.stopping.set()
+
+    def loop(self, thread_name, own_connection=True):
+        try:
+            while not self.stopping.is_set():
+                if own_connection:
+                    close_old_connections()  # Reconnect after database restarts, honour CONN_MAX_AGE
+                claimed = claim(thread_name, self.names)
+                if claimed is None:
+                    if self.burst:
+                        return
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                ok = run(claimed)
+                with self.lock:
+                    self.processed += 1
+                    self.failed += not ok
+        finally:
+            if own_connection:
+                connection.close()
+
+    def run(self):
+        if self.concurrency == 1:
+            # Same thread as the caller: shares its connection (and test transaction)
+            self.loop(f'{self.name}-0', own_connection=False)
+            return
+        threads = [
+            threading.Thread(target=self.loop, args=(f'{self.name}-{i}',), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def queue_metrics():
+    """Prometheus lines for config.metrics: tasks per name and state, and the age of the oldest due task"""
+    now = timezone.now()
+    counts = Task.objects.order_by().values_list('name', 'status').annotate(count=Count('pk'))
+    lines = ['# HELP tasks_queue_depth Background tasks by state', '# TYPE tasks_queue_depth gauge']
+    lines.extend(f'tasks_queue_depth{{{labels(task=name, status=status)}}} {count}' for name, status, count in counts)
+    oldest = Task.objects.filter(status=Task.QUEUED, run_after__lte=now).aggregate(oldest=Min('run_after'))['oldest']
+    lines.append('# HELP tasks_oldest_due_seconds How long the oldest due task has been waiting')
+    lines.append('# TYPE tasks_oldest_due_seconds gauge')
+    lines.append(f'tasks_oldest_due_seconds {(now - oldest).total_seconds() if oldest else 0}')
+    return lines
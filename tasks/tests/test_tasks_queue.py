@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import Worker, claim, enqueue, queue_metrics, run, task
+
+calls = []
+
+
+@task('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task('tests.flaky', max_attempts=2)
+def flaky():
+    Task.objects.create(name='side-effect')  # Rolled back with the failed attempt
+    raise RuntimeError('boom')
+
+
+@task('tests.limited', concurrency=1)
+def limited():
+    pass
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+def test_worker_runs_and_deletes_due_tasks():
+    enqueue('tests.record', value=1)
+    enqueue('tests.record', value=2)
+    enqueue('tests.record', run_after=timezone.now() + timedelta(hours=1), value=3)
+    worker = Worker('test', burst=True)
+    worker.run()
+    assert calls == [1, 2]
+    assert (worker.processed, worker.failed) == (2, 0)
+    assert list(Task.objects.values_list('payload', flat=True)) == [{'value': 3}]
+
+
+@pytest.mark.django_db
+def test_failed_task_is_retried_with_backoff_then_kept(settings):
+    settings.TASK_RETRY_DELAY = 10
+    queued = enqueue('tests.flaky')
+    assert run(claim('w1')) is False
+    queued.refresh_from_db()
+    assert (queued.status, queued.attempts) == (Task.QUEUED, 1)
+    assert queued.run_after > timezone.now() + timedelta(seconds=9)
+    assert 'RuntimeError: boom' in queued.last_error
+    assert not Task.objects.filter(name='side-effect').exists()
+
+    assert claim('w1') is None  # Backing off
+    Task.objects.update(run_after=timezone.now())
+    run(claim('w1'))
+    queued.refresh_from_db()
+    assert (queued.status, queued.attempts) == (Task.FAILED, 2)
+    assert claim('w1') is None
+
+
+@pytest.mark.django_db
+def test_claims_are_exclusive_until_the_lease_expires():
+    enqueue('tests.record', value=1)
+    first = claim('w1')
+    assert first.locked_by == 'w1'
+    assert claim('w2') is None
+    Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+    second = claim('w2')
+    assert (second.pk, second.attempts) == (first.pk, 2)
+    # The first worker lost its lease: its result is not recorded
+    run(first)
+    assert Task.objects.get().locked_by == 'w2'
+
+
+@pytest.mark.django_db
+def test_concurrency_limit_and_queue_metrics():
+    enqueue('tests.limited')
+    enqueue('tests.limited')
+    assert claim('w1') is not None
+    assert claim('w2') is None
+    lines = queue_metrics()
+    assert 'tasks_queue_depth{task="tests.limited",status="running"} 1' in lines
+    assert 'tasks_queue_depth{task="tests.limited",status="queued"} 1' in lines
+    with pytest.raises(LookupError):
+        enqueue('tests.unknown')
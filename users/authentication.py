@@ -0,0 +1,107 @@
+"""
+Role claims in JWT access tokens and the stateless authentication that reads them.
+
+Access tokens issued by LoginView, RegisterView and /api/token/ (and every
+refreshed one) carry the user's role flags. With JWT_STATELESS_AUTH=True,
+RoleClaimsJWTAuthentication builds request.user from those claims instead of
+loading the User row, saving one query per authenticated request.
+
+Role changes: refreshing re-reads the roles from the database, so stale
+claims live at most ACCESS_TOKEN_LIFETIME. Saving or deleting a user also
+records the time in the cache; access tokens issued before it fall back to a
+database lookup. That takes effect in every worker only when the cache is
+shared (REDIS_URL); with the default per-process cache, other workers pick up
+the change at the next refresh.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROLE_CLAIMS = ('is_employer', 'is_applicant', 'is_superuser')
+
+
+def roles_changed_key(user_id):
+    return f'auth:user:{user_id}:roles-changed'
+
+
+def mark_roles_changed(user_id):
+    """Make access tokens issued until now fall back to a database lookup"""
+    timeout = int(settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())
+    cache.set(roles_changed_key(user_id), time.time(), timeout)
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's current role claims"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.user = user
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        # Tokens decoded from a string (refresh requests) re-read the roles,
+        # so a refresh always reflects the user's current roles
+        user = getattr(self, 'user', None)
+        if user is None:
+            user = get_user_model().objects.filter(
+                **{api_settings.USER_ID_FIELD: self[api_settings.USER_ID_CLAIM]}
+            ).only(*ROLE_CLAIMS).first()
+        if user is not None:
+            for claim in ROLE_CLAIMS:
+                access[claim] = getattr(user, claim)
+        return access
+
+
+class RoleTokenUser(TokenUser):
+    """request.user backed by the access token's claims"""
+
+    @property
+    def id(self):
+        # simplejwt stores the id as a string; model foreign keys hold ints
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def is_employer(self):
+        return self.token['is_employer']
+
+    @property
+    def is_applicant(self):
+        return self.token['is_applicant']
+
+    @property
+    def is_superuser(self):
+        return self.token['is_superuser']
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that, with JWT_STATELESS_AUTH on, trusts the role claims
+    instead of querying the user. Tokens without role claims, or issued before
+    the user's roles last changed, are authenticated the usual way.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            not settings.JWT_STATELESS_AUTH
+            or user_id is None
+            or not all(claim in validated_token for claim in ROLE_CLAIMS)
+        ):
+            return super().get_user(validated_token)
+        changed_at = cache.get(roles_changed_key(user_id))
+        if changed_at is not None and validated_token.get('iat', 0) <= changed_at:
+            return super().get_user(validated_token)
+        return RoleTokenUser(validated_token)
@@ -0,0 +1,43 @@
+"""
+Password hashers whose cost parameters come from settings.
+
+Algorithm names match Django's built-in hashers, so existing hashes verify
+unchanged. When a stored hash uses another algorithm (settings.PASSWORD_HASHER
+changed) or other costs (e.g. ARGON2_TIME_COST raised), Django rehashes the
+password with the current policy on the user's next successful login.
+Pick costs with `python manage.py calibrate_hasher`.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """argon2id; needs argon2-cffi. Memory cost is in KiB."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt over a SHA-256 pre-hash (no 72 byte limit); needs bcrypt"""
+
+    @property
+    def rounds(self):
+        return settings.BCRYPT_ROUNDS
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256; pure Python fallback with no extra dependency"""
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
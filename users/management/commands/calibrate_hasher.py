@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from users.hashers import Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher
+
+PASSWORD = 'calibration-password'
+
+
+def hash_ms(hasher, samples=5):
+    """Median time of one hash (= one login) in milliseconds"""
+    salt = hasher.salt()
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.encode(PASSWORD, salt)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Find password hasher costs that take about --target-ms per hash on this machine '
+        'and print them as settings (environment variables).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=100.0,
+                            help='time one login may spend hashing (default: 100)')
+        parser.add_argument('--algorithm', choices=('argon2', 'bcrypt', 'pbkdf2', 'all'), default='all')
+
+    def handle(self, *args, **options):
+        target = options['target_ms']
+        algorithms = ('argon2', 'bcrypt', 'pbkdf2') if options['algorithm'] == 'all' else (options['algorithm'],)
+        self.stdout.write(f'# Calibrated for {target:g} ms per hash; preferred hasher: {settings.PASSWORD_HASHER}')
+        for algorithm in algorithms:
+            try:
+                setting, cost, duration = getattr(self, f'calibrate_{algorithm}')(target)
+            except ValueError as exc:  # Algorithm library not installed
+                self.stderr.write(f'# {algorithm}: skipped ({exc})')
+                continue
+            self.stdout.write(
+                f'{setting}={cost}  # {duration:.1f} ms per hash, ~{1000 / duration:.0f} logins/s per core '
+                f'(currently {getattr(settings, setting)})'
+            )
+
+    def calibrate_argon2(self, target):
+        # Memory cost and parallelism are sized to the host's RAM and cores; tune time cost
+        time_cost = 1
+        while True:
+            with override_settings(ARGON2_TIME_COST=time_cost):
+                duration = hash_ms(Argon2PasswordHasher())
+            if duration >= target or time_cost >= 20:
+                return 'ARGON2_TIME_COST', time_cost, duration
+            time_cost += 1
+
+    def calibrate_bcrypt(self, target):
+        # Every extra round doubles the cost
+        rounds = 4
+        while True:
+            with override_settings(BCRYPT_ROUNDS=rounds):
+                duration = hash_ms(BCryptSHA256PasswordHasher())
+            if duration >= target or rounds >= 20:
+                return 'BCRYPT_ROUNDS', rounds, duration
+            rounds += 1
+
+    def calibrate_pbkdf2(self, target):
+        # Cost is linear in the iteration count: measure once and scale
+        probe = 100000
+        with override_settings(PBKDF2_ITERATIONS=probe):
+            duration = hash_ms(PBKDF2PasswordHasher())
+        iterations = max(10000, int(round(probe * target / duration, -4)))
+        with override_settings(PBKDF2_ITERATIONS=iterations):
+            duration = hash_ms(PBKDF2PasswordHasher())
+        return 'PBKDF2_ITERATIONS', iterations, duration
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from .authentication import RoleRefreshToken
 from .models import User
 
 
@@ -47,3 +49,13 @@ class LoginResponseSerializer(serializers.Serializer):
     user_id = serializers.IntegerField()
     email = serializers.EmailField()
     role = serializers.ListField(child=serializers.CharField())
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """/api/token/: access tokens carry role claims (see users/authentication.py)"""
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """/api/token/refresh/: the new access token carries the user's current roles"""
+    token_class = RoleRefreshToken
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import ROLE_CLAIMS, mark_roles_changed
+from .models import User
+
+# Fields whose change must invalidate the role claims of issued access tokens
+ROLE_FIELDS = set(ROLE_CLAIMS) | {'is_active'}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_role_claims(sender, instance, created=False, update_fields=None, **kwargs):
+    """Saves that cannot touch a role (e.g. a password rehash on login) are skipped"""
+    if created or (update_fields is not None and not ROLE_FIELDS & set(update_fields)):
+        return
+    mark_roles_changed(instance.pk)
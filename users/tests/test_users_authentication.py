@@ -0,0 +1,68 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.fixture
+def stateless_auth(settings):
+    settings.JWT_STATELESS_AUTH = True
+
+
+def login(user):
+    response = APIClient().post(
+        '/api/users/login/', {'email': user.email, 'password': 'pass12345'}, format='json'
+    )
+    assert response.status_code == 200
+    return response.data['tokens']
+
+
+def bearer_client(access):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    return client
+
+
+@pytest.mark.django_db
+def test_access_token_carries_role_claims(employer):
+    token = AccessToken(login(employer)['access'])
+    assert (token['is_employer'], token['is_applicant'], token['is_superuser']) == (True, False, False)
+
+
+@pytest.mark.django_db
+def test_stateless_auth_skips_user_query(stateless_auth, applicant, job, django_assert_num_queries):
+    client = bearer_client(login(applicant)['access'])
+    # ETag aggregate + page count (no rows to fetch), no user lookup
+    with django_assert_num_queries(2):
+        response = client.get('/api/applications/')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_stateless_auth_writes_by_id(stateless_auth, employer, applicant):
+    response = bearer_client(login(employer)['access']).post(
+        '/api/jobs/', {'title': 'T', 'description': 'D', 'location': 'Remote', 'salary': '1.00'}, format='json'
+    )
+    assert response.status_code == 201
+    assert response.data['employer'] == employer.id
+
+    resume = SimpleUploadedFile('resume.pdf', b'%PDF-1.4', content_type='application/pdf')
+    response = bearer_client(login(applicant)['access']).post(
+        '/api/applications/', {'job': response.data['id'], 'resume': resume}, format='multipart'
+    )
+    assert response.status_code == 201
+    assert response.data['applicant'] == applicant.id
+
+
+@pytest.mark.django_db
+def test_role_change_invalidates_issued_claims(stateless_auth, employer):
+    tokens = login(employer)
+    employer.is_employer = False
+    employer.save()
+    job = {'title': 'T', 'description': 'D', 'location': 'Remote', 'salary': '1.00'}
+    # The old token now falls back to the database and sees the new role
+    assert bearer_client(tokens['access']).post('/api/jobs/', job, format='json').status_code == 403
+
+    response = APIClient().post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+    assert response.status_code == 200
+    assert AccessToken(response.data['access'])['is_employer'] is False
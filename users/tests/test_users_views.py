@@ -6,3 +6,43 @@ def test_users_view_placeholder():
     client = APIClient()
     response = client.get("/")  # Replace with actual path
     assert response.status_code in [200, 404]
+
+
+@pytest.mark.django_db
+def test_register_creates_user_with_one_insert(api_client, django_assert_num_queries):
+    # SAVEPOINT + INSERT + RELEASE SAVEPOINT; no existence check first
+    with django_assert_num_queries(3):
+        response = api_client.post(
+            '/api/users/register/', {'email': 'new@example.com', 'password': 'pass12345'}, format='json'
+        )
+    assert response.status_code == 201
+    assert response.data['role'] == ['applicant']
+
+
+@pytest.mark.django_db
+def test_register_rejects_duplicate_email(api_client, applicant):
+    response = api_client.post(
+        '/api/users/register/', {'email': applicant.email, 'password': 'pass12345'}, format='json'
+    )
+    assert response.status_code == 400
+    assert response.data == {'error': 'User with this email already exists'}
+
+
+@pytest.mark.django_db
+def test_login_rehashes_password_with_current_policy(api_client, applicant, settings):
+    # applicant was hashed with MD5; make tuned PBKDF2 the preferred hasher
+    settings.PASSWORD_HASHERS = ['users.hashers.PBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.PBKDF2_ITERATIONS = 1000
+
+    def login():
+        response = api_client.post(
+            '/api/users/login/', {'email': applicant.email, 'password': 'pass12345'}, format='json'
+        )
+        assert response.status_code == 200
+        applicant.refresh_from_db()
+        return applicant.password
+
+    assert login().startswith('pbkdf2_sha256$1000$')
+    # Raising the cost upgrades the hash on the next login
+    settings.PBKDF2_ITERATIONS = 2000
+    assert login().startswith('pbkdf2_sha256$2000$')
@@ -1,9 +1,10 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.db import IntegrityError, transaction
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from .authentication import RoleRefreshToken
 from .serializers import (
     RegisterRequestSerializer, 
     RegisterResponseSerializer,
@@ -43,24 +44,26 @@ class RegisterView(APIView):
                 status=400
             )
         
-        if User.objects.filter(email=email).exists():
-            return Response(
-                {'error': 'User with this email already exists'}, 
-                status=400
-            )
-        
         # If is_applicant is not specified, set it based on is_employer
         # Default behavior: if not an employer, then they're an applicant
         if is_applicant is None:
             is_applicant = not is_employer
         
-        # Create user with specified role
-        user = User.objects.create_user(
-            email=email,
-            password=password,
-            is_employer=bool(is_employer),
-            is_applicant=bool(is_applicant)
-        )
+        # Create user with specified role. One INSERT: the unique email
+        # constraint rejects duplicates, no existence check beforehand
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=email,
+                    password=password,
+                    is_employer=bool(is_employer),
+                    is_applicant=bool(is_applicant)
+                )
+        except IntegrityError:
+            return Response(
+                {'error': 'User with this email already exists'}, 
+                status=400
+            )
         
         role = []
         if user.is_employer:
@@ -69,7 +72,7 @@ class RegisterView(APIView):
             role.append('applicant')
         
         # Generate JWT tokens for auto-login after registration
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleRefreshToken.for_user(user)
         
         return Response({
             'message': 'User created successfully',
@@ -121,7 +124,7 @@ class LoginView(APIView):
                 role.append('applicant')
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
             
             return Response({
                 'message': 'Login successful',